@@ -0,0 +1,46 @@
+"""
+Benchmark of the BIND file parser.
+
+Generates a zone file with the given number of records and measures the records parsed per minute on one core.
+
+usage: python benchmarks/bind_parse.py [records]
+"""
+
+import io
+import sys
+import time
+
+from pkb_client.client.bind_file import BindFile
+
+
+def generate_zone(records: int) -> str:
+    lines = ["$ORIGIN example.com.", "$TTL 3600"]
+    for i in range(records):
+        kind = i % 5
+        if kind == 0:
+            lines.append(f"host{i} IN A 10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}")
+        elif kind == 1:
+            lines.append(f"host{i}.example.com. 600 IN AAAA 2001:db8::{i:x}")
+        elif kind == 2:
+            lines.append(f'txt{i} IN TXT "v=spf1 include:example.net -all" ; spf')
+        elif kind == 3:
+            lines.append(f"@ IN MX ( {i % 100}\n    mail{i} )")
+        else:
+            lines.append(f"alias{i} 300 IN CNAME host{i - 4}")
+    return "\n".join(lines) + "\n"
+
+
+def main() -> None:
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    zone = generate_zone(records)
+
+    start = time.perf_counter()
+    parsed = sum(1 for _ in BindFile.iter_records(io.StringIO(zone)))
+    duration = time.perf_counter() - start
+
+    print(f"parsed {parsed} records in {duration:.2f}s")
+    print(f"{parsed / duration * 60:,.0f} records/minute")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark of the BIND file writer.
+
+Writes a zone with the given number of records to a temporary file and measures the duration and the records
+written per second.
+
+usage: python benchmarks/bind_write.py [records]
+"""
+
+import sys
+import tempfile
+import time
+
+from pkb_client.client.bind_file import BindFile, BindRecord, RecordClass
+from pkb_client.client.dns import DNSRecordType
+
+
+def generate_zone(records: int) -> BindFile:
+    bind_records = []
+    for i in range(records):
+        if i % 3 == 0:
+            record = BindRecord(
+                f"host{i}.example.com.",
+                600,
+                RecordClass.IN,
+                DNSRecordType.A,
+                f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}",
+            )
+        elif i % 3 == 1:
+            record = BindRecord(
+                f"txt{i}.example.com.",
+                3600,
+                RecordClass.IN,
+                DNSRecordType.TXT,
+                'v=spf1 include:"example.net" -all',
+                comment="spf",
+            )
+        else:
+            record = BindRecord(
+                "example.com.",
+                3600,
+                RecordClass.IN,
+                DNSRecordType.MX,
+                f"mail{i}.example.com.",
+                prio=i % 100,
+            )
+        bind_records.append(record)
+    return BindFile("example.com.", 3600, bind_records)
+
+
+def main() -> None:
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    bind_file = generate_zone(records)
+
+    with tempfile.NamedTemporaryFile("w", suffix=".bind") as f:
+        start = time.perf_counter()
+        bind_file.to_file(f.name)
+        duration = time.perf_counter() - start
+
+    print(f"wrote {records} records in {duration:.2f}s")
+    print(f"{records / duration:,.0f} records/second")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark of the startup time of the package and the command line interface.
+
+Runs every command the given number of times in a fresh interpreter and reports the median wall time and the heavy
+modules loaded by the command.
+
+usage: python benchmarks/startup.py [runs]
+"""
+
+import statistics
+import subprocess
+import sys
+import time
+
+HEAVY_MODULES = ["requests", "dns.resolver", "concurrent.futures.process"]
+
+COMMANDS = {
+    "import pkb_client.client": "import pkb_client.client",
+    "import PKBClient": "from pkb_client.client import PKBClient",
+    "pkb-client --help": (
+        "import sys\n"
+        "sys.argv = ['pkb-client', '--help']\n"
+        "from pkb_client.cli.cli import main\n"
+        "try:\n"
+        "    main()\n"
+        "except SystemExit:\n"
+        "    pass\n"
+    ),
+}
+
+REPORT_MODULES = (
+    "import atexit, sys\n"
+    f"atexit.register(lambda: print(*[m for m in {HEAVY_MODULES!r} if m in sys.modules], file=sys.stderr))\n"
+)
+
+
+def run(code: str) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], check=True, capture_output=True)
+    return time.perf_counter() - start
+
+
+def loaded_modules(code: str) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", REPORT_MODULES + code],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return result.stderr.strip() or "-"
+
+
+def main() -> None:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+    baseline = statistics.median(run("pass") for _ in range(runs))
+    print(f"{'interpreter':<28}{baseline * 1000:>8.1f}ms")
+    for name, code in COMMANDS.items():
+        duration = statistics.median(run(code) for _ in range(runs))
+        print(
+            f"{name:<28}{duration * 1000:>8.1f}ms  (+{(duration - baseline) * 1000:.1f}ms)"
+            f"  loaded: {loaded_modules(code)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,277 @@
 import argparse
 import dataclasses
 import json
+import logging
 import os
+import sys
 import textwrap
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime
+from pathlib import Path
+from types import MappingProxyType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+    Type,
+)
 
-from pkb_client.client import PKBClient, API_ENDPOINT
 from pkb_client.client.dns import DNSRecordType, DNSRestoreMode
+from pkb_client.client.export import ExportFormat
+from pkb_client.client.fingerprint import FingerprintIndex
 from pkb_client.client.forwarding import URLForwardingType
 
+# the client and its subsystems are imported after the arguments are parsed, so the help and invalid arguments
+# do not load requests and the other dependencies of the API calls
+if TYPE_CHECKING:
+    from pkb_client.client import PKBClient
+    from pkb_client.client.snapshot import SnapshotStore
+
 
 class CustomJSONEncoder(json.JSONEncoder):
     def default(self, o):
         if isinstance(o, datetime):
             return o.isoformat()
         if dataclasses.is_dataclass(o):
-            return dataclasses.asdict(o)
+            # nested values are encoded by the encoder itself, so they do not have to be copied
+            return {f.name: getattr(o, f.name) for f in dataclasses.fields(o)}
+        if isinstance(o, Exception):
+            return str(o)
+        if isinstance(o, Path):
+            return str(o)
+        if isinstance(o, MappingProxyType):
+            # the read-only pricing of the pricing cache
+            return dict(o)
         return super().default(o)
 
 
-def main():
-    parser = argparse.ArgumentParser(
+def progress_printer(unit: str) -> Callable[[int, int], None]:
+    def print_progress(done: int, total: int) -> None:
+        print(f"\r{done}/{total} {unit}", end="", file=sys.stderr)
+        if done == total:
+            print(file=sys.stderr)
+
+    return print_progress
+
+
+def print_json(ret) -> None:
+    if isinstance(ret, Iterator):
+        # stream the items, so they do not have to be collected in memory
+        print("[")
+        first = True
+        for item in ret:
+            if not first:
+                print(",")
+            print(
+                textwrap.indent(
+                    json.dumps(item, cls=CustomJSONEncoder, indent=4), " " * 4
+                ),
+                end="",
+            )
+            first = False
+        print("]" if first else "\n]")
+    else:
+        print(json.dumps(ret, cls=CustomJSONEncoder, indent=4))
+
+
+# the options which apply to all commands of a batch and can not be given per command
+GLOBAL_OPTIONS = (
+    "key",
+    "secret",
+    "debug",
+    "endpoint",
+    "retries",
+    "pricing_cache",
+    "snapshot_store",
+    "soa_nameservers",
+    "soa_timeout",
+    "offline_soa",
+)
+
+
+class BatchCommandError(Exception):
+    pass
+
+
+class BatchArgumentParser(argparse.ArgumentParser):
+    """
+    Argument parser for the commands of a batch, which raises the errors instead of exiting the process.
+    """
+
+    def error(self, message):
+        raise BatchCommandError(message)
+
+    def print_help(self, file=None):
+        raise BatchCommandError("help is not available in batch commands")
+
+    def exit(self, status=0, message=None):
+        raise BatchCommandError(message or f"command exited with status {status}")
+
+
+def read_batch_command(line: str, line_number: int) -> Tuple[Any, List[str]]:
+    """
+    Read a command of a batch.
+
+    :param line: the json line of the command
+    :param line_number: the line number of the command, used as id if the command has no id
+    :return: the id and the command line arguments of the command
+    """
+
+    command = json.loads(line)
+    command_id = line_number
+    if isinstance(command, dict):
+        command_id = command.get("id", line_number)
+        command = command.get("args")
+    if not isinstance(command, list) or not all(isinstance(a, str) for a in command):
+        raise BatchCommandError(
+            'a command must be a json array of strings or a json object with such an array as "args"'
+        )
+    return command_id, command
+
+
+def resolve_method(method: str) -> Callable:
+    """
+    Resolve the method of a command, which imports the client only for commands which are executed.
+
+    :param method: the name of the method of the client, or list_snapshots for the method of the snapshot store
+    :return: the unbound method
+    """
+
+    if method == "list_snapshots":
+        from pkb_client.client.snapshot import SnapshotStore
+
+        return SnapshotStore.list_snapshots
+
+    from pkb_client.client import PKBClient
+
+    return getattr(PKBClient, method)
+
+
+def parse_batch_command(
+    parser: argparse.ArgumentParser, command: List[str]
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Parse the command line arguments of a batch command.
+
+    :param parser: the parser created with :class:`BatchArgumentParser`
+    :param command: the command line arguments of the command
+    :return: the name of the method to call, see :func:`resolve_method`, and its keyword arguments
+    """
+
+    args = vars(parser.parse_args(command))
+    for option in GLOBAL_OPTIONS:
+        if args.pop(option) != parser.get_default(option):
+            raise BatchCommandError(
+                f"the global option {option} must be given before the batch command"
+            )
+
+    method = args.pop("method", None)
+    if method is None:
+        raise BatchCommandError("no method specified")
+    if method == "batch":
+        raise BatchCommandError("batch commands can not be nested")
+
+    if args.pop("all_domains", False):
+        method = "iter_domains"
+    return method, args
+
+
+def run_batch(
+    pkb_client: "PKBClient",
+    input: TextIO,
+    max_workers: int = 1,
+    snapshot_store: Optional["SnapshotStore"] = None,
+    output: Optional[TextIO] = None,
+) -> bool:
+    """
+    Execute the commands of a batch with one client and write the result of every command as json line as soon as
+    the command is finished, so the results are in the order the commands finish and are matched by their id.
+    The commands are read lazily, so the input can be a stream.
+
+    :param pkb_client: the client used for all commands
+    :param input: the text stream with one json command per line, see :func:`read_batch_command`
+    :param max_workers: the maximum number of commands executed at the same time
+    :param snapshot_store: the snapshot store for the commands which work offline on the store
+    :param output: the text stream the results are written to, by default the standard output
+    :return: True if all commands succeeded, otherwise False
+    """
+
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+
+    output = output if output is not None else sys.stdout
+    parser = create_parser(BatchArgumentParser)
+    ok = True
+
+    def write_result(result: Dict[str, Any]) -> None:
+        nonlocal ok
+        ok = ok and result["ok"]
+        output.write(json.dumps(result, cls=CustomJSONEncoder) + "\n")
+        output.flush()
+
+    def execute(command_id: Any, method: str, args: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            func = resolve_method(method)
+            if method == "list_snapshots":
+                if snapshot_store is None:
+                    raise BatchCommandError("list-snapshots requires --snapshot-store")
+                ret = func(snapshot_store, **args)
+            else:
+                ret = func(pkb_client, **args)
+            if isinstance(ret, Iterator):
+                ret = list(ret)
+            return {"id": command_id, "ok": True, "result": ret}
+        except Exception as e:
+            return {"id": command_id, "ok": False, "error": str(e)}
+
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="pkb_client_batch"
+    ) as executor:
+        # the input position of the running commands, the results of commands finished at the same time are
+        # written in the order of the input
+        pending: Dict[Future, int] = {}
+
+        def write_finished() -> None:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in sorted(done, key=pending.__getitem__):
+                del pending[future]
+                write_result(future.result())
+
+        for line_number, line in enumerate(input, 1):
+            if not line.strip():
+                continue
+
+            # limit the number of commands read ahead, so large inputs are not loaded into memory
+            if len(pending) >= 2 * max_workers:
+                write_finished()
+
+            command_id = line_number
+            try:
+                command_id, command = read_batch_command(line, line_number)
+                method, args = parse_batch_command(parser, command)
+            except Exception as e:
+                future = Future()
+                future.set_result({"id": command_id, "ok": False, "error": str(e)})
+            else:
+                future = executor.submit(execute, command_id, method, args)
+            pending[future] = line_number
+
+        while pending:
+            write_finished()
+
+    return ok
+
+
+def create_parser(
+    parser_class: Type[argparse.ArgumentParser] = argparse.ArgumentParser,
+) -> argparse.ArgumentParser:
+    parser = parser_class(
         description="Python client for the Porkbun API",
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog=textwrap.dedent("""
@@ -41,18 +292,54 @@ def main():
     )
     parser.add_argument("--debug", help="Enable debug mode.", action="store_true")
     parser.add_argument(
-        "--endpoint", help="The API endpoint to use.", default=API_ENDPOINT
+        "--endpoint",
+        help="The API endpoint to use, by default the endpoint of the Porkbun API.",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        help="The number of retries for API calls which failed due to transient errors.",
+        default=0,
+    )
+    parser.add_argument(
+        "--pricing-cache",
+        help="Cache the domain pricing in the user cache directory and refresh it after the given number of seconds.",
+        type=int,
+        metavar="MAX_AGE",
+    )
+    parser.add_argument(
+        "--snapshot-store",
+        help="The directory of the snapshot store used for snapshots and for the backups before failed imports.",
+        metavar="DIRECTORY",
+    )
+    parser.add_argument(
+        "--soa-nameserver",
+        help="The nameserver used to resolve the SOA records of BIND exports, can be given multiple times.",
+        action="append",
+        dest="soa_nameservers",
+        metavar="NAMESERVER",
+    )
+    parser.add_argument(
+        "--soa-timeout",
+        help="The timeout in seconds for the resolution of the SOA record of a domain.",
+        type=float,
+        default=5.0,
+    )
+    parser.add_argument(
+        "--offline-soa",
+        help="Synthesise the SOA records of BIND exports instead of resolving them.",
+        action="store_true",
     )
 
     subparsers = parser.add_subparsers(help="Supported API methods")
 
     parser_ping = subparsers.add_parser("ping", help="Ping the API Endpoint")
-    parser_ping.set_defaults(func=PKBClient.ping)
+    parser_ping.set_defaults(method="ping")
 
     parser_dns_create = subparsers.add_parser(
         "create-dns-record", help="Create a new DNS record."
     )
-    parser_dns_create.set_defaults(func=PKBClient.create_dns_record)
+    parser_dns_create.set_defaults(method="create_dns_record")
     parser_dns_create.add_argument(
         "domain", help="The domain for which the new DNS record should be created."
     )
@@ -79,7 +366,7 @@ def main():
     parser_dns_edit = subparsers.add_parser(
         "update-dns-record", help="Edit an existing DNS record."
     )
-    parser_dns_edit.set_defaults(func=PKBClient.update_dns_record)
+    parser_dns_edit.set_defaults(method="update_dns_record")
     parser_dns_edit.add_argument(
         "domain", help="The domain for which the DNS record should be edited."
     )
@@ -109,7 +396,7 @@ def main():
     parser_dns_delete = subparsers.add_parser(
         "delete-dns-records", help="Delete an existing DNS record."
     )
-    parser_dns_delete.set_defaults(func=PKBClient.delete_dns_record)
+    parser_dns_delete.set_defaults(method="delete_dns_record")
     parser_dns_delete.add_argument(
         "domain", help="The domain for which the DNS record should be deleted."
     )
@@ -120,15 +407,16 @@ def main():
     parser_dns_receive = subparsers.add_parser(
         "get-dns-records", help="Get all DNS records."
     )
-    parser_dns_receive.set_defaults(func=PKBClient.get_dns_records)
+    parser_dns_receive.set_defaults(method="get_dns_records")
     parser_dns_receive.add_argument(
         "domain", help="The domain for which the DNS record should be retrieved."
     )
 
     parser_dns_export = subparsers.add_parser(
-        "export-dns-records", help="Save all DNS records to a local json file."
+        "export-dns-records",
+        help="Save all DNS records to a local json or ndjson file.",
     )
-    parser_dns_export.set_defaults(func=PKBClient.export_dns_records)
+    parser_dns_export.set_defaults(method="export_dns_records")
     parser_dns_export.add_argument(
         "domain",
         help="The domain for which the DNS record should be retrieved and saved.",
@@ -136,11 +424,19 @@ def main():
     parser_dns_export.add_argument(
         "filepath", help="The filepath where to save the exported DNS records."
     )
+    parser_dns_export.add_argument(
+        "--format",
+        dest="file_format",
+        type=ExportFormat,
+        choices=[ExportFormat.json, ExportFormat.ndjson],
+        help="The format of the file, ndjson writes one DNS record per line.",
+        default=ExportFormat.json,
+    )
 
     parser_dns_export_bind = subparsers.add_parser(
         "export-bind-dns-records", help="Save all DNS records to a local BIND file."
     )
-    parser_dns_export_bind.set_defaults(func=PKBClient.export_bind_dns_records)
+    parser_dns_export_bind.set_defaults(method="export_bind_dns_records")
     parser_dns_export_bind.add_argument(
         "domain",
         help="The domain for which the DNS record should be retrieved and saved.",
@@ -149,12 +445,49 @@ def main():
         "filepath", help="The filepath where to save the exported DNS records."
     )
 
+    parser_dns_export_all = subparsers.add_parser(
+        "export-all-dns-records",
+        help="Save the DNS records of all domains to local files, one file per domain and format.",
+    )
+    parser_dns_export_all.set_defaults(method="export_all_dns_records")
+    parser_dns_export_all.add_argument(
+        "directory", help="The directory where to save the exported DNS records."
+    )
+    parser_dns_export_all.add_argument(
+        "--format",
+        dest="formats",
+        nargs="+",
+        type=ExportFormat,
+        choices=list(ExportFormat),
+        default=[ExportFormat.json],
+        help="The export formats.",
+    )
+    parser_dns_export_all.add_argument(
+        "--workers",
+        dest="max_workers",
+        type=int,
+        help="The maximum number of domains exported at the same time.",
+        default=10,
+    )
+    parser_dns_export_all.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip domains which have already been exported in all formats.",
+    )
+    parser_dns_export_all.add_argument(
+        "--fingerprints",
+        dest="fingerprint_index",
+        type=FingerprintIndex,
+        metavar="FILE",
+        help="The fingerprint index of the last export, domains whose DNS records did not change are skipped.",
+    )
+
     parser_dns_import = subparsers.add_parser(
         "import-dns-records",
-        help="Restore all DNS records from a local json file.",
+        help="Restore all DNS records from a local json or ndjson file.",
         formatter_class=argparse.RawTextHelpFormatter,
     )
-    parser_dns_import.set_defaults(func=PKBClient.import_dns_records)
+    parser_dns_import.set_defaults(method="import_dns_records")
     parser_dns_import.add_argument(
         "domain", help="The domain for which the DNS record should be restored."
     )
@@ -163,42 +496,191 @@ def main():
     )
     parser_dns_import.add_argument(
         "restore_mode",
-        help="""The restore mode (DNS records are identified by the record type, name and prio if supported):
-    clear: remove all existing DNS records and restore all DNS records from the provided file
+        help="""The restore mode (DNS records are identified by the record type, name, prio if supported and content):
+    clear: make the DNS records equal to the DNS records from the provided file, changing only the differing DNS records
     replace: replace only existing DNS records with the DNS records from the provided file, but do not create any new DNS records
     keep: keep the existing DNS records and only create new ones for all DNS records from the specified file if they do not exist
     """,
         type=DNSRestoreMode.from_string,
         choices=list(DNSRestoreMode),
     )
+    parser_dns_import.add_argument(
+        "--format",
+        dest="file_format",
+        type=ExportFormat,
+        choices=[ExportFormat.json, ExportFormat.ndjson],
+        help="The format of the file, ndjson reads one DNS record per line.",
+        default=ExportFormat.json,
+    )
+    parser_dns_import.add_argument(
+        "--workers",
+        dest="max_workers",
+        type=int,
+        help="The maximum number of DNS records changed at the same time.",
+        default=1,
+    )
 
     parser_dns_import_bind = subparsers.add_parser(
         "import-bind-dns-records",
         help="Restore all DNS records from a local BIND file.",
         formatter_class=argparse.RawTextHelpFormatter,
     )
-    parser_dns_import_bind.set_defaults(func=PKBClient.import_bind_dns_records)
+    parser_dns_import_bind.set_defaults(method="import_bind_dns_records")
     parser_dns_import_bind.add_argument(
         "filepath", help="The filepath from which the DNS records are to be restored."
     )
     parser_dns_import_bind.add_argument(
         "restore_mode",
-        help="""The restore mode (DNS records are identified by the record id):
-    clear: remove all existing DNS records and restore all DNS records from the provided file
+        help="""The restore mode (DNS records are identified by the record type, name, prio if supported and content):
+    clear: make the DNS records equal to the DNS records from the provided file, changing only the differing DNS records
+    replace: replace only existing DNS records with the DNS records from the provided file, but do not create any new DNS records
+    keep: keep the existing DNS records and only create new ones for all DNS records from the specified file if they do not exist
     """,
         type=DNSRestoreMode.from_string,
-        choices=[DNSRestoreMode.clear],
+        choices=list(DNSRestoreMode),
+    )
+    parser_dns_import_bind.add_argument(
+        "--workers",
+        dest="max_workers",
+        type=int,
+        help="The maximum number of DNS records changed at the same time.",
+        default=1,
+    )
+
+    parser_dns_import_bind_directory = subparsers.add_parser(
+        "import-bind-directory",
+        help="Restore the DNS records of multiple domains from a local directory of BIND files.",
+    )
+    parser_dns_import_bind_directory.set_defaults(method="import_bind_directory")
+    parser_dns_import_bind_directory.add_argument(
+        "directory", help="The directory with the BIND files, one file per domain."
+    )
+    parser_dns_import_bind_directory.add_argument(
+        "restore_mode",
+        help="The restore mode, see import-bind-dns-records.",
+        type=DNSRestoreMode.from_string,
+        choices=list(DNSRestoreMode),
+    )
+    parser_dns_import_bind_directory.add_argument(
+        "--pattern",
+        help="The glob pattern of the BIND files in the directory.",
+        default="*.bind",
+    )
+    parser_dns_import_bind_directory.add_argument(
+        "--parse-workers",
+        type=int,
+        help="The number of processes parsing the BIND files, by default one per CPU core.",
+    )
+    parser_dns_import_bind_directory.add_argument(
+        "--workers",
+        dest="max_workers",
+        type=int,
+        help="The maximum number of DNS records of one domain changed at the same time.",
+        default=1,
+    )
+
+    parser_snapshot = subparsers.add_parser(
+        "snapshot-dns-records",
+        help="Save a snapshot of the DNS records in the snapshot store, requires --snapshot-store.",
+    )
+    parser_snapshot.set_defaults(method="snapshot_dns_records")
+    parser_snapshot.add_argument(
+        "--domain",
+        dest="domains",
+        nargs="+",
+        help="The domains to save, by default all domains of the account.",
+    )
+    parser_snapshot.add_argument("--label", help="A description of the snapshot.")
+    parser_snapshot.add_argument(
+        "--fingerprints",
+        dest="fingerprint_index",
+        type=FingerprintIndex,
+        metavar="FILE",
+        help="The fingerprint index of the last snapshot, no snapshot is created if no domain changed.",
+    )
+    parser_snapshot.add_argument(
+        "--workers",
+        dest="max_workers",
+        type=int,
+        help="The maximum number of domains retrieved at the same time.",
+        default=10,
+    )
+
+    parser_batch = subparsers.add_parser(
+        "batch",
+        help="Execute many commands with one client. Every input line is a json array of a command and its "
+        'arguments, e.g. ["get-dns-records", "example.com"], or a json object with this array as "args" and an '
+        'optional "id". One json line with the "id", "ok" and the "result" or "error" is written per command.',
+    )
+    parser_batch.set_defaults(method="batch")
+    parser_batch.add_argument(
+        "input",
+        help="The file with the commands, by default the commands are read from the standard input.",
+        nargs="?",
+        type=argparse.FileType("r"),
+        default="-",
+    )
+    parser_batch.add_argument(
+        "--workers",
+        dest="max_workers",
+        type=int,
+        help="The maximum number of commands executed at the same time.",
+        default=1,
+    )
+
+    parser_list_snapshots = subparsers.add_parser(
+        "list-snapshots",
+        help="List the snapshots in the snapshot store, requires --snapshot-store.",
+    )
+    parser_list_snapshots.set_defaults(method="list_snapshots")
+    parser_list_snapshots.add_argument(
+        "--domain", help="Only list the snapshots which contain this domain."
+    )
+
+    parser_restore_snapshot = subparsers.add_parser(
+        "restore-dns-records-snapshot",
+        help="Restore the DNS records of a domain from a snapshot, requires --snapshot-store.",
+    )
+    parser_restore_snapshot.set_defaults(method="restore_dns_records_snapshot")
+    parser_restore_snapshot.add_argument(
+        "domain", help="The domain for which the DNS record should be restored."
+    )
+    parser_restore_snapshot.add_argument(
+        "restore_mode",
+        help="The restore mode, see import-dns-records.",
+        type=DNSRestoreMode.from_string,
+        choices=list(DNSRestoreMode),
+    )
+    parser_restore_snapshot.add_argument(
+        "--snapshot",
+        dest="snapshot_id",
+        help="The id of the snapshot, by default the newest snapshot which contains the domain.",
+    )
+    parser_restore_snapshot.add_argument(
+        "--workers",
+        dest="max_workers",
+        type=int,
+        help="The maximum number of DNS records changed at the same time.",
+        default=1,
     )
 
     parser_domain_pricing = subparsers.add_parser(
         "get-domain-pricing", help="Get the pricing for Porkbun domains."
     )
-    parser_domain_pricing.set_defaults(func=PKBClient.get_domain_pricing)
+    parser_domain_pricing.set_defaults(method="get_domain_pricing")
+
+    parser_tld_pricing = subparsers.add_parser(
+        "get-tld-pricing", help="Get the pricing for a single TLD."
+    )
+    parser_tld_pricing.set_defaults(method="get_tld_pricing")
+    parser_tld_pricing.add_argument(
+        "tld", help='The TLD for which the pricing should be retrieved, e.g. "com".'
+    )
 
     parser_ssl_retrieve = subparsers.add_parser(
         "get-ssl-bundle", help="Retrieve an SSL bundle for given domain."
     )
-    parser_ssl_retrieve.set_defaults(func=PKBClient.get_ssl_bundle)
+    parser_ssl_retrieve.set_defaults(method="get_ssl_bundle")
     parser_ssl_retrieve.add_argument(
         "domain", help="The domain for which the SSL bundle should be retrieve."
     )
@@ -206,7 +688,7 @@ def main():
     parser_update_dns_server = subparsers.add_parser(
         "update-dns-servers", help="Update the DNS servers for a domain."
     )
-    parser_update_dns_server.set_defaults(func=PKBClient.update_dns_servers)
+    parser_update_dns_server.set_defaults(method="update_dns_servers")
     parser_update_dns_server.add_argument(
         "domain", help="The domain for which the DNS servers should be set."
     )
@@ -217,7 +699,7 @@ def main():
     parser_get_dns_server = subparsers.add_parser(
         "get-dns-servers", help="Retrieve the DNS servers for a domain."
     )
-    parser_get_dns_server.set_defaults(func=PKBClient.get_dns_servers)
+    parser_get_dns_server.set_defaults(method="get_dns_servers")
     parser_get_dns_server.add_argument(
         "domain", help="The domain for which the DNS servers should be retrieved."
     )
@@ -225,7 +707,7 @@ def main():
     parser_list_domains = subparsers.add_parser(
         "get-domains", help="List all domains in this account in chunks of 1000."
     )
-    parser_list_domains.set_defaults(func=PKBClient.get_domains)
+    parser_list_domains.set_defaults(method="get_domains")
     parser_list_domains.add_argument(
         "--start",
         type=int,
@@ -233,11 +715,17 @@ def main():
         default=0,
         required=False,
     )
+    parser_list_domains.add_argument(
+        "--all",
+        dest="all_domains",
+        action="store_true",
+        help="List all domains from the start index instead of one chunk.",
+    )
 
     parser_get_url_forward = subparsers.add_parser(
         "get-url-forwards", help="Retrieve all URL forwards."
     )
-    parser_get_url_forward.set_defaults(func=PKBClient.get_url_forwards)
+    parser_get_url_forward.set_defaults(method="get_url_forwards")
     parser_get_url_forward.add_argument(
         "domain", help="The domain for which the URL forwards should be retrieved."
     )
@@ -245,7 +733,7 @@ def main():
     parser_add_url_forward = subparsers.add_parser(
         "create-url-forward", help="Create a new URL forward."
     )
-    parser_add_url_forward.set_defaults(func=PKBClient.create_url_forward)
+    parser_add_url_forward.set_defaults(method="create_url_forward")
     parser_add_url_forward.add_argument(
         "domain", help="The domain for which the new URL forward should be created."
     )
@@ -278,7 +766,7 @@ def main():
     parser_delete_url_forward = subparsers.add_parser(
         "delete-url-forward", help="Delete an existing URL forward."
     )
-    parser_delete_url_forward.set_defaults(func=PKBClient.delete_url_forward)
+    parser_delete_url_forward.set_defaults(method="delete_url_forward")
     parser_delete_url_forward.add_argument(
         "domain", help="The domain for which the URL forward should be deleted."
     )
@@ -286,32 +774,80 @@ def main():
         "id", help="The id of the URL forward which should be deleted."
     )
 
+    return parser
+
+
+def main():
+    parser = create_parser()
     args = vars(parser.parse_args())
 
+    # configure the logging only for the command line, the library does not change the logging of applications
+    logging.basicConfig(level=logging.INFO)
+
     debug = args.pop("debug", False)
 
-    func = args.pop("func", None)
-    if not func:
+    method = args.pop("method", None)
+    if not method:
         raise argparse.ArgumentError(
             None, "No method specified. Please provide a method and try again."
         )
 
-    endpoint = args.pop("endpoint")
+    from pkb_client.client import API_ENDPOINT, PKBClient
+    from pkb_client.client.retry import RetryPolicy
+
+    endpoint = args.pop("endpoint") or API_ENDPOINT
+    retries = args.pop("retries")
+    retry_policy = RetryPolicy(max_attempts=retries + 1) if retries > 0 else None
     api_key = args.pop("key")
     api_secret = args.pop("secret")
+    pricing_cache_max_age = args.pop("pricing_cache")
+    pricing_cache = None
+    if pricing_cache_max_age is not None:
+        from pkb_client.client.cache import PricingCache
+
+        # the command exits directly, so the pricing is refreshed before returning it
+        pricing_cache = PricingCache(
+            max_age=pricing_cache_max_age, background_refresh=False
+        )
+    soa_nameservers = args.pop("soa_nameservers")
+    soa_timeout = args.pop("soa_timeout")
+    offline_soa = args.pop("offline_soa")
+    snapshot_store_path = args.pop("snapshot_store")
+    snapshot_store = None
+    if snapshot_store_path is not None:
+        from pkb_client.client.snapshot import SnapshotStore
+
+        snapshot_store = SnapshotStore(snapshot_store_path)
+
+    # the commands of the snapshot store work offline
+    if method == "list_snapshots":
+        if snapshot_store is None:
+            parser.error("list-snapshots requires --snapshot-store")
+        print_json(resolve_method(method)(snapshot_store, **args))
+        exit(0)
 
     # call the api methods which do not require authentication
-    if func == PKBClient.get_domain_pricing:
-        pkb_client = PKBClient(api_endpoint=endpoint, debug=debug)
-        ret = func(pkb_client, **args)
+    if method in ("get_domain_pricing", "get_tld_pricing"):
+        pkb_client = PKBClient(
+            api_endpoint=endpoint,
+            debug=debug,
+            retry_policy=retry_policy,
+            pricing_cache=pricing_cache,
+        )
+        ret = resolve_method(method)(pkb_client, **args)
 
-        print(json.dumps(ret, cls=CustomJSONEncoder, indent=4))
+        print_json(ret)
         exit(0)
 
     if api_key is None:
         # try to get the api key from the environment variable or fallback to user input
         api_key = os.environ.get("PKB_API_KEY", "")
         if len(api_key.strip()) == 0:
+            if method == "batch":
+                # the batch mode is not interactive, the standard input can contain the commands
+                parser.error(
+                    "batch requires the API key as option or environment variable"
+                )
             while True:
                 api_key = input(
                     'Please enter your API key you got from Porkbun (usually starts with "pk"): '
@@ -325,6 +861,11 @@ def main():
         # try to get the api secret from the environment variable or fallback to user input
         api_secret = os.environ.get("PKB_API_SECRET", "")
         if len(api_secret.strip()) == 0:
+            if method == "batch":
+                # the batch mode is not interactive, the standard input can contain the commands
+                parser.error(
+                    "batch requires the API key secret as option or environment variable"
+                )
             while True:
                 api_secret = input(
                     'Please enter your API key secret you got from Porkbun (usually starts with "sk"): '
@@ -334,13 +875,50 @@ def main():
                 else:
                     break
 
+    if args.pop("all_domains", False):
+        method = "iter_domains"
+
+    # allow one pooled connection per worker
+    max_workers = args.get("max_workers", 1)
+    if method in (
+        "import_dns_records",
+        "import_bind_dns_records",
+        "restore_dns_records_snapshot",
+    ):
+        args["progress"] = progress_printer("DNS records changed")
+    elif method == "export_all_dns_records":
+        args["progress"] = progress_printer("domains exported")
+    elif method == "import_bind_directory":
+        args["progress"] = progress_printer("files imported")
+
+    from pkb_client.client.soa import OfflineSOAProvider, ResolverSOAProvider
+
+    if offline_soa:
+        soa_provider = OfflineSOAProvider()
+    else:
+        soa_provider = ResolverSOAProvider(
+            nameservers=soa_nameservers, timeout=soa_timeout
+        )
+
     pkb_client = PKBClient(
-        api_key=api_key, secret_api_key=api_secret, api_endpoint=endpoint, debug=debug
+        api_key=api_key,
+        secret_api_key=api_secret,
+        api_endpoint=endpoint,
+        debug=debug,
+        pool_maxsize=max(10, max_workers),
+        retry_policy=retry_policy,
+        pricing_cache=pricing_cache,
+        soa_provider=soa_provider,
+        snapshot_store=snapshot_store,
     )
 
-    ret = func(pkb_client, **args)
+    if method == "batch":
+        ok = run_batch(pkb_client, snapshot_store=snapshot_store, **args)
+        exit(0 if ok else 1)
+
+    ret = resolve_method(method)(pkb_client, **args)
 
-    print(json.dumps(ret, cls=CustomJSONEncoder, indent=4))
+    print_json(ret)
 
 
 if __name__ == "__main__":
@@ -1,22 +1,89 @@
-from .bind_file import BindFile, BindRecord, RecordClass
-from .client import PKBClient, PKBClientException, API_ENDPOINT
-from .dns import DNSRecord, DNSRestoreMode, DNSRecordType
-from .domain import DomainInfo
-from .forwarding import URLForwarding, URLForwardingType
-from .ssl_cert import SSLCertBundle
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .bind_file import BindFile, BindRecord, RecordClass
+    from .client import PKBClient, PKBClientException, API_ENDPOINT
+    from .async_client import AsyncPKBClient
+    from .bulk import DNSMutation
+    from .cache import DNSRecordCache, PricingCache
+    from .dns import DNSRecord, DNSRestoreMode, DNSRecordType
+    from .domain import DomainInfo
+    from .export import ExportFormat
+    from .fingerprint import FingerprintIndex
+    from .forwarding import URLForwarding, URLForwardingType
+    from .rate_limit import RateLimiter
+    from .retry import RetryPolicy
+    from .snapshot import SnapshotStore
+    from .soa import OfflineSOAProvider, ResolverSOAProvider
+    from .ssl_cert import SSLCertBundle
+
+# the submodules are imported on first access of their names, so importing the package does not load
+# heavy dependencies like requests which are not needed by every caller
+_LAZY_IMPORTS = {
+    "PKBClient": ".client",
+    "AsyncPKBClient": ".async_client",
+    "PKBClientException": ".client",
+    "API_ENDPOINT": ".client",
+    "BindFile": ".bind_file",
+    "DNSMutation": ".bulk",
+    "BindRecord": ".bind_file",
+    "RecordClass": ".bind_file",
+    "DNSRecord": ".dns",
+    "DNSRestoreMode": ".dns",
+    "DNSRecordType": ".dns",
+    "DomainInfo": ".domain",
+    "ExportFormat": ".export",
+    "URLForwarding": ".forwarding",
+    "URLForwardingType": ".forwarding",
+    "SSLCertBundle": ".ssl_cert",
+    "DNSRecordCache": ".cache",
+    "PricingCache": ".cache",
+    "RateLimiter": ".rate_limit",
+    "RetryPolicy": ".retry",
+    "ResolverSOAProvider": ".soa",
+    "OfflineSOAProvider": ".soa",
+    "SnapshotStore": ".snapshot",
+    "FingerprintIndex": ".fingerprint",
+}
 
 __all__ = [
     "PKBClient",
+    "AsyncPKBClient",
     "PKBClientException",
     "API_ENDPOINT",
     "BindFile",
+    "DNSMutation",
     "BindRecord",
     "RecordClass",
     "DNSRecord",
     "DNSRestoreMode",
     "DNSRecordType",
     "DomainInfo",
+    "ExportFormat",
     "URLForwarding",
     "URLForwardingType",
     "SSLCertBundle",
+    "DNSRecordCache",
+    "PricingCache",
+    "RateLimiter",
+    "RetryPolicy",
+    "ResolverSOAProvider",
+    "OfflineSOAProvider",
+    "SnapshotStore",
+    "FingerprintIndex",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    # cache the value, so the next access does not call this function again
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
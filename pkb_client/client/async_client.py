@@ -0,0 +1,914 @@
+import asyncio
+import functools
+import json
+import logging
+from collections import OrderedDict
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+)
+from urllib.parse import urljoin
+
+try:
+    import httpx
+except ImportError as e:
+    raise ImportError(
+        "the AsyncPKBClient requires httpx, install it with: pip install pkb_client[async]"
+    ) from e
+
+from pkb_client.client.bulk import DNSMutation, DNSMutationResult
+from pkb_client.client.cache import DNSRecordCache
+from pkb_client.client.client import API_ENDPOINT, PKBClient, PKBClientException
+from pkb_client.client.dispatch import (
+    APIRequest,
+    APIResponse,
+    AsyncHandler,
+    AsyncMiddleware,
+    SingleFlightMiddleware,
+    _copy_exception,
+    build_async_pipeline,
+    endpoint_group,
+)
+from pkb_client.client.dns import (
+    DNS_RECORDS_WITH_PRIORITY,
+    DNSRecord,
+    DNSRecordType,
+)
+from pkb_client.client.dnssec import DNSSECRecord
+from pkb_client.client.domain import (
+    DomainAvailability,
+    DomainCheckRateLimit,
+    DomainInfo,
+    GlueRecord,
+)
+from pkb_client.client.forwarding import URLForwarding, URLForwardingType
+from pkb_client.client.rate_limit import RateLimiter, RateLimitMiddleware
+from pkb_client.client.reconcile import (
+    ReconcilePlan,
+    compute_reconcile_plan,
+    subdomain_of,
+)
+from pkb_client.client.retry import RetryMiddleware, RetryPolicy
+from pkb_client.client.ssl_cert import SSLCertBundle
+
+logger = logging.getLogger("pkb_client")
+
+
+class AsyncSingleFlightMiddleware:
+    """
+    Asyncio variant of :class:`SingleFlightMiddleware <pkb_client.client.dispatch.SingleFlightMiddleware>`:
+    concurrent identical read only API calls share one HTTP call and one parsed response.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[str, asyncio.Future] = {}
+        # the number of API calls which were served by an API call already in flight
+        self.coalesced = 0
+
+    async def __call__(
+        self, request: APIRequest, call_next: AsyncHandler
+    ) -> APIResponse:
+        if not request.read_only:
+            try:
+                return await call_next(request)
+            finally:
+                self._calls.clear()
+
+        key = SingleFlightMiddleware._key(request)
+        call = self._calls.get(key)
+        if call is None:
+            call = self._calls[key] = asyncio.ensure_future(call_next(request))
+            call.add_done_callback(lambda done: self._done(key, done))
+        else:
+            self.coalesced += 1
+
+        try:
+            # the shared API call is not cancelled if one of the callers is cancelled
+            return await asyncio.shield(call)
+        except Exception as e:
+            # every caller raises its own exception, so the traceback of the shared exception is not
+            # modified by multiple callers
+            raise _copy_exception(e) from e
+
+    def _done(self, key: str, call: asyncio.Future) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        if not call.cancelled():
+            # the exception is retrieved, so no warning is logged if all callers were cancelled
+            call.exception()
+
+
+class AsyncRetryMiddleware(RetryMiddleware):
+    """
+    Asyncio variant of :class:`RetryMiddleware <pkb_client.client.retry.RetryMiddleware>`, which waits between the
+    attempts without blocking the event loop.
+    """
+
+    def __init__(
+        self,
+        policy: RetryPolicy,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        super().__init__(policy, sleep)
+
+    async def __call__(
+        self, request: APIRequest, call_next: AsyncHandler
+    ) -> APIResponse:
+        attempt = 1
+        while True:
+            try:
+                response = await call_next(request)
+            except httpx.TransportError as e:
+                delay = self._exception_delay(request, e, attempt)
+                if delay is None:
+                    raise
+            else:
+                delay = self._response_delay(request, response, attempt)
+                if delay is None:
+                    return response
+
+            await self._sleep(delay)
+            attempt += 1
+
+    def _retry_exception(self, request: APIRequest, e: Exception) -> bool:
+        if isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout)):
+            # the connection was never established, so the request was not sent
+            return True
+        if isinstance(e, (httpx.NetworkError, httpx.TimeoutException)):
+            return self._may_retry(request)
+        return False
+
+
+class AsyncRateLimitMiddleware(RateLimitMiddleware):
+    """
+    Asyncio variant of :class:`RateLimitMiddleware <pkb_client.client.rate_limit.RateLimitMiddleware>`, which waits
+    for the rate limit without blocking the event loop.
+    """
+
+    def __init__(
+        self,
+        rate_limiter: RateLimiter,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        super().__init__(rate_limiter)
+        self._sleep = sleep
+
+    async def __call__(
+        self, request: APIRequest, call_next: AsyncHandler
+    ) -> APIResponse:
+        key = endpoint_group(request.endpoint)
+        wait = self.rate_limiter.reserve(key)
+        if wait > 0:
+            logger.debug(f"rate limit of {key} reached, waiting {wait:.2f} seconds")
+            await self._sleep(wait)
+
+        response = await call_next(request)
+        self._learn(key, response)
+        return response
+
+
+class AsyncPKBClient:
+    """
+    Native asyncio API client for Porkbun.
+
+    Provides the API methods of :class:`PKBClient` as coroutines. All API calls are sent with one pooled
+    :class:`httpx.AsyncClient`, so many API calls can be in flight at the same time from one event loop without
+    worker threads. The number of API calls in flight is bounded by `max_concurrency`, further calls wait for a
+    free slot.
+
+    The methods of :class:`PKBClient` which read or write local files (exports, imports and snapshots) are not
+    provided, use :class:`PKBClient` for them.
+
+    Requires the optional dependency httpx, install it with ``pip install pkb_client[async]``.
+    """
+
+    default_ttl: int = PKBClient.default_ttl
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        secret_api_key: Optional[str] = None,
+        api_endpoint: str = API_ENDPOINT,
+        debug: bool = False,
+        max_concurrency: int = 10,
+        timeout: Optional[float] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        middlewares: Optional[List[AsyncMiddleware]] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        dns_cache: Optional[DNSRecordCache] = None,
+        coalesce_reads: bool = True,
+    ) -> None:
+        """
+        Creates a new AsyncPKBClient object.
+
+        Call :meth:`aclose` or use the client as asynchronous context manager to release the pooled connections.
+
+        :param api_key: the API key used for Porkbun API calls
+        :param secret_api_key: the API secret used for Porkbun API calls
+        :param api_endpoint: the endpoint of the Porkbun API.
+        :param debug: boolean to enable debug logging
+        :param max_concurrency: the maximum number of API calls in flight at the same time, which is also the size of
+                                the connection pool
+        :param timeout: the timeout in seconds for each API call, None to wait forever
+        :param http_client: an existing httpx client to use instead of creating a new one;
+                            the pool settings and the timeout are ignored in this case
+        :param middlewares: additional asyncio middlewares which are called for every API call before it is sent,
+                            see :mod:`pkb_client.client.dispatch`
+        :param retry_policy: the policy to retry API calls after transient failures, None to disable retries
+        :param rate_limiter: the rate limiter which delays API calls that would exceed the rate limits of the API,
+                             None to disable client side rate limiting
+        :param dns_cache: the cache for retrieved DNS records, which is invalidated by DNS record changes
+                          made through this client, None to disable caching
+        :param coalesce_reads: whether concurrent identical read only API calls should share one HTTP call
+        """
+
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        self.api_key = api_key
+        self.secret_api_key = secret_api_key
+        self.api_endpoint = api_endpoint
+        self.debug = debug
+        if self.debug:
+            logger.setLevel(logging.DEBUG)
+
+        if http_client is None:
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=max_concurrency,
+                    max_keepalive_connections=max_concurrency,
+                ),
+                timeout=httpx.Timeout(timeout),
+            )
+        self._http_client = http_client
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        self.middlewares = list(middlewares or [])
+        self.retry_policy = retry_policy
+        self.rate_limiter = rate_limiter
+        self.dns_cache = dns_cache
+
+        pipeline = list(self.middlewares)
+        if coalesce_reads:
+            # coalesced API calls share the retries and the rate limit of one HTTP call
+            pipeline.append(AsyncSingleFlightMiddleware())
+        if self.retry_policy is not None:
+            pipeline.append(AsyncRetryMiddleware(self.retry_policy))
+        if self.rate_limiter is not None:
+            # the rate limiter is called for every attempt of a retried API call
+            pipeline.append(AsyncRateLimitMiddleware(self.rate_limiter))
+        self._pipeline = build_async_pipeline(pipeline, self._send)
+
+    async def aclose(self) -> None:
+        """
+        Close the httpx client and release all pooled connections.
+        """
+
+        await self._http_client.aclose()
+
+    async def __aenter__(self) -> "AsyncPKBClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.aclose()
+
+    def _get_auth_request_json(self) -> dict:
+        """
+        Get the request json for the authentication of the Porkbun API calls.
+
+        :return: the request json for the authentication of the Porkbun API calls
+        """
+
+        if self.api_key is None or self.secret_api_key is None:
+            raise ValueError("api_key and secret_api_key must be set")
+
+        return {"apikey": self.api_key, "secretapikey": self.secret_api_key}
+
+    async def _request(
+        self,
+        endpoint: str,
+        req_json: Optional[dict] = None,
+        auth: bool = True,
+        read_only: bool = False,
+        idempotent: bool = False,
+    ) -> dict:
+        """
+        Send an API call through the middleware pipeline of the client.
+
+        :param endpoint: the API path relative to the API endpoint
+        :param req_json: the JSON body of the API call without the authentication
+        :param auth: whether the authentication should be added to the JSON body
+        :param read_only: whether the API call only reads data
+        :param idempotent: whether the API call can be repeated without changing the result;
+                           read only API calls are always idempotent
+        :return: the parsed JSON response of the API call
+        :raises PKBClientException: if the API call was not successful
+        """
+
+        if auth:
+            req_json = {**self._get_auth_request_json(), **(req_json or {})}
+
+        request = APIRequest(
+            endpoint=endpoint,
+            url=urljoin(self.api_endpoint, endpoint),
+            json=req_json,
+            read_only=read_only,
+            idempotent=read_only or idempotent,
+        )
+        response = await self._pipeline(request)
+
+        if response.ok:
+            return response.data
+
+        data = response.data or {}
+        raise PKBClientException(
+            data.get("status", "Unknown status"),
+            data.get("message", "Unknown message"),
+            status_code=response.status_code,
+        )
+
+    async def _send(self, request: APIRequest) -> APIResponse:
+        """
+        Send the API call with the httpx client and parse the JSON response.
+
+        :param request: the API call to send
+        :return: the response of the API call
+        """
+
+        async with self._semaphore:
+            r = await self._http_client.post(url=request.url, json=request.json)
+
+        try:
+            data = json.loads(r.content)
+        except ValueError:
+            data = None
+
+        return APIResponse(status_code=r.status_code, data=data, headers=r.headers)
+
+    def _check_dns_record(
+        self, record_type: DNSRecordType, ttl: int, prio: Optional[int]
+    ) -> None:
+        if ttl > 86400 or ttl < self.default_ttl:
+            raise ValueError(f"ttl must be between {self.default_ttl} and 86400")
+
+        if prio is not None and record_type not in DNS_RECORDS_WITH_PRIORITY:
+            raise ValueError(
+                f"Priority can only be set for {DNS_RECORDS_WITH_PRIORITY}"
+            )
+
+    def _invalidate_dns_records(self, domain: str) -> None:
+        """
+        Invalidate the cached DNS records of a domain after they were changed.
+
+        :param domain: the domain of the changed DNS records
+        """
+
+        if self.dns_cache is not None:
+            self.dns_cache.invalidate(domain)
+
+    async def ping(self) -> str:
+        """
+        Coroutine variant of :meth:`PKBClient.ping`.
+        """
+
+        return (await self._request("ping", read_only=True)).get("yourIp", None)
+
+    async def create_dns_record(
+        self,
+        domain: str,
+        record_type: DNSRecordType,
+        content: str,
+        name: Optional[str] = None,
+        ttl: int = default_ttl,
+        prio: Optional[int] = None,
+    ) -> str:
+        """
+        Coroutine variant of :meth:`PKBClient.create_dns_record`.
+        """
+
+        self._check_dns_record(record_type, ttl, prio)
+
+        try:
+            data = await self._request(
+                f"dns/create/{domain}",
+                {
+                    "name": name,
+                    "type": record_type.value,
+                    "content": content,
+                    "ttl": ttl,
+                    "prio": prio,
+                },
+            )
+        finally:
+            self._invalidate_dns_records(domain)
+        return str(data.get("id", None))
+
+    async def update_dns_record(
+        self,
+        domain: str,
+        record_id: str,
+        record_type: DNSRecordType,
+        content: str,
+        name: Optional[str] = None,
+        ttl: int = default_ttl,
+        prio: Optional[int] = None,
+    ) -> bool:
+        """
+        Coroutine variant of :meth:`PKBClient.update_dns_record`.
+        """
+
+        self._check_dns_record(record_type, ttl, prio)
+
+        try:
+            await self._request(
+                f"dns/edit/{domain}/{record_id}",
+                {
+                    "name": name,
+                    "type": record_type.value,
+                    "content": content,
+                    "ttl": ttl,
+                    "prio": prio,
+                },
+                idempotent=True,
+            )
+        finally:
+            self._invalidate_dns_records(domain)
+        return True
+
+    async def update_all_dns_records(
+        self,
+        domain: str,
+        record_type: DNSRecordType,
+        subdomain: str,
+        content: str,
+        ttl: int = default_ttl,
+        prio: Optional[int] = None,
+    ) -> bool:
+        """
+        Coroutine variant of :meth:`PKBClient.update_all_dns_records`.
+        """
+
+        self._check_dns_record(record_type, ttl, prio)
+
+        try:
+            await self._request(
+                f"dns/editByNameType/{domain}/{record_type}/{subdomain}",
+                {
+                    "type": record_type.value,
+                    "content": content,
+                    "ttl": ttl,
+                    "prio": prio,
+                },
+                idempotent=True,
+            )
+        finally:
+            self._invalidate_dns_records(domain)
+        return True
+
+    async def delete_dns_record(self, domain: str, record_id: str) -> bool:
+        """
+        Coroutine variant of :meth:`PKBClient.delete_dns_record`.
+        """
+
+        try:
+            await self._request(f"dns/delete/{domain}/{record_id}")
+        except Exception:
+            self._invalidate_dns_records(domain)
+            raise
+        if self.dns_cache is not None:
+            # the other records of the domain are unchanged, so only remove the deleted record from the cache
+            self.dns_cache.remove_record(domain, record_id)
+        return True
+
+    async def delete_all_dns_records(
+        self, domain: str, record_type: DNSRecordType, subdomain: str
+    ) -> bool:
+        """
+        Coroutine variant of :meth:`PKBClient.delete_all_dns_records`.
+        """
+
+        try:
+            await self._request(
+                f"dns/deleteByNameType/{domain}/{record_type}/{subdomain}"
+            )
+        finally:
+            self._invalidate_dns_records(domain)
+        return True
+
+    async def get_dns_records(
+        self, domain: str, record_id: Optional[str] = None
+    ) -> List[DNSRecord]:
+        """
+        Coroutine variant of :meth:`PKBClient.get_dns_records`.
+        """
+
+        if self.dns_cache is not None:
+            records = self.dns_cache.get_records(domain)
+            if records is not None:
+                if record_id is None:
+                    return records
+                return [record for record in records if record.id == record_id]
+            # captured before the retrieval, so records retrieved before a concurrent change are not cached
+            generation = self.dns_cache.generation(domain)
+
+        if record_id is None:
+            endpoint = f"dns/retrieve/{domain}"
+        else:
+            endpoint = f"dns/retrieve/{domain}/{record_id}"
+        data = await self._request(endpoint, read_only=True)
+        records = [DNSRecord.from_dict(record) for record in data.get("records", [])]
+
+        if self.dns_cache is not None and record_id is None:
+            self.dns_cache.set_records(domain, records, generation)
+        return records
+
+    async def get_all_dns_records(
+        self, domain: str, record_type: DNSRecordType, subdomain: str
+    ) -> List[DNSRecord]:
+        """
+        Coroutine variant of :meth:`PKBClient.get_all_dns_records`.
+        """
+
+        if self.dns_cache is not None:
+            records = self.dns_cache.get_records_by_name_type(
+                domain, record_type, subdomain
+            )
+            if records is not None:
+                return records
+            generation = self.dns_cache.generation(domain)
+
+        data = await self._request(
+            f"dns/retrieveByNameType/{domain}/{record_type}/{subdomain}",
+            read_only=True,
+        )
+        records = [DNSRecord.from_dict(record) for record in data.get("records", [])]
+
+        if self.dns_cache is not None:
+            self.dns_cache.set_records_by_name_type(
+                domain, record_type, subdomain, records, generation
+            )
+        return records
+
+    async def apply_dns_mutations(
+        self,
+        mutations: List[DNSMutation],
+        max_workers: int = 10,
+        stop_on_error: bool = True,
+        progress: Optional[Callable[[DNSMutationResult], None]] = None,
+    ) -> List[DNSMutationResult]:
+        """
+        Coroutine variant of :meth:`PKBClient.apply_dns_mutations`.
+        """
+
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        results: List[Optional[DNSMutationResult]] = [None] * len(mutations)
+        by_domain: Dict[str, List[int]] = OrderedDict()
+        for index, mutation in enumerate(mutations):
+            by_domain.setdefault(mutation.domain.lower(), []).append(index)
+
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def apply_domain(indices: List[int]) -> None:
+            async with semaphore:
+                failed = False
+                for index in indices:
+                    mutation = mutations[index]
+                    if failed and stop_on_error:
+                        result = DNSMutationResult(mutation, skipped=True)
+                    else:
+                        try:
+                            # the methods of the client have the same signatures as the methods of PKBClient
+                            result = DNSMutationResult(
+                                mutation, result=await mutation.apply(self)
+                            )
+                        except Exception as e:
+                            result = DNSMutationResult(mutation, error=e)
+                            failed = True
+                    results[index] = result
+                    if progress is not None:
+                        progress(result)
+
+        await asyncio.gather(*(apply_domain(indices) for indices in by_domain.values()))
+
+        return results
+
+    async def reconcile_dns_records(
+        self,
+        domain: str,
+        dns_records: List[DNSRecord],
+        dry_run: bool = False,
+        max_workers: int = 1,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> ReconcilePlan:
+        """
+        Coroutine variant of :meth:`PKBClient.reconcile_dns_records`.
+        """
+
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        plan = compute_reconcile_plan(dns_records, await self.get_dns_records(domain))
+        logger.debug(
+            f"reconcile {domain}: {len(plan.creates)} creates, {len(plan.updates)} updates, "
+            f"{len(plan.deletes)} deletes"
+        )
+        if dry_run:
+            return plan
+
+        # delete first, so that new records do not conflict with records which are removed (e.g. CNAME records)
+        phases = [
+            [
+                functools.partial(self.delete_dns_record, domain, record.id)
+                for record in plan.deletes
+            ],
+            [
+                functools.partial(
+                    self.update_dns_record,
+                    domain=domain,
+                    record_id=current.id,
+                    record_type=record.type,
+                    content=record.content,
+                    name=subdomain_of(record.name, domain),
+                    ttl=record.ttl,
+                    prio=record.prio,
+                )
+                for current, record in plan.updates
+            ],
+            [
+                functools.partial(
+                    self.create_dns_record,
+                    domain=domain,
+                    record_type=record.type,
+                    content=record.content,
+                    name=subdomain_of(record.name, domain),
+                    ttl=record.ttl,
+                    prio=record.prio,
+                )
+                for record in plan.creates
+            ],
+        ]
+
+        total = plan.changes
+        done = 0
+        semaphore = asyncio.Semaphore(max_workers)
+        errors: List[Exception] = []
+
+        async def apply(change: Callable[[], Awaitable[Any]]) -> None:
+            nonlocal done
+            async with semaphore:
+                # the remaining changes are not applied after a change failed
+                if errors:
+                    return
+                try:
+                    await change()
+                except Exception as e:
+                    errors.append(e)
+                    return
+            done += 1
+            if progress is not None:
+                progress(done, total)
+
+        for phase in phases:
+            await asyncio.gather(*(apply(change) for change in phase))
+            if errors:
+                raise errors[0]
+
+        return plan
+
+    async def update_dns_servers(self, domain: str, name_servers: List[str]) -> bool:
+        """
+        Coroutine variant of :meth:`PKBClient.update_dns_servers`.
+        """
+
+        data = await self._request(
+            f"domain/updateNs/{domain}", {"ns": name_servers}, idempotent=True
+        )
+        if data.get("status", None) != "SUCCESS":
+            raise PKBClientException(
+                data.get("status", "Unknown status"),
+                data.get("message", "Unknown message"),
+            )
+        return True
+
+    async def get_dns_servers(self, domain: str) -> List[str]:
+        """
+        Coroutine variant of :meth:`PKBClient.get_dns_servers`.
+        """
+
+        data = await self._request(f"domain/getNs/{domain}", read_only=True)
+        return data.get("ns", [])
+
+    async def get_domains(self, start: int = 0) -> List[DomainInfo]:
+        """
+        Coroutine variant of :meth:`PKBClient.get_domains`.
+        """
+
+        data = await self._request("domain/listAll", {"start": start}, read_only=True)
+        return [DomainInfo.from_dict(d) for d in data.get("domains", [])]
+
+    async def iter_domains(
+        self, start: int = 0, prefetch: bool = True
+    ) -> AsyncIterator[DomainInfo]:
+        """
+        Asynchronous iterator variant of :meth:`PKBClient.iter_domains`.
+        """
+
+        next_domains = asyncio.ensure_future(self.get_domains(start))
+        try:
+            while True:
+                domains = await next_domains
+                if not domains:
+                    return
+                start += len(domains)
+                if prefetch:
+                    next_domains = asyncio.ensure_future(self.get_domains(start))
+                for domain in domains:
+                    yield domain
+                if not prefetch:
+                    next_domains = asyncio.ensure_future(self.get_domains(start))
+        finally:
+            # do not wait for a prefetched chunk if the iteration is stopped early
+            next_domains.cancel()
+
+    async def get_url_forwards(self, domain: str) -> List[URLForwarding]:
+        """
+        Coroutine variant of :meth:`PKBClient.get_url_forwards`.
+        """
+
+        data = await self._request(f"domain/getUrlForwarding/{domain}", read_only=True)
+        return [URLForwarding.from_dict(f) for f in data.get("forwards", [])]
+
+    async def create_url_forward(
+        self,
+        domain: str,
+        subdomain: str,
+        location: str,
+        type: URLForwardingType,
+        include_path: bool,
+        wildcard: bool,
+    ) -> bool:
+        """
+        Coroutine variant of :meth:`PKBClient.create_url_forward`.
+        """
+
+        await self._request(
+            f"domain/addUrlForward/{domain}",
+            {
+                "subdomain": subdomain,
+                "location": location,
+                "type": type.value,
+                "includePath": include_path,
+                "wildcard": wildcard,
+            },
+        )
+        return True
+
+    async def delete_url_forward(self, domain: str, id: str) -> bool:
+        """
+        Coroutine variant of :meth:`PKBClient.delete_url_forward`.
+        """
+
+        await self._request(f"domain/deleteUrlForward/{domain}/{id}")
+        return True
+
+    async def get_domain_pricing(self) -> Mapping[str, Any]:
+        """
+        Coroutine variant of :meth:`PKBClient.get_domain_pricing`.
+        """
+
+        data = await self._request("pricing/get", auth=False, read_only=True)
+        return data["pricing"]
+
+    async def get_tld_pricing(self, tld: str) -> Optional[dict]:
+        """
+        Coroutine variant of :meth:`PKBClient.get_tld_pricing`.
+        """
+
+        return (await self.get_domain_pricing()).get(tld.lower().lstrip("."))
+
+    async def get_ssl_bundle(self, domain: str) -> SSLCertBundle:
+        """
+        Coroutine variant of :meth:`PKBClient.get_ssl_bundle`.
+        """
+
+        ssl_bundle = await self._request(f"ssl/retrieve/{domain}", read_only=True)
+        return SSLCertBundle.from_dict(ssl_bundle)
+
+    async def get_dnssec_records(self, domain: str) -> List[DNSSECRecord]:
+        """
+        Coroutine variant of :meth:`PKBClient.get_dnssec_records`.
+        """
+
+        data = await self._request(f"dns/getDnssecRecords/{domain}", read_only=True)
+        return [
+            DNSSECRecord.from_dict(record)
+            for record in data.get("records", {}).values()
+        ]
+
+    async def create_dnssec_record(
+        self,
+        domain: str,
+        key_tag: int,
+        alg: int,
+        digest_type: int,
+        digest: str,
+        max_sig_life: Optional[int] = None,
+        key_data_flags: Optional[int] = None,
+        key_data_protocol: Optional[int] = None,
+        key_data_algo: Optional[int] = None,
+        key_data_pub_key: Optional[str] = None,
+    ) -> bool:
+        """
+        Coroutine variant of :meth:`PKBClient.create_dnssec_record`.
+        """
+
+        if max_sig_life is not None and max_sig_life < 0:
+            raise ValueError("max_sig_life must be greater than 0")
+
+        await self._request(
+            f"dns/createDnssecRecord/{domain}",
+            {
+                "keyTag": key_tag,
+                "alg": alg,
+                "digestType": digest_type,
+                "digest": digest,
+                "maxSigLife": max_sig_life,
+                "keyDataFlags": key_data_flags,
+                "keyDataProtocol": key_data_protocol,
+                "keyDataAlgo": key_data_algo,
+                "keyDataPubKey": key_data_pub_key,
+            },
+        )
+        return True
+
+    async def delete_dnssec_record(self, domain: str, key_tag: int) -> bool:
+        """
+        Coroutine variant of :meth:`PKBClient.delete_dnssec_record`.
+        """
+
+        await self._request(f"dns/deleteDnssecRecord/{domain}/{key_tag}")
+        return True
+
+    async def get_domain_availability(
+        self, domain: str
+    ) -> tuple[DomainAvailability, DomainCheckRateLimit]:
+        """
+        Coroutine variant of :meth:`PKBClient.get_domain_availability`.
+        """
+
+        data = await self._request(f"domain/checkDomain/{domain}", read_only=True)
+        return DomainAvailability.from_dict(
+            data["response"]
+        ), DomainCheckRateLimit.from_dict(data["limits"])
+
+    async def get_glue_records(self, domain: str) -> list[GlueRecord]:
+        """
+        Coroutine variant of :meth:`PKBClient.get_glue_records`.
+        """
+
+        data = await self._request(f"domain/getGlue/{domain}", read_only=True)
+        return [GlueRecord.from_host(host) for host in data.get("hosts", [])]
+
+    async def create_glue_record(
+        self, domain: str, glue_host_subdomain: str, ips: list[str]
+    ) -> bool:
+        """
+        Coroutine variant of :meth:`PKBClient.create_glue_record`.
+        """
+
+        await self._request(
+            f"domain/createGlue/{domain}/{glue_host_subdomain}",
+            {"ips": ips},
+        )
+        return True
+
+    async def delete_glue_record(self, domain: str, glue_host_subdomain: str) -> bool:
+        """
+        Coroutine variant of :meth:`PKBClient.delete_glue_record`.
+        """
+
+        await self._request(f"domain/deleteGlue/{domain}/{glue_host_subdomain}")
+        return True
+
+    async def update_glue_record(
+        self, domain: str, glue_host_subdomain: str, ips: list[str]
+    ) -> bool:
+        """
+        Coroutine variant of :meth:`PKBClient.update_glue_record`.
+        """
+
+        await self._request(
+            f"domain/updateGlue/{domain}/{glue_host_subdomain}",
+            {"ips": ips},
+            idempotent=True,
+        )
+        return True
@@ -1,7 +1,12 @@
+import io
 import logging
+import os
+import re
+import time
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional, List
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, TextIO, Tuple, Union
 
 from pkb_client.client.dns import DNSRecordType, DNS_RECORDS_WITH_PRIORITY
 
@@ -24,13 +29,388 @@ class BindRecord:
     comment: Optional[str] = None
 
     def __str__(self):
-        record_string = f"{self.name} {self.ttl} {self.record_class} {self.record_type}"
-        if self.prio is not None:
-            record_string += f" {self.prio}"
-        record_string += f' "{self.data}"'
-        if self.comment:
-            record_string += f" ; {self.comment}"
-        return record_string
+        prio = "" if self.prio is None else f" {self.prio}"
+        data = self.data
+        if self.record_type is DNSRecordType.TXT:
+            # only the TXT data is a character string, names, addresses and the data of the other record types
+            # are written as they are
+            data = _character_strings(data)
+        comment = f" ; {self.comment}" if self.comment else ""
+        return f"{self.name} {self.ttl} {self.record_class} {self.record_type}{prio} {data}{comment}"
+
+
+# the classes of the master file format, only IN is supported by Porkbun
+RECORD_CLASSES = {"IN", "CS", "CH", "HS"}
+
+# the record types whose data is a domain name, which can be relative to the origin
+_DOMAIN_NAME_RECORD_TYPES = {
+    DNSRecordType.MX,
+    DNSRecordType.CNAME,
+    DNSRecordType.ALIAS,
+    DNSRecordType.NS,
+}
+
+# the tokens of a master file line: whitespace, comment, parenthesis, quoted string, word or an invalid character
+_TOKEN_PATTERN = re.compile(
+    r'[ \t\r\n]+|;(.*)|([()])|"((?:[^"\\\n]|\\.)*)"|((?:[^\s"();\\]|\\.)+)|(.)'
+)
+# lines without these characters can be split on whitespace
+_SPECIAL_CHARACTERS_PATTERN = re.compile(r'[";()\\]')
+_ESCAPE_PATTERN = re.compile(r"\\(\d{3}|.)", re.DOTALL)
+_TTL_PATTERN = re.compile(r"(\d+)([smhdw]?)")
+_TTL_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+# the maximum size of a character string in bytes
+_MAX_CHARACTER_STRING_SIZE = 255
+
+
+class _QuotedString(str):
+    """
+    Token which was written as quoted character string, the content is still escaped.
+    """
+
+    __slots__ = ()
+
+
+def _character_strings(text: str) -> str:
+    """
+    Write a text as quoted character strings, texts longer than 255 bytes are split into multiple strings.
+
+    :param text: the unescaped text
+    :return: the escaped and quoted character strings separated by spaces
+    """
+
+    chunks = []
+    start = 0
+    if len(text.encode()) > _MAX_CHARACTER_STRING_SIZE:
+        size = 0
+        for i, character in enumerate(text):
+            character_size = len(character.encode())
+            if size + character_size > _MAX_CHARACTER_STRING_SIZE:
+                chunks.append(text[start:i])
+                start = i
+                size = 0
+            size += character_size
+    chunks.append(text[start:])
+
+    return " ".join(
+        '"{}"'.format(chunk.replace("\\", "\\\\").replace('"', '\\"'))
+        for chunk in chunks
+    )
+
+
+def _unescape(text: str) -> str:
+    """
+    Resolve the escape sequences (\\X and \\DDD) of a master file token.
+
+    :param text: the escaped text
+    :return: the unescaped text
+    """
+
+    if "\\" not in text:
+        return str(text)
+    return _ESCAPE_PATTERN.sub(
+        lambda m: chr(int(m.group(1))) if len(m.group(1)) == 3 else m.group(1), text
+    )
+
+
+def _parse_ttl(token: str, line_number: int) -> int:
+    """
+    Parse a TTL in seconds or with units, e.g. "3600" or "1h30m".
+
+    :param token: the TTL token
+    :param line_number: the line number for error messages
+    :return: the TTL in seconds
+    """
+
+    if token.isdigit():
+        return int(token)
+    token = token.lower()
+    parts = _TTL_PATTERN.findall(token)
+    if not parts or "".join(value + unit for value, unit in parts) != token:
+        raise ValueError(f"line {line_number}: invalid TTL: {token}")
+    return sum(int(value) * _TTL_UNITS[unit] for value, unit in parts)
+
+
+def _tokenize(
+    lines: Iterable[str],
+) -> Iterator[Tuple[bool, List[str], Optional[str], int]]:
+    """
+    Split the lines of a master file into entries in a single pass. Entries in parentheses can span multiple lines.
+
+    :param lines: the lines of the master file
+    :return: iterator of the entries as tuple of whether the owner is omitted (the entry starts with whitespace),
+             the tokens (quoted strings as :class:`_QuotedString`), the comments and the line number of the entry
+    """
+
+    tokens: List[str] = []
+    comments: List[str] = []
+    depth = 0
+    owner_omitted = False
+    start_line = 0
+    line_number = 0
+    for line_number, line in enumerate(lines, 1):
+        if depth == 0:
+            owner_omitted = line[:1] in (" ", "\t")
+            start_line = line_number
+            if _SPECIAL_CHARACTERS_PATTERN.search(line) is None:
+                # fast path for the most common lines
+                parts = line.split()
+                if parts:
+                    yield owner_omitted, parts, None, line_number
+                continue
+
+        # the end of the previous token, if no whitespace followed it
+        token_end = -1
+        for match in _TOKEN_PATTERN.finditer(line):
+            group = match.lastindex
+            if group in (3, 4):
+                previous = tokens[-1] if tokens and token_end == match.start() else None
+                token_end = match.end()
+                if previous is not None and not (
+                    group == 3 and isinstance(previous, _QuotedString)
+                ):
+                    # a quoted string directly attached to a word is part of the word, e.g. alpn="h2,h3"
+                    if isinstance(previous, _QuotedString):
+                        previous = f'"{previous}"'
+                    tokens[-1] = previous + match.group(0)
+                elif group == 4:
+                    tokens.append(match.group(4))
+                else:
+                    tokens.append(_QuotedString(match.group(3)))
+                continue
+            token_end = -1
+            if group is None:
+                continue
+            if group == 1:
+                comment = match.group(1).strip()
+                if comment:
+                    comments.append(comment)
+            elif group == 2:
+                depth += 1 if match.group(2) == "(" else -1
+                if depth < 0:
+                    raise ValueError(f"line {line_number}: unbalanced parentheses")
+            else:
+                raise ValueError(
+                    f"line {line_number}: invalid character: {match.group(5)!r}"
+                )
+
+        if depth == 0:
+            if tokens:
+                yield owner_omitted, tokens, " ".join(comments) or None, start_line
+            tokens = []
+            comments = []
+
+    if depth != 0:
+        raise ValueError(f"line {line_number}: unbalanced parentheses")
+
+
+class BindRecordReader(Iterator[BindRecord]):
+    """
+    Streaming parser which yields the records of a BIND file one by one while reading the file, so the memory
+    usage does not depend on the size of the file.
+
+    The parser supports the master file format of RFC 1035: entries spanning multiple lines in parentheses,
+    omitted owners, TTL and class in any order, relative names, escape sequences, multiple character strings
+    and the $ORIGIN, $TTL and $INCLUDE directives. Records with unsupported record types or classes are skipped.
+
+    The origin and the default TTL of the file are available as attributes as soon as the corresponding
+    directives have been read.
+    """
+
+    def __init__(self, source: Union[str, Path, TextIO]) -> None:
+        """
+        Creates a new BindRecordReader object.
+
+        :param source: the path of the BIND file or a text stream with the content of the BIND file;
+                       a file opened by the reader is closed when the iteration is finished or :meth:`close` is called
+        """
+
+        if isinstance(source, (str, Path)):
+            self._file = open(source, "r")
+            self._close_file = True
+            # included files are relative to the including file
+            self._base_dir = Path(source).parent
+        else:
+            self._file = source
+            self._close_file = False
+            self._base_dir = Path(".")
+        self.origin: Optional[str] = None
+        self.ttl: Optional[int] = None
+        self._last_ttl: Optional[int] = None
+        self._last_owner: Optional[str] = None
+        self._records = self._read_file()
+
+    def __iter__(self) -> "BindRecordReader":
+        return self
+
+    def __next__(self) -> BindRecord:
+        return next(self._records)
+
+    def __enter__(self) -> "BindRecordReader":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Stop reading and close the file if it was opened by the reader.
+        """
+
+        self._records.close()
+        if self._close_file:
+            self._file.close()
+
+    def _read_file(self) -> Iterator[BindRecord]:
+        try:
+            yield from self._read(self._file, self._base_dir)
+
+            if self.origin is None:
+                raise ValueError("No origin found in file")
+        finally:
+            if self._close_file:
+                self._file.close()
+
+    def _read(self, lines: Iterable[str], base_dir: Path) -> Iterator[BindRecord]:
+        for owner_omitted, tokens, comment, line_number in _tokenize(lines):
+            first = tokens[0]
+            if (
+                not owner_omitted
+                and first.startswith("$")
+                and not isinstance(first, _QuotedString)
+            ):
+                directive = first.upper()
+                if directive == "$ORIGIN" and len(tokens) == 2:
+                    self.origin = self._absolute_name(tokens[1], line_number)
+                elif directive == "$TTL" and len(tokens) == 2:
+                    self.ttl = _parse_ttl(tokens[1], line_number)
+                elif directive == "$INCLUDE" and len(tokens) in (2, 3):
+                    yield from self._include(tokens[1:], base_dir, line_number)
+                else:
+                    logging.warning(
+                        f"Ignoring unsupported directive in line {line_number}: {first}"
+                    )
+                continue
+
+            record = self._parse_record(owner_omitted, tokens, comment, line_number)
+            if record is not None:
+                yield record
+
+    def _include(
+        self, arguments: List[str], base_dir: Path, line_number: int
+    ) -> Iterator[BindRecord]:
+        file_path = base_dir / _unescape(arguments[0])
+        # the origin of the included file does not change the origin of the including file
+        origin = self.origin
+        if len(arguments) == 2:
+            self.origin = self._absolute_name(arguments[1], line_number)
+        try:
+            with open(file_path, "r") as f:
+                yield from self._read(f, file_path.parent)
+        finally:
+            self.origin = origin
+
+    def _absolute_name(self, name: str, line_number: int) -> str:
+        if name == "@":
+            if self.origin is None:
+                raise ValueError(f"line {line_number}: no origin for @")
+            return self.origin
+        if name.endswith(".") and not name.endswith("\\."):
+            return name
+        if self.origin is None:
+            raise ValueError(f"line {line_number}: no origin for relative name {name}")
+        if self.origin == ".":
+            return f"{name}."
+        return f"{name}.{self.origin}"
+
+    def _parse_record(
+        self,
+        owner_omitted: bool,
+        tokens: List[str],
+        comment: Optional[str],
+        line_number: int,
+    ) -> Optional[BindRecord]:
+        # entry format: [owner] [ttl] [class] type rdata, whereby the ttl and class can be in any order
+        index = 0
+        if owner_omitted:
+            # the owner of the previous record is used
+            if self._last_owner is None:
+                raise ValueError(f"line {line_number}: no owner found")
+            record_name = self._last_owner
+        else:
+            record_name = self._absolute_name(tokens[0], line_number)
+            index = 1
+        self._last_owner = record_name
+
+        record_ttl = None
+        record_class = None
+        while index < len(tokens):
+            token = tokens[index]
+            if record_ttl is None and token[:1].isdigit():
+                record_ttl = _parse_ttl(token, line_number)
+            elif record_class is None and token.upper() in RECORD_CLASSES:
+                record_class = token.upper()
+            else:
+                break
+            index += 1
+        if index >= len(tokens):
+            raise ValueError(f"line {line_number}: no record type found")
+
+        record_type = tokens[index].upper()
+        rdata = tokens[index + 1 :]
+        if record_class not in (None, "IN"):
+            logging.warning(
+                f"Ignoring unsupported record class in line {line_number}: {record_class}"
+            )
+            return None
+        if record_type not in DNSRecordType.__members__:
+            logging.warning(
+                f"Ignoring unsupported record type in line {line_number}: {record_type}"
+            )
+            return None
+        record_type = DNSRecordType[record_type]
+
+        if record_ttl is None:
+            # use the default TTL or the TTL of the previous record
+            record_ttl = self.ttl if self.ttl is not None else self._last_ttl
+            if record_ttl is None:
+                raise ValueError("No TTL found in file")
+        self._last_ttl = record_ttl
+
+        prio = None
+        if record_type in DNS_RECORDS_WITH_PRIORITY and rdata:
+            prio = int(rdata[0])
+            rdata = rdata[1:]
+        if not rdata:
+            raise ValueError(f"line {line_number}: no record data found")
+
+        if not isinstance(rdata[-1], _QuotedString) and (
+            (record_type in _DOMAIN_NAME_RECORD_TYPES and len(rdata) == 1)
+            or (record_type is DNSRecordType.SRV and len(rdata) == 3)
+        ):
+            # the target name is qualified like the owner name
+            rdata[-1] = self._absolute_name(rdata[-1], line_number)
+
+        if record_type is DNSRecordType.TXT:
+            # multiple character strings are concatenated
+            record_data = "".join(_unescape(token) for token in rdata)
+        elif len(rdata) == 1:
+            record_data = _unescape(rdata[0])
+        else:
+            record_data = " ".join(
+                f'"{token}"' if isinstance(token, _QuotedString) else token
+                for token in rdata
+            )
+
+        return BindRecord(
+            record_name,
+            record_ttl,
+            RecordClass.IN,
+            record_type,
+            record_data,
+            prio=prio,
+            comment=comment,
+        )
 
 
 class BindFile:
@@ -49,146 +429,159 @@ class BindFile:
         self.records = records or []
 
     @staticmethod
-    def from_file(file_path: str) -> "BindFile":
-        with open(file_path, "r") as f:
-            file_data = f.readlines()
-
-        # parse the file line by line
-        origin = None
-        ttl = None
-        records = []
-        for line in file_data:
-            if line.startswith("$ORIGIN"):
-                origin = line.split()[1]
-            elif line.startswith("$TTL"):
-                ttl = int(line.split()[1])
-            else:
-                # parse the records with the two possible formats:
-                # 1: name 	ttl 	record-class 	record-type 	record-data
-                # 2: name 	record-class 	ttl 	record-type 	record-data
-                # whereby the ttl is optional
-
-                record_parts = line.strip().split()
-
-                # skip comments
-                if not record_parts or record_parts[0].startswith(";"):
-                    continue
-
-                prio = None
-
-                if record_parts[1].isdigit():
-                    # scheme 1
-                    if record_parts[3] not in DNSRecordType.__members__:
-                        logging.warning(f"Ignoring unsupported record type: {line}")
-                        continue
-                    if record_parts[2] not in RecordClass.__members__:
-                        logging.warning(f"Ignoring unsupported record class: {line}")
-                        continue
-                    record_name = record_parts[0]
-                    record_ttl = int(record_parts[1])
-                    record_class = RecordClass[record_parts[2]]
-                    record_type = DNSRecordType[record_parts[3]]
-                    if record_type in DNS_RECORDS_WITH_PRIORITY:
-                        prio = int(record_parts[4])
-                        record_data = " ".join(record_parts[5:])
-                    else:
-                        record_data = " ".join(record_parts[4:])
-                elif record_parts[2].isdigit():
-                    # scheme 2
-                    if record_parts[3] not in DNSRecordType.__members__:
-                        logging.warning(f"Ignoring unsupported record type: {line}")
-                        continue
-                    if record_parts[1] not in RecordClass.__members__:
-                        logging.warning(f"Ignoring unsupported record class: {line}")
-                        continue
-                    record_name = record_parts[0]
-                    record_ttl = int(record_parts[2])
-                    record_class = RecordClass[record_parts[1]]
-                    record_type = DNSRecordType[record_parts[3]]
-                    if record_type in DNS_RECORDS_WITH_PRIORITY:
-                        prio = int(record_parts[4])
-                        record_data = " ".join(record_parts[5:])
-                    else:
-                        record_data = " ".join(record_parts[4:])
-                else:
-                    # no ttl, use default or previous
-                    if record_parts[2] not in DNSRecordType.__members__:
-                        logging.warning(f"Ignoring unsupported record type: {line}")
-                        continue
-                    if record_parts[1] not in RecordClass.__members__:
-                        logging.warning(f"Ignoring unsupported record class: {line}")
-                        continue
-                    record_name = record_parts[0]
-                    if ttl is None and not records:
-                        raise ValueError("No TTL found in file")
-                    record_ttl = ttl or records[-1].ttl
-                    record_class = RecordClass[record_parts[1]]
-                    record_type = DNSRecordType[record_parts[2]]
-                    if record_type in DNS_RECORDS_WITH_PRIORITY:
-                        prio = int(record_parts[3])
-                        record_data = " ".join(record_parts[4:])
-                    else:
-                        record_data = " ".join(record_parts[3:])
-
-                # replace @ in record name with origin
-                record_name = record_name.replace("@", origin)
-
-                # handle comments and quoted strings as record data
-                comment = None
-                line = record_data.strip()
-                if line.startswith('"'):
-                    # find rightmost double quote
-                    rindex = line.rfind('"')
-                    if rindex != -1:
-                        # split at the last double quote
-                        line_parts = line.rsplit('"', 1)
-                        record_data = line_parts[0].strip('"')
-
-                        comment = line_parts[1].strip() if len(line_parts) > 1 else None
-                        # left strip semicolon from comment
-                        if comment and comment.startswith(";"):
-                            comment = comment[1:].strip()
-
-                        if not comment:
-                            comment = None
-                    else:
-                        record_data = line.strip('"')
-                else:
-                    # try to split at the first semicolon for comments
-                    if ";" in line:
-                        record_data, comment = line.split(";", 1)
-                        record_data = record_data.strip()
-                        comment = comment.strip()
-                    else:
-                        record_data = line
-
-                records.append(
-                    BindRecord(
-                        record_name,
-                        record_ttl,
-                        record_class,
-                        record_type,
-                        record_data,
-                        prio=prio,
-                        comment=comment,
-                    )
-                )
+    def iter_records(source: Union[str, Path, TextIO]) -> BindRecordReader:
+        """
+        Read the records of a BIND file one by one without loading the whole file.
+
+        :param source: the path of the BIND file or a text stream with the content of the BIND file
+        :return: iterator of the records, which also provides the origin and default TTL of the file
+        """
 
-        if origin is None:
-            raise ValueError("No origin found in file")
+        return BindRecordReader(source)
+
+    @staticmethod
+    def from_file(file_path: Union[str, Path, TextIO]) -> "BindFile":
+        with BindFile.iter_records(file_path) as reader:
+            records = list(reader)
 
-        return BindFile(origin, ttl, records)
+        return BindFile(reader.origin, reader.ttl, records)
 
-    def to_file(self, file_path: str) -> None:
+    def to_file(self, file_path: Union[str, Path]) -> None:
         with open(file_path, "w") as f:
-            f.write(str(self))
+            self.write(f)
 
-    def __str__(self) -> str:
-        bind = f"$ORIGIN {self.origin}\n"
+    def write(self, fp: TextIO) -> None:
+        """
+        Write the BIND file to a text stream. The records are written in chunks while they are serialized,
+        so the whole file content is never held in memory.
+
+        :param fp: the writable text stream
+        """
 
+        fp.write(f"$ORIGIN {self.origin}\n")
         if self.ttl is not None:
-            bind += f"$TTL {self.ttl}\n"
+            fp.write(f"$TTL {self.ttl}\n")
+        write_records(fp, self.records)
+
+    def __str__(self) -> str:
+        bind = io.StringIO()
+        self.write(bind)
+        return bind.getvalue()
+
+
+def write_records(
+    fp: TextIO, records: Iterable[BindRecord], chunk_size: int = 1000
+) -> None:
+    """
+    Write BIND records line by line to a text stream in chunks of records.
+
+    :param fp: the writable text stream
+    :param records: the records to write, can be a lazy iterable
+    :param chunk_size: the number of records written at once
+    """
+
+    chunk = []
+    for record in records:
+        chunk.append(f"{record}\n")
+        if len(chunk) >= chunk_size:
+            fp.writelines(chunk)
+            chunk = []
+    if chunk:
+        fp.writelines(chunk)
+
+
+@dataclass
+class BindParseResult:
+    # The path of the BIND file.
+    path: Path
+
+    # The parsed BIND file, None if the parsing failed.
+    bind_file: Optional[BindFile] = None
+
+    # The error of the parsing if it failed.
+    error: Optional[Exception] = None
+
+    # The time in seconds the parsing took.
+    duration: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class BindImportResult:
+    # The path of the BIND file.
+    path: Path
+
+    # The domain of the BIND file, None if the parsing failed.
+    domain: Optional[str] = None
+
+    # The error of the parsing or the import if one of them failed.
+    error: Optional[Exception] = None
+
+    # The time in seconds the parsing and the import took.
+    parse_duration: float = 0.0
+    import_duration: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _parse_bind_file(path: Path) -> BindParseResult:
+    # module level function, so it can be called in the worker processes
+    start = time.perf_counter()
+    try:
+        bind_file = BindFile.from_file(path)
+    except Exception as e:
+        return BindParseResult(path, error=e, duration=time.perf_counter() - start)
+    return BindParseResult(path, bind_file, duration=time.perf_counter() - start)
+
+
+def parse_bind_files(
+    paths: Iterable[Union[str, Path]], max_workers: Optional[int] = None
+) -> Iterator[BindParseResult]:
+    """
+    Parse multiple BIND files in parallel with a pool of processes, so the parsing is spread across all CPU cores.
+
+    :param paths: the paths of the BIND files
+    :param max_workers: the number of worker processes, None to use one per CPU core, 1 to parse the files
+                        in the current process
+    :return: iterator of the parse results in the order of the given paths, the results are available as soon as
+             the corresponding files are parsed
+    """
+
+    paths = [Path(path) for path in paths]
+    if max_workers is not None and max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+
+    if max_workers == 1 or len(paths) <= 1:
+        yield from map(_parse_bind_file, paths)
+        return
+
+    workers = min(max_workers or os.cpu_count() or 1, len(paths))
+    # larger chunks reduce the overhead of the inter process communication for many small files
+    chunksize = max(1, len(paths) // (4 * workers))
+    # the multiprocessing machinery is only imported if it is used
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(_parse_bind_file, paths, chunksize=chunksize)
+
+
+def parse_bind_directory(
+    directory: Union[str, Path],
+    pattern: str = "*.bind",
+    max_workers: Optional[int] = None,
+) -> Iterator[BindParseResult]:
+    """
+    Parse all BIND files of a directory in parallel, see :func:`parse_bind_files`.
+
+    :param directory: the directory with the BIND files
+    :param pattern: the glob pattern of the BIND files in the directory
+    :param max_workers: the number of worker processes, None to use one per CPU core
+    :return: iterator of the parse results sorted by the file paths
+    """
 
-        for record in self.records:
-            bind += f"{record}\n"
-        return bind
+    return parse_bind_files(sorted(Path(directory).glob(pattern)), max_workers)
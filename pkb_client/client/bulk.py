@@ -0,0 +1,205 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence
+
+from pkb_client.client.dns import DNSRecordType
+
+if TYPE_CHECKING:
+    from pkb_client.client.client import PKBClient
+
+
+class DNSMutationType(str, Enum):
+    create = "create"
+    update = "update"
+    delete = "delete"
+
+    def __str__(self):
+        return self.value
+
+
+@dataclass
+class DNSMutation:
+    # The kind of the change.
+    type: DNSMutationType
+
+    # The domain of the DNS record.
+    domain: str
+
+    # The id of the DNS record to update or delete.
+    record_id: Optional[str] = None
+
+    # The type, content, subdomain, TTL and prio of the DNS record to create or update.
+    record_type: Optional[DNSRecordType] = None
+    content: Optional[str] = None
+    name: Optional[str] = None
+    ttl: Optional[int] = None
+    prio: Optional[int] = None
+
+    @staticmethod
+    def create(
+        domain: str,
+        record_type: DNSRecordType,
+        content: str,
+        name: Optional[str] = None,
+        ttl: Optional[int] = None,
+        prio: Optional[int] = None,
+    ) -> "DNSMutation":
+        """
+        Create a mutation which creates a new DNS record, see :meth:`PKBClient.create_dns_record`.
+        """
+
+        return DNSMutation(
+            DNSMutationType.create,
+            domain,
+            record_type=record_type,
+            content=content,
+            name=name,
+            ttl=ttl,
+            prio=prio,
+        )
+
+    @staticmethod
+    def update(
+        domain: str,
+        record_id: str,
+        record_type: DNSRecordType,
+        content: str,
+        name: Optional[str] = None,
+        ttl: Optional[int] = None,
+        prio: Optional[int] = None,
+    ) -> "DNSMutation":
+        """
+        Create a mutation which updates an existing DNS record, see :meth:`PKBClient.update_dns_record`.
+        """
+
+        return DNSMutation(
+            DNSMutationType.update,
+            domain,
+            record_id=record_id,
+            record_type=record_type,
+            content=content,
+            name=name,
+            ttl=ttl,
+            prio=prio,
+        )
+
+    @staticmethod
+    def delete(domain: str, record_id: str) -> "DNSMutation":
+        """
+        Create a mutation which deletes an existing DNS record, see :meth:`PKBClient.delete_dns_record`.
+        """
+
+        return DNSMutation(DNSMutationType.delete, domain, record_id=record_id)
+
+    def apply(self, client: "PKBClient") -> Any:
+        """
+        Apply the mutation with the client.
+
+        :param client: the client used for the API call
+        :return: the id of the created DNS record for create mutations, otherwise True
+        """
+
+        kwargs = {} if self.ttl is None else {"ttl": self.ttl}
+        if self.type is DNSMutationType.create:
+            return client.create_dns_record(
+                self.domain,
+                self.record_type,
+                self.content,
+                name=self.name,
+                prio=self.prio,
+                **kwargs,
+            )
+        if self.type is DNSMutationType.update:
+            return client.update_dns_record(
+                self.domain,
+                self.record_id,
+                self.record_type,
+                self.content,
+                name=self.name,
+                prio=self.prio,
+                **kwargs,
+            )
+        if self.type is DNSMutationType.delete:
+            return client.delete_dns_record(self.domain, self.record_id)
+        raise ValueError(f"mutation type '{self.type}' not supported")
+
+
+@dataclass
+class DNSMutationResult:
+    # The applied mutation.
+    mutation: DNSMutation
+
+    # The result of the API call, the id of the created DNS record for create mutations, otherwise True.
+    result: Any = None
+
+    # The error of the API call if it failed.
+    error: Optional[Exception] = None
+
+    # Whether the mutation was not applied because a previous mutation of the same domain failed.
+    skipped: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.skipped
+
+
+def execute_dns_mutations(
+    client: "PKBClient",
+    mutations: Sequence[DNSMutation],
+    max_workers: int = 10,
+    stop_on_error: bool = True,
+    progress: Optional[Callable[[DNSMutationResult], None]] = None,
+) -> List[DNSMutationResult]:
+    """
+    Apply DNS mutations in parallel across domains. The mutations of one domain are applied sequentially in the
+    given order, so later mutations can rely on earlier ones.
+
+    :param client: the client used for the API calls
+    :param mutations: the mutations to apply
+    :param max_workers: the maximum number of domains processed at the same time
+    :param stop_on_error: whether the remaining mutations of a domain should be skipped after a mutation failed
+    :param progress: function which is called with the result of every mutation as soon as it is finished,
+                     from the worker threads
+    :return: the results of the mutations in the order of the given mutations
+    """
+
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+
+    results: List[Optional[DNSMutationResult]] = [None] * len(mutations)
+    by_domain: Dict[str, List[int]] = OrderedDict()
+    for index, mutation in enumerate(mutations):
+        by_domain.setdefault(mutation.domain.lower(), []).append(index)
+
+    def apply_domain(indices: List[int]) -> None:
+        failed = False
+        for index in indices:
+            mutation = mutations[index]
+            if failed and stop_on_error:
+                result = DNSMutationResult(mutation, skipped=True)
+            else:
+                try:
+                    result = DNSMutationResult(mutation, result=mutation.apply(client))
+                except Exception as e:
+                    result = DNSMutationResult(mutation, error=e)
+                    failed = True
+            results[index] = result
+            if progress is not None:
+                progress(result)
+
+    if len(by_domain) <= 1 or max_workers == 1:
+        for indices in by_domain.values():
+            apply_domain(indices)
+    else:
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(by_domain)),
+            thread_name_prefix="pkb_client_bulk",
+        ) as executor:
+            for future in [
+                executor.submit(apply_domain, indices) for indices in by_domain.values()
+            ]:
+                future.result()
+
+    return results
@@ -0,0 +1,595 @@
+import dataclasses
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    TypeVar,
+    Union,
+)
+
+from pkb_client.client.dns import DNSRecord, DNSRecordType
+
+if TYPE_CHECKING:
+    import sqlite3
+
+logger = logging.getLogger("pkb_client")
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Thread-safe in-memory cache whose entries expire after a fixed time. If the cache is full,
+    the least recently used entry is evicted.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_size: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Creates a new TTLCache object.
+
+        :param ttl: the time in seconds after which an entry expires
+        :param max_size: the maximum number of entries
+        :param clock: monotonic clock function used for the expiration
+        """
+
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+
+        self.ttl = ttl
+        self.max_size = max_size
+        self.stats = CacheStats()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[K, tuple[float, V]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> Optional[V]:
+        """
+        Get the value of a key.
+
+        :param key: the key of the entry
+        :return: the value or None if the key is not cached or expired
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            expires, value = entry
+            if expires <= self._clock():
+                del self._entries[key]
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def set(self, key: K, value: V) -> Optional[K]:
+        """
+        Set the value of a key.
+
+        :param key: the key of the entry
+        :param value: the value of the entry
+        :return: the key of the evicted entry if the cache was full, otherwise None
+        """
+
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                evicted, _ = self._entries.popitem(last=False)
+                self.stats.evictions += 1
+                return evicted
+            return None
+
+    def update(self, key: K, func: Callable[[V], V]) -> bool:
+        """
+        Replace the value of a cached key without changing its expiration.
+
+        :param key: the key of the entry
+        :param func: function which receives the current value and returns the new value
+        :return: True if the key was cached and updated
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False
+            expires, value = entry
+            self._entries[key] = (expires, func(value))
+            return True
+
+    def invalidate(self, key: K) -> bool:
+        """
+        Remove a key from the cache.
+
+        :param key: the key of the entry
+        :return: True if the key was cached
+        """
+
+        with self._lock:
+            if self._entries.pop(key, None) is None:
+                return False
+            self.stats.invalidations += 1
+            return True
+
+    def clear(self) -> None:
+        """
+        Remove all entries from the cache.
+        """
+
+        with self._lock:
+            self.stats.invalidations += len(self._entries)
+            self._entries.clear()
+
+
+class DNSRecordCache:
+    """
+    Cache for the DNS records of domains used by :class:`PKBClient`.
+
+    The DNS records are cached by domain for :meth:`PKBClient.get_dns_records` and by domain, record type and
+    subdomain for :meth:`PKBClient.get_all_dns_records`. All entries of a domain are invalidated when
+    DNS records of the domain are changed through the client.
+
+    Every invalidation of a domain changes its generation. A reader captures the generation before it retrieves the
+    DNS records and passes it to the set method, so DNS records retrieved before a concurrent change are not cached.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 60,
+        max_size: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Creates a new DNSRecordCache object.
+
+        :param ttl: the time in seconds after which cached DNS records expire
+        :param max_size: the maximum number of cached record lists
+        :param clock: monotonic clock function used for the expiration
+        """
+
+        self._cache: TTLCache[tuple, List[DNSRecord]] = TTLCache(ttl, max_size, clock)
+        self._lock = threading.Lock()
+        # all cached keys of a domain for the invalidation
+        self._domain_keys: Dict[str, Set[tuple]] = {}
+        # the value of the invalidation counter at the last invalidation of a domain and of the whole cache
+        self._invalidations = 0
+        self._domain_invalidations: Dict[str, int] = {}
+        self._cleared = 0
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._cache.stats
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    @staticmethod
+    def _domain_key(domain: str) -> tuple:
+        return (domain.lower(),)
+
+    @staticmethod
+    def _name_type_key(
+        domain: str, record_type: DNSRecordType, subdomain: str
+    ) -> tuple:
+        return domain.lower(), str(record_type), subdomain.lower()
+
+    def generation(self, domain: str) -> int:
+        """
+        Get the generation of the cached DNS records of a domain, which changes with every invalidation of the domain.
+
+        :param domain: the domain of the DNS records
+        :return: the generation
+        """
+
+        with self._lock:
+            return max(self._domain_invalidations.get(domain.lower(), 0), self._cleared)
+
+    def _invalidate_generation(self, domain: str) -> None:
+        # must be called with the lock held
+        self._invalidations += 1
+        self._domain_invalidations[domain] = self._invalidations
+
+    def _get(self, key: tuple) -> Optional[List[DNSRecord]]:
+        records = self._cache.get(key)
+        if records is None:
+            return None
+        # return copies, so callers can not modify the cached records
+        return [dataclasses.replace(record) for record in records]
+
+    def _set(
+        self, key: tuple, records: List[DNSRecord], generation: Optional[int]
+    ) -> None:
+        records = [dataclasses.replace(record) for record in records]
+        with self._lock:
+            if generation is not None and generation != max(
+                self._domain_invalidations.get(key[0], 0), self._cleared
+            ):
+                # the DNS records were changed while they were retrieved, so they may be outdated
+                return
+            evicted = self._cache.set(key, records)
+            self._domain_keys.setdefault(key[0], set()).add(key)
+            if evicted is not None:
+                keys = self._domain_keys.get(evicted[0])
+                if keys is not None:
+                    keys.discard(evicted)
+                    if not keys:
+                        del self._domain_keys[evicted[0]]
+
+    def get_records(self, domain: str) -> Optional[List[DNSRecord]]:
+        """
+        Get all cached DNS records of a domain.
+
+        :param domain: the domain of the DNS records
+        :return: list of DNSRecord objects or None if not cached
+        """
+
+        return self._get(self._domain_key(domain))
+
+    def set_records(
+        self,
+        domain: str,
+        records: List[DNSRecord],
+        generation: Optional[int] = None,
+    ) -> None:
+        """
+        Cache all DNS records of a domain.
+
+        :param domain: the domain of the DNS records
+        :param records: all DNS records of the domain
+        :param generation: the generation of the domain before the DNS records were retrieved, see
+                           :meth:`generation`; the DNS records are not cached if the generation changed since then
+        """
+
+        self._set(self._domain_key(domain), records, generation)
+
+    def get_records_by_name_type(
+        self, domain: str, record_type: DNSRecordType, subdomain: str
+    ) -> Optional[List[DNSRecord]]:
+        """
+        Get the cached DNS records of a domain with the given record type and subdomain.
+
+        :param domain: the domain of the DNS records
+        :param record_type: the type of the DNS records
+        :param subdomain: the subdomain of the DNS records
+        :return: list of DNSRecord objects or None if not cached
+        """
+
+        return self._get(self._name_type_key(domain, record_type, subdomain))
+
+    def set_records_by_name_type(
+        self,
+        domain: str,
+        record_type: DNSRecordType,
+        subdomain: str,
+        records: List[DNSRecord],
+        generation: Optional[int] = None,
+    ) -> None:
+        """
+        Cache the DNS records of a domain with the given record type and subdomain.
+
+        :param domain: the domain of the DNS records
+        :param record_type: the type of the DNS records
+        :param subdomain: the subdomain of the DNS records
+        :param records: the DNS records of the domain with the given record type and subdomain
+        :param generation: the generation of the domain before the DNS records were retrieved, see
+                           :meth:`generation`; the DNS records are not cached if the generation changed since then
+        """
+
+        self._set(
+            self._name_type_key(domain, record_type, subdomain), records, generation
+        )
+
+    def remove_record(self, domain: str, record_id: str) -> None:
+        """
+        Remove a deleted DNS record from the cached DNS records of a domain. The cached DNS records of the domain
+        by record type and subdomain are invalidated.
+
+        :param domain: the domain of the DNS record
+        :param record_id: the id of the deleted DNS record
+        """
+
+        domain_key = self._domain_key(domain)
+        with self._lock:
+            self._invalidate_generation(domain_key[0])
+            for key in self._domain_keys.get(domain_key[0], set()).copy():
+                if key != domain_key:
+                    self._cache.invalidate(key)
+                    self._domain_keys[domain_key[0]].discard(key)
+        self._cache.update(
+            domain_key,
+            lambda records: [record for record in records if record.id != record_id],
+        )
+
+    def invalidate(self, domain: str) -> None:
+        """
+        Invalidate all cached DNS records of a domain.
+
+        :param domain: the domain of the DNS records
+        """
+
+        with self._lock:
+            self._invalidate_generation(domain.lower())
+            for key in self._domain_keys.pop(domain.lower(), set()):
+                self._cache.invalidate(key)
+
+    def clear(self) -> None:
+        """
+        Invalidate all cached DNS records.
+        """
+
+        with self._lock:
+            self._invalidations += 1
+            self._cleared = self._invalidations
+            self._domain_invalidations.clear()
+            self._cache.clear()
+            self._domain_keys.clear()
+
+
+def default_cache_dir() -> Path:
+    """
+    Get the default directory for persistent caches of the client.
+
+    :return: the directory "pkb_client" in the user cache directory
+    """
+
+    cache_home = os.environ.get("XDG_CACHE_HOME")
+    if cache_home:
+        return Path(cache_home) / "pkb_client"
+    return Path.home() / ".cache" / "pkb_client"
+
+
+def _read_only_pricing(
+    pricing: Dict[str, Dict[str, Any]],
+) -> Mapping[str, Mapping[str, Any]]:
+    return _freeze(pricing)
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+class PricingCache:
+    """
+    Persistent cache for the domain pricing used by :class:`PKBClient`.
+
+    The pricing of all TLDs is stored in a SQLite database file and mirrored in memory as read-only mapping, so
+    lookups are served locally without copying and the pricing is downloaded at most once per refresh interval.
+    Stale pricing can be served while it is refreshed in the background.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[Path, str]] = None,
+        max_age: float = 86400,
+        background_refresh: bool = True,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Creates a new PricingCache object.
+
+        :param path: the path of the SQLite database file, defaults to "pricing.sqlite" in the user cache directory
+        :param max_age: the time in seconds after which the cached pricing is refreshed
+        :param background_refresh: whether stale pricing should be returned immediately while it is refreshed in
+                                   a background thread, instead of waiting for the refresh
+        :param clock: wall clock function used for the age of the pricing
+        """
+
+        if max_age <= 0:
+            raise ValueError("max_age must be positive")
+
+        self.path = (
+            Path(path) if path is not None else default_cache_dir() / "pricing.sqlite"
+        )
+        self.max_age = max_age
+        self.background_refresh = background_refresh
+        self._clock = clock
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # only one caller loads or downloads the pricing, the other callers wait for it
+        self._refresh_lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._pricing: Optional[Mapping[str, Mapping[str, Any]]] = None
+        self._fetched_at: Optional[float] = None
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = self._connection()
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS pricing (tld TEXT PRIMARY KEY, data TEXT)"
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value REAL)"
+        )
+
+    def _connection(self) -> "sqlite3.Connection":
+        # imported on use, so the in-memory caches do not load sqlite3
+        import sqlite3
+
+        # SQLite connections can not be shared between threads
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._local.connection = connection
+        return connection
+
+    def _load(self) -> None:
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT value FROM metadata WHERE key = 'fetched_at'"
+        ).fetchone()
+        if row is None:
+            return
+        pricing = {
+            tld: json.loads(data)
+            for tld, data in connection.execute("SELECT tld, data FROM pricing")
+        }
+        with self._lock:
+            self._pricing = _read_only_pricing(pricing)
+            self._fetched_at = row[0]
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._fetched_at is not None
+            and self._clock() - self._fetched_at < self.max_age
+        )
+
+    def store(self, pricing: Dict[str, Any]) -> None:
+        """
+        Replace the cached pricing.
+
+        :param pricing: the pricing of all TLDs as returned by the API
+        """
+
+        fetched_at = self._clock()
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute("DELETE FROM pricing")
+            connection.executemany(
+                "INSERT INTO pricing (tld, data) VALUES (?, ?)",
+                ((tld, json.dumps(data)) for tld, data in pricing.items()),
+            )
+            connection.execute(
+                "INSERT OR REPLACE INTO metadata (key, value) VALUES ('fetched_at', ?)",
+                (fetched_at,),
+            )
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+        with self._lock:
+            self._pricing = _read_only_pricing(pricing)
+            self._fetched_at = fetched_at
+
+    def refresh(self, fetch: Callable[[], Dict[str, Any]]) -> None:
+        """
+        Download and store the current pricing.
+
+        :param fetch: function which downloads the pricing of all TLDs from the API
+        """
+
+        self.store(fetch())
+
+    def _refresh_in_background(self, fetch: Callable[[], Dict[str, Any]]) -> None:
+        def refresh():
+            try:
+                self.refresh(fetch)
+            except Exception as e:
+                logger.warning(f"background refresh of the domain pricing failed: {e}")
+
+        with self._lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return
+            self._refresh_thread = threading.Thread(
+                target=refresh, name="pkb_client_pricing_refresh", daemon=True
+            )
+            self._refresh_thread.start()
+
+    def _ensure(self, fetch: Callable[[], Dict[str, Any]]) -> None:
+        if self._pricing is not None and self._is_fresh():
+            return
+        with self._refresh_lock:
+            # check again, the pricing may have been downloaded while waiting for the lock
+            if self._pricing is None:
+                # the pricing may have been stored by another process or a previous run
+                self._load()
+            if self._is_fresh():
+                return
+            if self._pricing is not None and self.background_refresh:
+                self._refresh_in_background(fetch)
+            else:
+                self.refresh(fetch)
+
+    def get_pricing(
+        self, fetch: Callable[[], Dict[str, Any]]
+    ) -> Mapping[str, Mapping[str, Any]]:
+        """
+        Get the pricing of all TLDs, downloading it if the cached pricing is missing or stale.
+
+        :param fetch: function which downloads the pricing of all TLDs from the API
+        :return: read-only mapping of the pricing of all TLDs, the lists of the API response are tuples
+        """
+
+        self._ensure(fetch)
+        return self._pricing
+
+    def get_tld_pricing(
+        self, tld: str, fetch: Callable[[], Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the pricing of one TLD, downloading the pricing of all TLDs if the cached pricing is missing or stale.
+
+        :param tld: the TLD without leading dot, e.g. "com"
+        :param fetch: function which downloads the pricing of all TLDs from the API
+        :return: the pricing of the TLD or None if the TLD is not offered
+        """
+
+        self._ensure(fetch)
+        pricing = self._pricing.get(tld.lower().lstrip("."))
+        # only the entry of the TLD is copied
+        return _thaw(pricing) if pricing is not None else None
+
+    def wait_for_refresh(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait until a running background refresh is finished.
+
+        :param timeout: the maximum time in seconds to wait, None to wait forever
+        """
+
+        thread = self._refresh_thread
+        if thread is not None:
+            thread.join(timeout)
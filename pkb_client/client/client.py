@@ -1,15 +1,36 @@
+import functools
 import json
 import logging
-from datetime import datetime
-from hashlib import sha256
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+    Union,
+)
 from urllib.parse import urljoin
 
-import dns
 import requests
-
-from pkb_client.client import BindFile
+from requests.adapters import HTTPAdapter
+
+from pkb_client.client.dispatch import (
+    APIRequest,
+    APIResponse,
+    Middleware,
+    SingleFlightMiddleware,
+    build_pipeline,
+)
 from pkb_client.client.dns import (
     DNS_RECORDS_WITH_PRIORITY,
     DNSRecord,
@@ -21,21 +42,53 @@ from pkb_client.client.domain import (
     DomainInfo,
     DomainAvailability,
     DomainCheckRateLimit,
-    DomainPrice,
     GlueRecord,
 )
+from pkb_client.client.export import (
+    ExportFormat,
+    ExportResult,
+    dns_record_from_export,
+    open_file_atomic,
+    read_ndjson,
+    write_file_atomic,
+    write_ndjson,
+)
 from pkb_client.client.forwarding import URLForwarding, URLForwardingType
+from pkb_client.client.reconcile import (
+    ReconcilePlan,
+    compute_reconcile_plan,
+    subdomain_of,
+)
 from pkb_client.client.ssl_cert import SSLCertBundle
 
+# the optional subsystems are imported by the methods which use them, so importing the client does not load
+# modules like sqlite3, gzip or the BIND file parser which most API calls do not need
+if TYPE_CHECKING:
+    from pkb_client.client.bind_file import BindImportResult, BindRecord
+    from pkb_client.client.bulk import DNSMutation, DNSMutationResult
+    from pkb_client.client.cache import DNSRecordCache, PricingCache
+    from pkb_client.client.fingerprint import FingerprintIndex
+    from pkb_client.client.rate_limit import RateLimiter
+    from pkb_client.client.retry import RetryPolicy
+    from pkb_client.client.snapshot import Snapshot, SnapshotStore
+    from pkb_client.client.soa import SOAProvider
+
 API_ENDPOINT = "https://api.porkbun.com/api/json/v3/"
 
 logger = logging.getLogger("pkb_client")
-logging.basicConfig(level=logging.INFO)
+
+
+def _strip_trailing_dot(name: str) -> str:
+    # the root domain "." is kept
+    return name[:-1] if name.endswith(".") and name != "." else name
 
 
 class PKBClientException(Exception):
-    def __init__(self, status, message):
+    def __init__(self, status, message, status_code: Optional[int] = None):
         super().__init__(f"{status}: {message}")
+        self.status = status
+        self.message = message
+        self.status_code = status_code
 
 
 class PKBClient:
@@ -51,22 +104,113 @@ class PKBClient:
         secret_api_key: Optional[str] = None,
         api_endpoint: str = API_ENDPOINT,
         debug: bool = False,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        timeout: Optional[float] = None,
+        session: Optional[requests.Session] = None,
+        middlewares: Optional[List[Middleware]] = None,
+        retry_policy: Optional["RetryPolicy"] = None,
+        rate_limiter: Optional["RateLimiter"] = None,
+        dns_cache: Optional["DNSRecordCache"] = None,
+        pricing_cache: Optional["PricingCache"] = None,
+        coalesce_reads: bool = True,
+        soa_provider: Optional["SOAProvider"] = None,
+        snapshot_store: Optional["SnapshotStore"] = None,
     ) -> None:
         """
         Creates a new PKBClient object.
 
+        All API calls of the client are sent through one pooled HTTP session, so connections to the API are reused
+        across calls. Call :meth:`close` or use the client as context manager to release the pooled connections.
+
         :param api_key: the API key used for Porkbun API calls
         :param secret_api_key: the API secret used for Porkbun API calls
         :param api_endpoint: the endpoint of the Porkbun API.
         :param debug: boolean to enable debug logging
+        :param pool_connections: the number of connection pools (one per host) to cache
+        :param pool_maxsize: the maximum number of idle connections kept alive per connection pool
+        :param pool_block: whether to block when no free connection is available instead of opening a new one
+        :param keep_alive: whether connections should be kept alive and reused between API calls
+        :param timeout: the timeout in seconds for each API call, None to wait forever
+        :param session: an existing requests session to use instead of creating a new one;
+                        the pool settings are ignored in this case
+        :param middlewares: additional middlewares which are called for every API call before it is sent,
+                            see :mod:`pkb_client.client.dispatch`
+        :param retry_policy: the policy to retry API calls after transient failures, None to disable retries
+        :param rate_limiter: the rate limiter which blocks API calls that would exceed the rate limits of the API,
+                             None to disable client side rate limiting
+        :param dns_cache: the cache for retrieved DNS records, which is invalidated by DNS record changes
+                          made through this client, None to disable caching
+        :param pricing_cache: the persistent cache for the domain pricing, None to disable caching
+        :param coalesce_reads: whether concurrent identical read only API calls should share one HTTP call
+        :param soa_provider: the provider of the SOA records written to BIND exports, None to resolve them with
+                             the nameservers of the system
+        :param snapshot_store: the store for the backups of the DNS records made before failed imports,
+                               None to save the backups as json files in the current working directory
         """
         self.api_key = api_key
         self.secret_api_key = secret_api_key
         self.api_endpoint = api_endpoint
         self.debug = debug
+        self.timeout = timeout
         if self.debug:
             logger.setLevel(logging.DEBUG)
 
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                pool_block=pool_block,
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        if not keep_alive:
+            session.headers["Connection"] = "close"
+        self._session = session
+
+        self.middlewares = list(middlewares or [])
+        self.retry_policy = retry_policy
+        self.rate_limiter = rate_limiter
+        self.dns_cache = dns_cache
+        self.pricing_cache = pricing_cache
+        if soa_provider is None:
+            from pkb_client.client.soa import ResolverSOAProvider
+
+            soa_provider = ResolverSOAProvider()
+        self.soa_provider = soa_provider
+        self.snapshot_store = snapshot_store
+
+        pipeline = list(self.middlewares)
+        if coalesce_reads:
+            # coalesced API calls share the retries and the rate limit of one HTTP call
+            pipeline.append(SingleFlightMiddleware())
+        if self.retry_policy is not None:
+            from pkb_client.client.retry import RetryMiddleware
+
+            pipeline.append(RetryMiddleware(self.retry_policy))
+        if self.rate_limiter is not None:
+            from pkb_client.client.rate_limit import RateLimitMiddleware
+
+            # the rate limiter is called for every attempt of a retried API call
+            pipeline.append(RateLimitMiddleware(self.rate_limiter))
+        self._pipeline = build_pipeline(pipeline, self._send)
+
+    def close(self) -> None:
+        """
+        Close the HTTP session of the client and release all pooled connections.
+        """
+
+        self._session.close()
+
+    def __enter__(self) -> "PKBClient":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
     def _get_auth_request_json(self) -> dict:
         """
         Get the request json for the authentication of the Porkbun API calls.
@@ -79,6 +223,76 @@ class PKBClient:
 
         return {"apikey": self.api_key, "secretapikey": self.secret_api_key}
 
+    def _request(
+        self,
+        endpoint: str,
+        req_json: Optional[dict] = None,
+        auth: bool = True,
+        read_only: bool = False,
+        idempotent: bool = False,
+    ) -> dict:
+        """
+        Send an API call through the middleware pipeline of the client.
+
+        :param endpoint: the API path relative to the API endpoint
+        :param req_json: the JSON body of the API call without the authentication
+        :param auth: whether the authentication should be added to the JSON body
+        :param read_only: whether the API call only reads data
+        :param idempotent: whether the API call can be repeated without changing the result;
+                           read only API calls are always idempotent
+        :return: the parsed JSON response of the API call
+        :raises PKBClientException: if the API call was not successful
+        """
+
+        if auth:
+            req_json = {**self._get_auth_request_json(), **(req_json or {})}
+
+        request = APIRequest(
+            endpoint=endpoint,
+            url=urljoin(self.api_endpoint, endpoint),
+            json=req_json,
+            read_only=read_only,
+            idempotent=read_only or idempotent,
+        )
+        response = self._pipeline(request)
+
+        if response.ok:
+            return response.data
+
+        data = response.data or {}
+        raise PKBClientException(
+            data.get("status", "Unknown status"),
+            data.get("message", "Unknown message"),
+            status_code=response.status_code,
+        )
+
+    def _send(self, request: APIRequest) -> APIResponse:
+        """
+        Send the API call with the HTTP session of the client and parse the JSON response.
+
+        :param request: the API call to send
+        :return: the response of the API call
+        """
+
+        r = self._session.post(url=request.url, json=request.json, timeout=self.timeout)
+
+        try:
+            data = json.loads(r.content)
+        except ValueError:
+            data = None
+
+        return APIResponse(status_code=r.status_code, data=data, headers=r.headers)
+
+    def _invalidate_dns_records(self, domain: str) -> None:
+        """
+        Invalidate the cached DNS records of a domain after they were changed.
+
+        :param domain: the domain of the changed DNS records
+        """
+
+        if self.dns_cache is not None:
+            self.dns_cache.invalidate(domain)
+
     def ping(self) -> str:
         """
         API ping method: get the current public ip address of the requesting system; can also be used for auth checking.
@@ -87,18 +301,7 @@ class PKBClient:
         :return: the current public ip address of the requesting system
         """
 
-        url = urljoin(self.api_endpoint, "ping")
-        req_json = self._get_auth_request_json()
-        r = requests.post(url=url, json=req_json)
-
-        if r.status_code == 200:
-            return json.loads(r.text).get("yourIp", None)
-        else:
-            response_json = json.loads(r.text)
-            raise PKBClientException(
-                response_json.get("status", "Unknown status"),
-                response_json.get("message", "Unknown message"),
-            )
+        return self._request("ping", read_only=True).get("yourIp", None)
 
     def create_dns_record(
         self,
@@ -131,25 +334,20 @@ class PKBClient:
                 f"Priority can only be set for {DNS_RECORDS_WITH_PRIORITY}"
             )
 
-        url = urljoin(self.api_endpoint, f"dns/create/{domain}")
-        req_json = {
-            **self._get_auth_request_json(),
-            "name": name,
-            "type": record_type.value,
-            "content": content,
-            "ttl": ttl,
-            "prio": prio,
-        }
-        r = requests.post(url=url, json=req_json)
-
-        if r.status_code == 200:
-            return str(json.loads(r.text).get("id", None))
-        else:
-            response_json = json.loads(r.text)
-            raise PKBClientException(
-                response_json.get("status", "Unknown status"),
-                response_json.get("message", "Unknown message"),
+        try:
+            data = self._request(
+                f"dns/create/{domain}",
+                {
+                    "name": name,
+                    "type": record_type.value,
+                    "content": content,
+                    "ttl": ttl,
+                    "prio": prio,
+                },
             )
+        finally:
+            self._invalidate_dns_records(domain)
+        return str(data.get("id", None))
 
     def update_dns_record(
         self,
@@ -185,25 +383,21 @@ class PKBClient:
                 f"Priority can only be set for {DNS_RECORDS_WITH_PRIORITY}"
             )
 
-        url = urljoin(self.api_endpoint, f"dns/edit/{domain}/{record_id}")
-        req_json = {
-            **self._get_auth_request_json(),
-            "name": name,
-            "type": record_type.value,
-            "content": content,
-            "ttl": ttl,
-            "prio": prio,
-        }
-        r = requests.post(url=url, json=req_json)
-
-        if r.status_code == 200:
-            return True
-        else:
-            response_json = json.loads(r.text)
-            raise PKBClientException(
-                response_json.get("status", "Unknown status"),
-                response_json.get("message", "Unknown message"),
+        try:
+            self._request(
+                f"dns/edit/{domain}/{record_id}",
+                {
+                    "name": name,
+                    "type": record_type.value,
+                    "content": content,
+                    "ttl": ttl,
+                    "prio": prio,
+                },
+                idempotent=True,
             )
+        finally:
+            self._invalidate_dns_records(domain)
+        return True
 
     def update_all_dns_records(
         self,
@@ -236,26 +430,20 @@ class PKBClient:
                 f"Priority can only be set for {DNS_RECORDS_WITH_PRIORITY}"
             )
 
-        url = urljoin(
-            self.api_endpoint, f"dns/editByNameType/{domain}/{record_type}/{subdomain}"
-        )
-        req_json = {
-            **self._get_auth_request_json(),
-            "type": record_type.value,
-            "content": content,
-            "ttl": ttl,
-            "prio": prio,
-        }
-        r = requests.post(url=url, json=req_json)
-
-        if r.status_code == 200:
-            return True
-        else:
-            response_json = json.loads(r.text)
-            raise PKBClientException(
-                response_json.get("status", "Unknown status"),
-                response_json.get("message", "Unknown message"),
+        try:
+            self._request(
+                f"dns/editByNameType/{domain}/{record_type}/{subdomain}",
+                {
+                    "type": record_type.value,
+                    "content": content,
+                    "ttl": ttl,
+                    "prio": prio,
+                },
+                idempotent=True,
             )
+        finally:
+            self._invalidate_dns_records(domain)
+        return True
 
     def delete_dns_record(self, domain: str, record_id: str) -> bool:
         """
@@ -268,18 +456,15 @@ class PKBClient:
         :return: True if the deletion was successful
         """
 
-        url = urljoin(self.api_endpoint, f"dns/delete/{domain}/{record_id}")
-        req_json = self._get_auth_request_json()
-        r = requests.post(url=url, json=req_json)
-
-        if r.status_code == 200:
-            return True
-        else:
-            response_json = json.loads(r.text)
-            raise PKBClientException(
-                response_json.get("status", "Unknown status"),
-                response_json.get("message", "Unknown message"),
-            )
+        try:
+            self._request(f"dns/delete/{domain}/{record_id}")
+        except Exception:
+            self._invalidate_dns_records(domain)
+            raise
+        if self.dns_cache is not None:
+            # the other records of the domain are unchanged, so only remove the deleted record from the cache
+            self.dns_cache.remove_record(domain, record_id)
+        return True
 
     def delete_all_dns_records(
         self, domain: str, record_type: DNSRecordType, subdomain: str
@@ -295,21 +480,11 @@ class PKBClient:
         :return: True if the deletion was successful
         """
 
-        url = urljoin(
-            self.api_endpoint,
-            f"dns/deleteByNameType/{domain}/{record_type}/{subdomain}",
-        )
-        req_json = self._get_auth_request_json()
-        r = requests.post(url=url, json=req_json)
-
-        if r.status_code == 200:
-            return True
-        else:
-            response_json = json.loads(r.text)
-            raise PKBClientException(
-                response_json.get("status", "Unknown status"),
-                response_json.get("message", "Unknown message"),
-            )
+        try:
+            self._request(f"dns/deleteByNameType/{domain}/{record_type}/{subdomain}")
+        finally:
+            self._invalidate_dns_records(domain)
+        return True
 
     def get_dns_records(
         self, domain, record_id: Optional[str] = None
@@ -325,24 +500,25 @@ class PKBClient:
         :return: list of DNSRecords objects
         """
 
+        if self.dns_cache is not None:
+            records = self.dns_cache.get_records(domain)
+            if records is not None:
+                if record_id is None:
+                    return records
+                return [record for record in records if record.id == record_id]
+            # captured before the retrieval, so records retrieved before a concurrent change are not cached
+            generation = self.dns_cache.generation(domain)
+
         if record_id is None:
-            url = urljoin(self.api_endpoint, f"dns/retrieve/{domain}")
-        else:
-            url = urljoin(self.api_endpoint, f"dns/retrieve/{domain}/{record_id}")
-        req_json = self._get_auth_request_json()
-        r = requests.post(url=url, json=req_json)
-
-        if r.status_code == 200:
-            return [
-                DNSRecord.from_dict(record)
-                for record in json.loads(r.text).get("records", [])
-            ]
+            endpoint = f"dns/retrieve/{domain}"
         else:
-            response_json = json.loads(r.text)
-            raise PKBClientException(
-                response_json.get("status", "Unknown status"),
-                response_json.get("message", "Unknown message"),
-            )
+            endpoint = f"dns/retrieve/{domain}/{record_id}"
+        data = self._request(endpoint, read_only=True)
+        records = [DNSRecord.from_dict(record) for record in data.get("records", [])]
+
+        if self.dns_cache is not None and record_id is None:
+            self.dns_cache.set_records(domain, records, generation)
+        return records
 
     def get_all_dns_records(
         self, domain: str, record_type: DNSRecordType, subdomain: str
@@ -358,26 +534,32 @@ class PKBClient:
         :return: list of DNSRecords objects
         """
 
-        url = urljoin(
-            self.api_endpoint,
+        if self.dns_cache is not None:
+            records = self.dns_cache.get_records_by_name_type(
+                domain, record_type, subdomain
+            )
+            if records is not None:
+                return records
+            generation = self.dns_cache.generation(domain)
+
+        data = self._request(
             f"dns/retrieveByNameType/{domain}/{record_type}/{subdomain}",
+            read_only=True,
         )
-        req_json = self._get_auth_request_json()
-        r = requests.post(url=url, json=req_json)
-
-        if r.status_code == 200:
-            return [
-                DNSRecord.from_dict(record)
-                for record in json.loads(r.text).get("records", [])
-            ]
-        else:
-            response_json = json.loads(r.text)
-            raise PKBClientException(
-                response_json.get("status", "Unknown status"),
-                response_json.get("message", "Unknown message"),
+        records = [DNSRecord.from_dict(record) for record in data.get("records", [])]
+
+        if self.dns_cache is not None:
+            self.dns_cache.set_records_by_name_type(
+                domain, record_type, subdomain, records, generation
             )
+        return records
 
-    def export_dns_records(self, domain: str, filepath: Union[Path, str]) -> bool:
+    def export_dns_records(
+        self,
+        domain: str,
+        filepath: Union[Path, str],
+        file_format: Union[ExportFormat, str] = ExportFormat.json,
+    ) -> bool:
         """
         Export all DNS record from the given domain to a json file.
         This method does not represent a Porkbun API method.
@@ -385,31 +567,60 @@ class PKBClient:
 
         :param domain: the domain for which the DNS record should be retrieved and saved
         :param filepath: the filepath where to save the exported DNS records
+        :param file_format: the format of the file:
+            json: one json object with the DNS records by id
+            ndjson: newline delimited json with one DNS record per line, which is written and read incrementally
 
         :return: True if everything went well
         """
 
         filepath = Path(filepath)
 
+        file_format = self._dns_records_file_format(file_format)
+
         logger.debug("retrieve current DNS records...")
         dns_records = self.get_dns_records(domain)
 
         logger.debug("save DNS records to {} ...".format(filepath))
-        # merge the single DNS records into one single dict with the record id as key
-        dns_records_dict = dict()
-        for record in dns_records:
-            dns_records_dict[record.id] = record
-
         if filepath.exists():
             logger.warning("file already exists, overwriting...")
 
-        with open(filepath, "w") as f:
-            json.dump(dns_records_dict, f, default=lambda o: o.__dict__, indent=4)
+        # write the file atomically, so an interrupted export does not leave a truncated file
+        with open_file_atomic(filepath) as f:
+            if file_format is ExportFormat.ndjson:
+                write_ndjson(f, dns_records)
+            else:
+                f.write(self._dns_records_to_json(dns_records))
 
         logger.info("export finished")
 
         return True
 
+    @staticmethod
+    def _dns_records_file_format(file_format: Union[ExportFormat, str]) -> ExportFormat:
+        file_format = ExportFormat(file_format)
+        if file_format is ExportFormat.bind:
+            raise ValueError(
+                "the bind format is handled by the export_bind_dns_records and import_bind_dns_records methods"
+            )
+        return file_format
+
+    @staticmethod
+    def _dns_records_to_json(dns_records: List[DNSRecord]) -> str:
+        """
+        Serialize DNS records to the json export format.
+
+        :param dns_records: the DNS records to serialize
+        :return: the json content
+        """
+
+        # merge the single DNS records into one single dict with the record id as key
+        dns_records_dict = dict()
+        for record in dns_records:
+            dns_records_dict[record.id] = record
+
+        return json.dumps(dns_records_dict, default=lambda o: o.__dict__, indent=4)
+
     def export_bind_dns_records(self, domain: str, filepath: Union[Path, str]) -> bool:
         """
         Export all DNS record from the given domain to a BIND file.
@@ -428,54 +639,287 @@ class PKBClient:
         dns_records = self.get_dns_records(domain)
 
         logger.debug("save DNS records to {} ...".format(filepath))
-        # merge the single DNS records into one single dict with the record id as key
-        dns_records_dict = dict()
-        for record in dns_records:
-            dns_records_dict[record.id] = record
-
         if filepath.exists():
             logger.warning("file already exists, overwriting...")
 
+        with open_file_atomic(filepath) as f:
+            self._write_dns_records_bind(f, domain, dns_records)
+
+        logger.info("export finished")
+
+        return True
+
+    def _write_dns_records_bind(
+        self, fp: TextIO, domain: str, dns_records: List[DNSRecord]
+    ) -> None:
+        """
+        Write DNS records as BIND zone file to a text stream, including the SOA record of the domain.
+
+        :param fp: the writable text stream
+        :param domain: the domain of the DNS records
+        :param dns_records: the DNS records to write
+        """
+
+        from pkb_client.client.bind_file import BindRecord, RecordClass, write_records
+
+        soa_record = self.soa_provider.get_soa(domain, dns_records)
+
         # domain header
-        bind_file_content = f"$ORIGIN {domain}."
+        fp.write(f"$ORIGIN {domain}.\n")
 
         # SOA record
-        soa_records = dns.resolver.resolve(domain, "SOA")
-        if soa_records:
-            soa_record = soa_records[0]
-            bind_file_content += f"\n@ IN SOA {soa_record.mname} {soa_record.rname} ({soa_record.serial} {soa_record.refresh} {soa_record.retry} {soa_record.expire} {soa_record.minimum})"
+        if soa_record is not None:
+            fp.write(f"@ IN SOA {soa_record}\n")
+
+        def bind_records() -> Iterator["BindRecord"]:
+            for record in dns_records:
+                # add trailing dot to the content if it is a supported record type, to make it a fully qualified
+                # domain name
+                content = record.content
+                if record.type in [
+                    DNSRecordType.MX,
+                    DNSRecordType.CNAME,
+                    DNSRecordType.ALIAS,
+                    DNSRecordType.NS,
+                    DNSRecordType.SRV,
+                ]:
+                    content += "."
+                yield BindRecord(
+                    f"{record.name}.",
+                    record.ttl,
+                    RecordClass.IN,
+                    record.type,
+                    content,
+                    # the API returns a prio for all records, but it is only part of the data for some record types
+                    prio=record.prio
+                    if record.type in DNS_RECORDS_WITH_PRIORITY
+                    else None,
+                    comment=record.notes or None,
+                )
 
-        # records
-        for record in dns_records:
-            # name 	record class 	ttl 	record type 	record data
-            # add trailing dot to the name if it is a supported record type, to make it a fully qualified domain name
-            if record.type in [
-                DNSRecordType.MX,
-                DNSRecordType.CNAME,
-                DNSRecordType.NS,
-                DNSRecordType.SRV,
-            ]:
-                record.content += "."
-            if record.prio is not None:
-                record_content = f"{record.prio} {record.content}"
-            else:
-                record_content = record.content
-            bind_file_content += (
-                f"\n{record.name} IN {record.ttl} {record.type} {record_content}"
+        write_records(fp, bind_records())
+
+    def export_all_dns_records(
+        self,
+        directory: Union[Path, str],
+        formats: Sequence[Union[ExportFormat, str]] = (ExportFormat.json,),
+        max_workers: int = 10,
+        resume: bool = False,
+        progress: Optional[Callable[[int, int], None]] = None,
+        fingerprint_index: Optional["FingerprintIndex"] = None,
+    ) -> ExportResult:
+        """
+        Export the DNS records of all domains of the account, one file per domain and format.
+        This method does not represent a Porkbun API method.
+
+        The DNS records of multiple domains are retrieved at the same time. Every file is written atomically,
+        so an interrupted export can be resumed without leaving incomplete files behind.
+
+        :param directory: the directory where to save the exported DNS records, created if it does not exist
+        :param formats: the export formats, the files are named "<domain>.<format>"
+        :param max_workers: the maximum number of domains exported at the same time
+        :param resume: whether domains which have been exported in all formats before should be skipped
+        :param progress: function which is called with the number of finished domains and the total number
+                         of domains after every domain
+        :param fingerprint_index: the fingerprints of the zones exported by the last run, domains whose DNS records
+                                  did not change since then are skipped if all their files exist; the index is updated
+                                  and saved after the export
+        :return: the exported, skipped and failed domains
+        """
+
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        from pkb_client.client.fingerprint import zone_fingerprint
+
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        formats = [ExportFormat(f) for f in formats]
+
+        domains = [domain_info.domain for domain_info in self.iter_domains()]
+        result = ExportResult()
+        lock = threading.Lock()
+
+        def export(domain: str) -> None:
+            filepaths = {
+                export_format: directory / f"{domain}.{export_format.value}"
+                for export_format in formats
+            }
+            error = None
+            skipped = resume and all(
+                filepath.exists() for filepath in filepaths.values()
+            )
+            if not skipped:
+                try:
+                    dns_records = self.get_dns_records(domain)
+                    fingerprint = None
+                    if fingerprint_index is not None:
+                        fingerprint = zone_fingerprint(dns_records)
+                        skipped = fingerprint_index.is_unchanged(
+                            domain, fingerprint
+                        ) and all(filepath.exists() for filepath in filepaths.values())
+                    if not skipped:
+                        for export_format, filepath in filepaths.items():
+                            if export_format is ExportFormat.bind:
+                                with open_file_atomic(filepath) as f:
+                                    self._write_dns_records_bind(f, domain, dns_records)
+                            elif export_format is ExportFormat.ndjson:
+                                with open_file_atomic(filepath) as f:
+                                    write_ndjson(f, dns_records)
+                            else:
+                                write_file_atomic(
+                                    filepath, self._dns_records_to_json(dns_records)
+                                )
+                    if fingerprint is not None:
+                        fingerprint_index.update(domain, fingerprint)
+                except Exception as e:
+                    logger.error(f"export of {domain} failed: {e}")
+                    error = e
+                    if fingerprint_index is not None:
+                        # export the domain again in the next run
+                        fingerprint_index.remove(domain)
+
+            with lock:
+                if skipped:
+                    result.skipped.append(domain)
+                elif error is not None:
+                    result.failed[domain] = error
+                else:
+                    result.exported.append(domain)
+                if progress is not None:
+                    progress(
+                        len(result.exported) + len(result.skipped) + len(result.failed),
+                        len(domains),
+                    )
+
+        with ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="pkb_client_export"
+        ) as executor:
+            try:
+                for future in [executor.submit(export, domain) for domain in domains]:
+                    future.result()
+            finally:
+                if fingerprint_index is not None:
+                    fingerprint_index.save()
+
+        logger.info(
+            f"export finished: {len(result.exported)} exported, {len(result.skipped)} skipped, "
+            f"{len(result.failed)} failed"
+        )
+
+        return result
+
+    def snapshot_dns_records(
+        self,
+        domains: Optional[Sequence[str]] = None,
+        label: Optional[str] = None,
+        max_workers: int = 10,
+        fingerprint_index: Optional["FingerprintIndex"] = None,
+    ) -> "Snapshot":
+        """
+        Save a snapshot of the DNS records of multiple domains in the snapshot store of the client.
+        Unchanged DNS records of a domain are only saved once across all snapshots.
+        This method does not represent a Porkbun API method.
+
+        :param domains: the domains to save, None for all domains of the account
+        :param label: an optional description of the snapshot
+        :param max_workers: the maximum number of domains whose DNS records are retrieved at the same time
+        :param fingerprint_index: the fingerprints of the zones saved by the last run, if no zone changed since then
+                                  and the newest snapshot contains exactly the given domains with the same DNS
+                                  records, no new snapshot is created; the index is updated and saved after the
+                                  snapshot
+        :return: the created snapshot or the newest snapshot if no zone changed
+        """
+
+        if self.snapshot_store is None:
+            raise ValueError("the client has no snapshot store")
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        from pkb_client.client.fingerprint import zone_fingerprint
+        from pkb_client.client.snapshot import zone_digest
+
+        if domains is None:
+            domains = [domain_info.domain for domain_info in self.iter_domains()]
+
+        with ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="pkb_client_snapshot"
+        ) as executor:
+            zones = dict(
+                zip(domains, executor.map(self.get_dns_records, domains), strict=True)
             )
 
-            if record.notes:
-                bind_file_content += f" ; {record.notes}"
+        if fingerprint_index is not None:
+            # the root fingerprint of the index only stays the same if no zone changed since the last run
+            root = fingerprint_index.root
+            for domain, dns_records in zones.items():
+                fingerprint_index.update(domain, zone_fingerprint(dns_records))
+            if (
+                fingerprint_index.root == root
+                and self.snapshot_store.list_snapshot_ids()
+            ):
+                # the index can be shared with other runs like exports, so the newest snapshot is only reused if it
+                # contains exactly the requested domains with the same DNS records
+                latest_snapshot = self.snapshot_store.get_snapshot()
+                digests = {
+                    domain: zone_digest(dns_records)
+                    for domain, dns_records in zones.items()
+                }
+                if latest_snapshot.zones == digests:
+                    logger.info("no zone changed since the last snapshot")
+                    return latest_snapshot
 
-        with open(filepath, "w") as f:
-            f.write(bind_file_content)
+        snapshot = self.snapshot_store.create_snapshot(zones, label)
+        if fingerprint_index is not None:
+            fingerprint_index.save()
+        logger.info(f"snapshot {snapshot.id} of {len(zones)} domains created")
 
-        logger.info("export finished")
+        return snapshot
 
-        return True
+    def restore_dns_records_snapshot(
+        self,
+        domain: str,
+        restore_mode: DNSRestoreMode,
+        snapshot_id: Optional[str] = None,
+        max_workers: int = 1,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> bool:
+        """
+        Restore the DNS records of a domain from a snapshot in the snapshot store of the client,
+        see :meth:`import_dns_records`.
+        This method does not represent a Porkbun API method.
+
+        :param domain: the domain for which the DNS record should be restored
+        :param restore_mode: the restore mode, see :meth:`import_dns_records`
+        :param snapshot_id: the id of the snapshot, None for the newest snapshot which contains the domain
+        :param max_workers: the maximum number of DNS records changed at the same time
+        :param progress: function which is called with the number of changed DNS records and the total number
+                         of DNS record changes after every change
+        :return: True if everything went well
+        """
+
+        if self.snapshot_store is None:
+            raise ValueError("the client has no snapshot store")
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        return self.import_dns_records(
+            domain,
+            self.snapshot_store.get_zone_path(domain, snapshot_id),
+            restore_mode,
+            max_workers=max_workers,
+            progress=progress,
+            file_format=ExportFormat.ndjson,
+        )
 
     def import_dns_records(
-        self, domain: str, filepath: Union[Path, str], restore_mode: DNSRestoreMode
+        self,
+        domain: str,
+        filepath: Union[Path, str],
+        restore_mode: DNSRestoreMode,
+        max_workers: int = 1,
+        progress: Optional[Callable[[int, int], None]] = None,
+        file_format: Union[ExportFormat, str] = ExportFormat.json,
     ) -> bool:
         """
         Restore all DNS records from a json file to the given domain.
@@ -483,190 +927,436 @@ class PKBClient:
 
         :param domain: the domain for which the DNS record should be restored
         :param filepath: the filepath from which the DNS records are to be restored
-        :param restore_mode: The restore mode (DNS records are identified by the record type, name and prio if supported):
-            clear: remove all existing DNS records and restore all DNS records from the provided file
+        :param restore_mode: The restore mode (DNS records are identified by the record type, name, prio if supported
+                             and content, see :func:`pkb_client.client.reconcile.compute_reconcile_plan`):
+            clear: make the DNS records equal to the DNS records from the provided file, unchanged DNS records
+                   are kept and changed DNS records are updated instead of deleted and recreated
             replace: replace only existing DNS records with the DNS records from the provided file,
                      but do not create any new DNS records
             keep: keep the existing DNS records and only create new ones for all DNS records from
                   the specified file if they do not exist
+        :param max_workers: the maximum number of DNS records changed at the same time
+        :param progress: function which is called with the number of changed DNS records and the total number
+                         of DNS record changes after every change
+        :param file_format: the format of the file, see :meth:`export_dns_records`
 
         :return: True if everything went well
         """
 
+        # validate the arguments before the DNS records are retrieved, so invalid arguments are not handled as
+        # failed import with a backup
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
         filepath = Path(filepath)
+        file_format = self._dns_records_file_format(file_format)
 
         existing_dns_records = self.get_dns_records(domain)
 
-        with open(filepath, "r") as f:
-            exported_dns_records_dict = json.load(f)
+        # gzip compressed files like the DNS records of snapshots are decompressed while reading
+        opener = open
+        if filepath.suffix == ".gz":
+            import gzip
+
+            opener = gzip.open
+        with opener(filepath, "rt") as f:
+            if file_format is ExportFormat.ndjson:
+                desired_dns_records = list(read_ndjson(f))
+            else:
+                desired_dns_records = [
+                    dns_record_from_export(record) for record in json.load(f).values()
+                ]
+        plan = compute_reconcile_plan(desired_dns_records, existing_dns_records)
 
         if restore_mode is DNSRestoreMode.clear:
             logger.debug("restore mode: clear")
-
-            try:
-                # delete all existing DNS records
-                for record in existing_dns_records:
-                    self.delete_dns_record(domain, record.id)
-
-                # restore all exported records by creating new DNS records
-                for _, exported_record in exported_dns_records_dict.items():
-                    name = ".".join(exported_record["name"].split(".")[:-2])
-                    self.create_dns_record(
-                        domain=domain,
-                        record_type=DNSRecordType(exported_record["type"]),
-                        content=exported_record["content"],
-                        name=name,
-                        ttl=exported_record["ttl"],
-                        prio=exported_record["prio"],
-                    )
-            except Exception as e:
-                logger.error("something went wrong: {}".format(e.__str__()))
-                self.__handle_error_backup__(existing_dns_records)
-                logger.error("import failed")
-                return False
         elif restore_mode is DNSRestoreMode.replace:
             logger.debug("restore mode: replace")
-
-            try:
-                existing_dns_record_hashed = {
-                    sha256(
-                        f"{record.type}{record.name}{record.prio}".encode()
-                    ).hexdigest(): record
-                    for record in existing_dns_records
-                }
-                for record in exported_dns_records_dict.values():
-                    record_hash = sha256(
-                        f"{record['type']}{record['name']}{record['prio']}".encode()
-                    ).hexdigest()
-                    existing_record = existing_dns_record_hashed.get(record_hash, None)
-                    # check if the exported dns record is different to the existing record,
-                    # so we can reduce unnecessary api calls
-                    if existing_record is not None and (
-                        record["content"] != existing_record.content
-                        or record["ttl"] != existing_record.ttl
-                        or record["prio"] != existing_record.prio
-                    ):
-                        self.update_dns_record(
-                            domain=domain,
-                            record_id=existing_record.id,
-                            record_type=DNSRecordType(record["type"]),
-                            content=record["content"],
-                            name=record["name"].replace(f".{domain}", ""),
-                            ttl=record["ttl"],
-                            prio=record["prio"],
-                        )
-            except Exception as e:
-                logger.error("something went wrong: {}".format(e.__str__()))
-                self.__handle_error_backup__(existing_dns_records)
-                logger.error("import failed")
-                return False
+            # only change existing DNS records
+            plan = ReconcilePlan(updates=plan.updates)
         elif restore_mode is DNSRestoreMode.keep:
             logger.debug("restore mode: keep")
-
-            existing_dns_record_hashed = {
-                sha256(
-                    f"{record.type}{record.name}{record.prio}".encode()
-                ).hexdigest(): record
-                for record in existing_dns_records
-            }
-
-            try:
-                for record in exported_dns_records_dict.values():
-                    record_hash = sha256(
-                        f"{record['type']}{record['name']}{record['prio']}".encode()
-                    ).hexdigest()
-                    existing_record = existing_dns_record_hashed.get(record_hash, None)
-                    if existing_record is None:
-                        self.create_dns_record(
-                            domain=domain,
-                            record_type=DNSRecordType(record["type"]),
-                            content=record["content"],
-                            name=record["name"].replace(f".{domain}", ""),
-                            ttl=record["ttl"],
-                            prio=record["prio"],
-                        )
-            except Exception as e:
-                logger.error("something went wrong: {}".format(e.__str__()))
-                self.__handle_error_backup__(existing_dns_records)
-                logger.error("import failed")
-                return False
+            # only create missing DNS records
+            plan = ReconcilePlan(creates=plan.creates)
         else:
             raise Exception("restore mode not supported")
 
+        try:
+            self._apply_reconcile_plan(domain, plan, max_workers, progress)
+        except Exception as e:
+            logger.error("something went wrong: {}".format(e.__str__()))
+            self.__handle_error_backup__(existing_dns_records, domain)
+            logger.error("import failed")
+            return False
+
         logger.info("import successfully completed")
 
         return True
 
+    def apply_dns_mutations(
+        self,
+        mutations: List["DNSMutation"],
+        max_workers: int = 10,
+        stop_on_error: bool = True,
+        progress: Optional[Callable[["DNSMutationResult"], None]] = None,
+    ) -> List["DNSMutationResult"]:
+        """
+        Create, update and delete many DNS records in parallel across domains, while the changes of one domain
+        are applied sequentially in the given order.
+        This method does not represent a Porkbun API method.
+
+        :param mutations: the changes to apply, see :class:`pkb_client.client.bulk.DNSMutation`
+        :param max_workers: the maximum number of domains changed at the same time
+        :param stop_on_error: whether the remaining changes of a domain should be skipped after a change failed
+        :param progress: function which is called with the result of every change as soon as it is finished
+        :return: the results of the changes in the order of the given changes, failed changes contain the error
+                 instead of raising it
+        """
+
+        from pkb_client.client.bulk import execute_dns_mutations
+
+        return execute_dns_mutations(
+            self,
+            mutations,
+            max_workers=max_workers,
+            stop_on_error=stop_on_error,
+            progress=progress,
+        )
+
+    def reconcile_dns_records(
+        self,
+        domain: str,
+        dns_records: List[DNSRecord],
+        dry_run: bool = False,
+        max_workers: int = 1,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> ReconcilePlan:
+        """
+        Change the existing DNS records of the domain to the given DNS records with the minimal number of API calls.
+        This method does not represent a Porkbun API method.
+
+        :param domain: the domain of the DNS records
+        :param dns_records: the desired DNS records with fully qualified names, the record ids are ignored
+        :param dry_run: if True, only compute the required changes without applying them
+        :param max_workers: the maximum number of DNS records changed at the same time
+        :param progress: function which is called with the number of changed DNS records and the total number
+                         of DNS record changes after every change
+        :return: the plan of the required changes
+        """
+
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        plan = compute_reconcile_plan(dns_records, self.get_dns_records(domain))
+        logger.debug(
+            f"reconcile {domain}: {len(plan.creates)} creates, {len(plan.updates)} updates, "
+            f"{len(plan.deletes)} deletes"
+        )
+        if not dry_run:
+            self._apply_reconcile_plan(domain, plan, max_workers, progress)
+        return plan
+
+    def _apply_reconcile_plan(
+        self,
+        domain: str,
+        plan: ReconcilePlan,
+        max_workers: int = 1,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> None:
+        """
+        Apply the changes of a reconcile plan to the DNS records of the domain.
+
+        The deletes, updates and creates are applied one phase after the other, the changes of one phase are
+        applied in parallel. If a change fails, the remaining changes are not applied and the error is raised.
+
+        :param domain: the domain of the DNS records
+        :param plan: the plan of the changes
+        :param max_workers: the maximum number of changes applied at the same time
+        :param progress: function which is called with the number of applied changes and the total number
+                         of changes after every change
+        """
+
+        # delete first, so that new records do not conflict with records which are removed (e.g. CNAME records)
+        phases = [
+            [
+                functools.partial(self.delete_dns_record, domain, record.id)
+                for record in plan.deletes
+            ],
+            [
+                functools.partial(
+                    self.update_dns_record,
+                    domain=domain,
+                    record_id=current.id,
+                    record_type=record.type,
+                    content=record.content,
+                    name=subdomain_of(record.name, domain),
+                    ttl=record.ttl,
+                    prio=record.prio,
+                )
+                for current, record in plan.updates
+            ],
+            [
+                functools.partial(
+                    self.create_dns_record,
+                    domain=domain,
+                    record_type=record.type,
+                    content=record.content,
+                    name=subdomain_of(record.name, domain),
+                    ttl=record.ttl,
+                    prio=record.prio,
+                )
+                for record in plan.creates
+            ],
+        ]
+
+        total = plan.changes
+        done = 0
+        lock = threading.Lock()
+
+        def apply(change: Callable[[], object]) -> None:
+            nonlocal done
+            change()
+            with lock:
+                done += 1
+                if progress is not None:
+                    progress(done, total)
+
+        if max_workers == 1:
+            for phase in phases:
+                for change in phase:
+                    apply(change)
+            return
+
+        with ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="pkb_client_import"
+        ) as executor:
+            for phase in phases:
+                futures = [executor.submit(apply, change) for change in phase]
+                _, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+                for future in not_done:
+                    future.cancel()
+                for future in futures:
+                    if not future.cancelled() and future.exception() is not None:
+                        raise future.exception()
+
     def import_bind_dns_records(
-        self, filepath: Union[Path, str], restore_mode: DNSRestoreMode
+        self,
+        filepath: Union[Path, str],
+        restore_mode: DNSRestoreMode,
+        max_workers: int = 1,
+        progress: Optional[Callable[[int, int], None]] = None,
     ) -> bool:
         """
         Restore all DNS records from a BIND file.
         This method does not represent a Porkbun API method.
 
         :param filepath: the bind filepath from which the DNS records are to be restored
-        :param restore_mode: The restore mode:
-            clear: remove all existing DNS records and restore all DNS records from the provided file
+        :param restore_mode: The restore mode (DNS records are identified by the record type, name, prio if supported
+                             and content, see :func:`pkb_client.client.reconcile.compute_reconcile_plan`):
+            clear: make the DNS records and nameservers equal to the ones from the provided file, unchanged
+                   DNS records are kept and changed DNS records are updated instead of deleted and recreated
+            replace: replace only existing DNS records and the nameservers with the ones from the provided file,
+                     but do not create any new DNS records
+            keep: keep the existing DNS records and nameservers and only create new ones for all DNS records from
+                  the specified file if they do not exist
+        :param max_workers: the maximum number of DNS records changed at the same time
+        :param progress: function which is called with the number of changed DNS records and the total number
+                         of DNS record changes after every change
         :return: True if everything went well
         """
 
-        bind_file = BindFile.from_file(filepath)
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
 
-        existing_dns_records = self.get_dns_records(bind_file.origin[:-1])
+        from pkb_client.client.bind_file import BindFile
 
-        if restore_mode is DNSRestoreMode.clear:
-            logger.debug("restore mode: clear")
+        # read the records one by one, so only the records to import are kept in memory
+        with BindFile.iter_records(filepath) as bind_records:
+            dns_records, nameserver_records = self._bind_records_to_dns_records(
+                bind_records
+            )
+        domain = bind_records.origin[:-1]
+
+        error = self._import_bind_zone(
+            domain,
+            dns_records,
+            nameserver_records,
+            restore_mode,
+            max_workers,
+            progress,
+        )
+        return error is None
 
-            try:
-                # delete all existing DNS records
-                for record in existing_dns_records:
-                    self.delete_dns_record(bind_file.origin[:-1], record.id)
-
-                nameserver_records = []
-                # restore all records from BIND file by creating new DNS records
-                for record in bind_file.records:
-                    if record.record_type == DNSRecordType.NS:
-                        # collect nameserver records to update them later in bulk
-                        nameserver_records.append(record)
-                        continue
-                    if record.name.endswith("."):
-                        # extract subdomain from record name, by removing the domain and TLD
-                        subdomain = record.name.removesuffix(bind_file.origin)
-                        subdomain = subdomain.removesuffix(".")
-                    else:
-                        subdomain = record.name
-
-                    self.create_dns_record(
-                        domain=bind_file.origin[:-1],
-                        record_type=record.record_type,
-                        content=record.data,
-                        name=subdomain,
-                        ttl=record.ttl,
-                        prio=record.prio,
+    def import_bind_directory(
+        self,
+        directory: Union[Path, str],
+        restore_mode: DNSRestoreMode,
+        pattern: str = "*.bind",
+        parse_workers: Optional[int] = None,
+        max_workers: int = 1,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> List["BindImportResult"]:
+        """
+        Restore the DNS records of multiple domains from a directory of BIND files, one file per domain.
+        The files are parsed in parallel with a pool of processes, see :func:`pkb_client.client.bind_file.parse_bind_files`,
+        and each domain is imported as soon as its file is parsed, see :meth:`import_bind_dns_records`.
+        This method does not represent a Porkbun API method.
+
+        :param directory: the directory with the BIND files
+        :param restore_mode: the restore mode, see :meth:`import_bind_dns_records`
+        :param pattern: the glob pattern of the BIND files in the directory
+        :param parse_workers: the number of processes parsing the files, None to use one per CPU core
+        :param max_workers: the maximum number of DNS records of one domain changed at the same time
+        :param progress: function which is called with the number of processed files and the total number of files
+                         after every file
+        :return: the results of the files sorted by the file paths, with the timings and the error of failed files
+        """
+
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        from pkb_client.client.bind_file import BindImportResult, parse_bind_files
+
+        paths = sorted(Path(directory).glob(pattern))
+        results = []
+        for parse_result in parse_bind_files(paths, parse_workers):
+            result = BindImportResult(
+                parse_result.path,
+                error=parse_result.error,
+                parse_duration=parse_result.duration,
+            )
+            if parse_result.ok:
+                bind_file = parse_result.bind_file
+                result.domain = bind_file.origin[:-1]
+                start = time.perf_counter()
+                try:
+                    dns_records, nameserver_records = self._bind_records_to_dns_records(
+                        bind_file.records
                     )
+                    result.error = self._import_bind_zone(
+                        result.domain,
+                        dns_records,
+                        nameserver_records,
+                        restore_mode,
+                        max_workers,
+                    )
+                except Exception as e:
+                    logger.error(f"import of {parse_result.path} failed: {e}")
+                    result.error = e
+                result.import_duration = time.perf_counter() - start
+            else:
+                logger.error(
+                    f"parsing of {parse_result.path} failed: {parse_result.error}"
+                )
 
-                # update nameservers in bulk
-                if nameserver_records:
-                    name_servers = []
-                    # remove trailing dot from nameserver records
-                    for nameserver in nameserver_records:
-                        if nameserver.data.endswith("."):
-                            name_servers.append(nameserver.data[:-1])
-                        else:
-                            name_servers.append(nameserver.data)
-                    self.update_dns_servers(bind_file.origin[:-1], name_servers)
-
-            except Exception as e:
-                logger.error("something went wrong: {}".format(e.__str__()))
-                self.__handle_error_backup__(existing_dns_records)
-                logger.error("import failed")
-                return False
+            results.append(result)
+            if progress is not None:
+                progress(len(results), len(paths))
+
+        return results
+
+    @staticmethod
+    def _bind_records_to_dns_records(
+        bind_records: Iterable["BindRecord"],
+    ) -> Tuple[List[DNSRecord], List["BindRecord"]]:
+        """
+        Convert BIND records to the DNS records to import.
+
+        :param bind_records: the BIND records with fully qualified names
+        :return: the DNS records and the separated nameserver records
+        """
+
+        nameserver_records = []
+        dns_records = []
+        for record in bind_records:
+            if record.record_type == DNSRecordType.NS:
+                # collect nameserver records to update them later in bulk
+                nameserver_records.append(record)
+                continue
+            # the parser qualifies all names, remove the trailing dot
+            name = record.name[:-1]
+            # the API returns the domain names in the content without trailing dot, remove it so unchanged
+            # records are matched with the existing records
+            content = record.data
+            if record.record_type in (
+                DNSRecordType.MX,
+                DNSRecordType.CNAME,
+                DNSRecordType.ALIAS,
+            ):
+                content = _strip_trailing_dot(content)
+            elif record.record_type == DNSRecordType.SRV:
+                weight_port, _, target = content.rpartition(" ")
+                content = f"{weight_port} {_strip_trailing_dot(target)}".lstrip()
+            dns_records.append(
+                DNSRecord(
+                    id="",
+                    name=name,
+                    type=record.record_type,
+                    content=content,
+                    ttl=record.ttl,
+                    prio=record.prio,
+                    notes="",
+                )
+            )
+        return dns_records, nameserver_records
+
+    def _import_bind_zone(
+        self,
+        domain: str,
+        dns_records: List[DNSRecord],
+        nameserver_records: List["BindRecord"],
+        restore_mode: DNSRestoreMode,
+        max_workers: int = 1,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> Optional[Exception]:
+        """
+        Import the DNS records and nameservers of a BIND file, see :meth:`import_bind_dns_records`.
+
+        :return: None if everything went well, otherwise the error of the failed change
+        """
+
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        existing_dns_records = self.get_dns_records(domain)
+        plan = compute_reconcile_plan(dns_records, existing_dns_records)
+
+        if restore_mode is DNSRestoreMode.clear:
+            logger.debug("restore mode: clear")
+        elif restore_mode is DNSRestoreMode.replace:
+            logger.debug("restore mode: replace")
+            # only change existing DNS records
+            plan = ReconcilePlan(updates=plan.updates)
+        elif restore_mode is DNSRestoreMode.keep:
+            logger.debug("restore mode: keep")
+            # only create missing DNS records and keep the existing nameservers
+            plan = ReconcilePlan(creates=plan.creates)
+            nameserver_records = []
         else:
             raise Exception(f"restore mode '{restore_mode.value}' not supported")
 
+        try:
+            self._apply_reconcile_plan(domain, plan, max_workers, progress)
+
+            # update nameservers in bulk
+            if nameserver_records:
+                name_servers = []
+                # remove trailing dot from nameserver records
+                for nameserver in nameserver_records:
+                    if nameserver.data.endswith("."):
+                        name_servers.append(nameserver.data[:-1])
+                    else:
+                        name_servers.append(nameserver.data)
+                self.update_dns_servers(domain, name_servers)
+        except Exception as e:
+            logger.error("something went wrong: {}".format(e.__str__()))
+            self.__handle_error_backup__(existing_dns_records, domain)
+            logger.error("import failed")
+            return e
+
         logger.info("import successfully completed")
 
-        return True
+        return None
 
     def update_dns_servers(self, domain: str, name_servers: List[str]) -> bool:
         """
@@ -676,18 +1366,15 @@ class PKBClient:
         :return: True if everything went well
         """
 
-        url = urljoin(self.api_endpoint, f"domain/updateNs/{domain}")
-        req_json = {**self._get_auth_request_json(), "ns": name_servers}
-        r = requests.post(url=url, json=req_json)
-
-        if r.status_code == 200 and json.loads(r.text).get("status", None) == "SUCCESS":
-            return True
-        else:
-            response_json = json.loads(r.text)
+        data = self._request(
+            f"domain/updateNs/{domain}", {"ns": name_servers}, idempotent=True
+        )
+        if data.get("status", None) != "SUCCESS":
             raise PKBClientException(
-                response_json.get("status", "Unknown status"),
-                response_json.get("message", "Unknown message"),
+                data.get("status", "Unknown status"),
+                data.get("message", "Unknown message"),
             )
+        return True
 
     def get_dns_servers(self, domain: str) -> List[str]:
         """
@@ -697,18 +1384,7 @@ class PKBClient:
         :return: list of name servers
         """
 
-        url = urljoin(self.api_endpoint, f"domain/getNs/{domain}")
-        req_json = self._get_auth_request_json()
-        r = requests.post(url=url, json=req_json)
-
-        if r.status_code == 200:
-            return json.loads(r.text).get("ns", [])
-        else:
-            response_json = json.loads(r.text)
-            raise PKBClientException(
-                response_json.get("status", "Unknown status"),
-                response_json.get("message", "Unknown message"),
-            )
+        return self._request(f"domain/getNs/{domain}", read_only=True).get("ns", [])
 
     def get_domains(self, start: int = 0) -> List[DomainInfo]:
         """
@@ -720,32 +1396,46 @@ class PKBClient:
         :return: list of DomainInfo objects
         """
 
-        url = urljoin(self.api_endpoint, "domain/listAll")
+        data = self._request("domain/listAll", {"start": start}, read_only=True)
+        return [DomainInfo.from_dict(d) for d in data.get("domains", [])]
 
-        req_json = {**self._get_auth_request_json(), "start": start}
-        r = requests.post(url=url, json=req_json)
+    def iter_domains(
+        self, start: int = 0, prefetch: bool = True
+    ) -> Iterator[DomainInfo]:
+        """
+        Iterate over all domains of the account, retrieving the chunks of 1000 domains as needed.
+        This method does not represent a Porkbun API method.
 
-        if r.status_code == 200:
-            return [
-                DomainInfo(
-                    domain=d["domain"],
-                    status=d["status"],
-                    tld=d["tld"],
-                    create_date=datetime.fromisoformat(d["createDate"]),
-                    expire_date=datetime.fromisoformat(d["expireDate"]),
-                    security_lock=bool(d["securityLock"]),
-                    whois_privacy=bool(d["whoisPrivacy"]),
-                    auto_renew=bool(d["autoRenew"]),
-                    not_local=bool(d["notLocal"]),
-                )
-                for d in json.loads(r.text).get("domains", [])
-            ]
-        else:
-            response_json = json.loads(r.text)
-            raise PKBClientException(
-                response_json.get("status", "Unknown status"),
-                response_json.get("message", "Unknown message"),
-            )
+        :param start: the index of the first domain to retrieve
+        :param prefetch: whether the next chunk should be retrieved in the background while the current chunk
+                         is consumed
+
+        :return: iterator of DomainInfo objects
+        """
+
+        if not prefetch:
+            while True:
+                domains = self.get_domains(start)
+                if not domains:
+                    return
+                start += len(domains)
+                yield from domains
+
+        executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="pkb_client_domains"
+        )
+        try:
+            next_domains = executor.submit(self.get_domains, start)
+            while True:
+                domains = next_domains.result()
+                if not domains:
+                    return
+                start += len(domains)
+                next_domains = executor.submit(self.get_domains, start)
+                yield from domains
+        finally:
+            # do not wait for a prefetched chunk if the iteration is stopped early
+            executor.shutdown(wait=False, cancel_futures=True)
 
     def get_url_forwards(self, domain: str) -> List[URLForwarding]:
         """
@@ -755,28 +1445,8 @@ class PKBClient:
         :return: list of URLForwarding objects
         """
 
-        url = urljoin(self.api_endpoint, f"domain/getUrlForwarding/{domain}")
-        req_json = self._get_auth_request_json()
-        r = requests.post(url=url, json=req_json)
-
-        if r.status_code == 200:
-            return [
-                URLForwarding(
-                    id=f["id"],
-                    subdomain=f["subdomain"],
-                    location=f["location"],
-                    type=URLForwardingType[f["type"]],
-                    include_path=f["includePath"] == "yes",
-                    wildcard=f["wildcard"] == "yes",
-                )
-                for f in json.loads(r.text).get("forwards", [])
-            ]
-        else:
-            response_json = json.loads(r.text)
-            raise PKBClientException(
-                response_json.get("status", "Unknown status"),
-                response_json.get("message", "Unknown message"),
-            )
+        data = self._request(f"domain/getUrlForwarding/{domain}", read_only=True)
+        return [URLForwarding.from_dict(f) for f in data.get("forwards", [])]
 
     def create_url_forward(
         self,
@@ -801,25 +1471,17 @@ class PKBClient:
         :return: True if the forwarding was added successfully
         """
 
-        url = urljoin(self.api_endpoint, f"domain/addUrlForward/{domain}")
-        req_json = {
-            **self._get_auth_request_json(),
-            "subdomain": subdomain,
-            "location": location,
-            "type": type.value,
-            "includePath": include_path,
-            "wildcard": wildcard,
-        }
-        r = requests.post(url=url, json=req_json)
-
-        if r.status_code == 200:
-            return True
-        else:
-            response_json = json.loads(r.text)
-            raise PKBClientException(
-                response_json.get("status", "Unknown status"),
-                response_json.get("message", "Unknown message"),
-            )
+        self._request(
+            f"domain/addUrlForward/{domain}",
+            {
+                "subdomain": subdomain,
+                "location": location,
+                "type": type.value,
+                "includePath": include_path,
+                "wildcard": wildcard,
+            },
+        )
+        return True
 
     def delete_url_forward(self, domain: str, id: str) -> bool:
         """
@@ -832,38 +1494,37 @@ class PKBClient:
         :return: True if the deletion was successful
         """
 
-        url = urljoin(self.api_endpoint, f"domain/deleteUrlForward/{domain}/{id}")
-        req_json = self._get_auth_request_json()
-        r = requests.post(url=url, json=req_json)
-
-        if r.status_code == 200:
-            return True
-        else:
-            response_json = json.loads(r.text)
-            raise PKBClientException(
-                response_json.get("status", "Unknown status"),
-                response_json.get("message", "Unknown message"),
-            )
+        self._request(f"domain/deleteUrlForward/{domain}/{id}")
+        return True
 
-    def get_domain_pricing(self) -> dict:
+    def get_domain_pricing(self) -> Mapping[str, Any]:
         """
         Get the pricing for all Porkbun domains.
         See https://api.porkbun.com/api/json/v3/documentation#Domain%20Pricing for more info.
 
-        :return: dict with pricing
+        :return: dict with pricing, with a pricing cache a read-only mapping shared by all callers
         """
 
-        url = urljoin(self.api_endpoint, "pricing/get")
-        r = requests.post(url=url)
+        if self.pricing_cache is not None:
+            return self.pricing_cache.get_pricing(self._fetch_domain_pricing)
+        return self._fetch_domain_pricing()
 
-        if r.status_code == 200:
-            return json.loads(r.text)["pricing"]
-        else:
-            response_json = json.loads(r.text)
-            raise PKBClientException(
-                response_json.get("status", "Unknown status"),
-                response_json.get("message", "Unknown message"),
-            )
+    def get_tld_pricing(self, tld: str) -> Optional[dict]:
+        """
+        Get the pricing for a single TLD.
+        This method does not represent a Porkbun API method, it is based on the pricing of all Porkbun domains.
+        With a pricing cache the lookup is served locally.
+
+        :param tld: the TLD without leading dot, e.g. "com"
+        :return: dict with the pricing of the TLD or None if the TLD is not offered
+        """
+
+        if self.pricing_cache is not None:
+            return self.pricing_cache.get_tld_pricing(tld, self._fetch_domain_pricing)
+        return self._fetch_domain_pricing().get(tld.lower().lstrip("."))
+
+    def _fetch_domain_pricing(self) -> dict:
+        return self._request("pricing/get", auth=False, read_only=True)["pricing"]
 
     def get_ssl_bundle(self, domain) -> SSLCertBundle:
         """
@@ -875,24 +1536,9 @@ class PKBClient:
         :return: tuple of intermediate certificate, certificate chain, private key, public key
         """
 
-        url = urljoin(self.api_endpoint, f"ssl/retrieve/{domain}")
-        req_json = self._get_auth_request_json()
-        r = requests.post(url=url, json=req_json)
+        ssl_bundle = self._request(f"ssl/retrieve/{domain}", read_only=True)
 
-        if r.status_code == 200:
-            ssl_bundle = json.loads(r.text)
-
-            return SSLCertBundle(
-                certificate_chain=ssl_bundle["certificatechain"],
-                private_key=ssl_bundle["privatekey"],
-                public_key=ssl_bundle["publickey"],
-            )
-        else:
-            response_json = json.loads(r.text)
-            raise PKBClientException(
-                response_json.get("status", "Unknown status"),
-                response_json.get("message", "Unknown message"),
-            )
+        return SSLCertBundle.from_dict(ssl_bundle)
 
     def get_dnssec_records(self, domain: str) -> List[DNSSECRecord]:
         """
@@ -903,41 +1549,11 @@ class PKBClient:
         :return: list of :class:`DNSSECRecord` objects
         """
 
-        url = urljoin(self.api_endpoint, f"dns/getDnssecRecords/{domain}")
-        req_json = self._get_auth_request_json()
-        r = requests.post(url=url, json=req_json)
-
-        if r.status_code == 200:
-            return [
-                DNSSECRecord(
-                    key_tag=int(record["keyTag"]),
-                    alg=int(record["alg"]),
-                    digest_type=int(record["digestType"]),
-                    digest=record["digest"],
-                    max_sig_life=int(record["maxSigLife"])
-                    if "maxSigLife" in record
-                    else None,
-                    key_data_flags=int(record["keyDataFlags"])
-                    if "keyDataFlags" in record
-                    else None,
-                    key_data_protocol=int(record["keyDataProtocol"])
-                    if "keyDataProtocol" in record
-                    else None,
-                    key_data_algo=int(record["keyDataAlgo"])
-                    if "keyDataAlgo" in record
-                    else None,
-                    key_data_pub_key=record["keyDataPubKey"]
-                    if "keyDataPubKey" in record
-                    else None,
-                )
-                for record in json.loads(r.text).get("records", {}).values()
-            ]
-        else:
-            response_json = json.loads(r.text)
-            raise PKBClientException(
-                response_json.get("status", "Unknown status"),
-                response_json.get("message", "Unknown message"),
-            )
+        data = self._request(f"dns/getDnssecRecords/{domain}", read_only=True)
+        return [
+            DNSSECRecord.from_dict(record)
+            for record in data.get("records", {}).values()
+        ]
 
     def create_dnssec_record(
         self,
@@ -973,29 +1589,21 @@ class PKBClient:
         if max_sig_life is not None and max_sig_life < 0:
             raise ValueError("max_sig_life must be greater than 0")
 
-        url = urljoin(self.api_endpoint, f"dns/createDnssecRecord/{domain}")
-        req_json = {
-            **self._get_auth_request_json(),
-            "keyTag": key_tag,
-            "alg": alg,
-            "digestType": digest_type,
-            "digest": digest,
-            "maxSigLife": max_sig_life,
-            "keyDataFlags": key_data_flags,
-            "keyDataProtocol": key_data_protocol,
-            "keyDataAlgo": key_data_algo,
-            "keyDataPubKey": key_data_pub_key,
-        }
-        r = requests.post(url=url, json=req_json)
-
-        if r.status_code == 200:
-            return True
-        else:
-            response_json = json.loads(r.text)
-            raise PKBClientException(
-                response_json.get("status", "Unknown status"),
-                response_json.get("message", "Unknown message"),
-            )
+        self._request(
+            f"dns/createDnssecRecord/{domain}",
+            {
+                "keyTag": key_tag,
+                "alg": alg,
+                "digestType": digest_type,
+                "digest": digest,
+                "maxSigLife": max_sig_life,
+                "keyDataFlags": key_data_flags,
+                "keyDataProtocol": key_data_protocol,
+                "keyDataAlgo": key_data_algo,
+                "keyDataPubKey": key_data_pub_key,
+            },
+        )
+        return True
 
     def delete_dnssec_record(self, domain: str, key_tag: int) -> bool:
         """
@@ -1007,18 +1615,8 @@ class PKBClient:
         :return: True if everything went well
         """
 
-        url = urljoin(self.api_endpoint, f"dns/deleteDnssecRecord/{domain}/{key_tag}")
-        req_json = self._get_auth_request_json()
-        r = requests.post(url=url, json=req_json)
-
-        if r.status_code == 200:
-            return True
-        else:
-            response_json = json.loads(r.text)
-            raise PKBClientException(
-                response_json.get("status", "Unknown status"),
-                response_json.get("message", "Unknown message"),
-            )
+        self._request(f"dns/deleteDnssecRecord/{domain}/{key_tag}")
+        return True
 
     def get_domain_availability(
         self, domain: str
@@ -1034,40 +1632,10 @@ class PKBClient:
         :raises PKBClientException: if the API call was not successful
         """
 
-        url = urljoin(self.api_endpoint, f"domain/checkDomain/{domain}")
-        r = requests.post(url=url, json=self._get_auth_request_json())
-
-        if r.status_code == 200:
-            data = json.loads(r.text)
-            response = data["response"]
-            limits = data["limits"]
-            return DomainAvailability(
-                available=response["avail"] == "yes",
-                type=response["type"],
-                price=float(response["price"]),
-                first_year_promo=response["firstYearPromo"] == "yes",
-                regular_price=float(response["regularPrice"]),
-                premium=response["premium"] == "yes",
-                additional_prices=[
-                    DomainPrice(
-                        type=ap["type"],
-                        price=float(ap["price"]),
-                        regular_price=float(ap["regularPrice"]),
-                    )
-                    for ap in response.get("additional", {}).values()
-                ],
-            ), DomainCheckRateLimit(
-                ttl=int(limits["TTL"]),
-                limit=int(limits["limit"]),
-                used=limits["used"],
-                natural_language=limits["naturalLanguage"],
-            )
-        else:
-            response_json = json.loads(r.text)
-            raise PKBClientException(
-                response_json.get("status", "Unknown status"),
-                response_json.get("message", "Unknown message"),
-            )
+        data = self._request(f"domain/checkDomain/{domain}", read_only=True)
+        return DomainAvailability.from_dict(
+            data["response"]
+        ), DomainCheckRateLimit.from_dict(data["limits"])
 
     def get_glue_records(self, domain: str) -> list[GlueRecord]:
         """Get all glue records for a specified domain.
@@ -1079,29 +1647,8 @@ class PKBClient:
         :raises PKBClientException: if the API call was not successful
         """
 
-        url = urljoin(self.api_endpoint, f"domain/getGlue/{domain}")
-        req_json = self._get_auth_request_json()
-        r = requests.post(url=url, json=req_json)
-
-        if r.status_code == 200:
-            records = []
-
-            for host in json.loads(r.text).get("hosts", []):
-                v4 = host[1].get("v4")
-                v6 = host[1].get("v6")
-                record = GlueRecord(
-                    host=host[0],
-                    v4=v4[0] if v4 else None,
-                    v6=v6[0] if v6 else None,
-                )
-                records.append(record)
-
-            return records
-        response_json = json.loads(r.text)
-        raise PKBClientException(
-            response_json.get("status", "Unknown status"),
-            response_json.get("message", "Unknown message"),
-        )
+        data = self._request(f"domain/getGlue/{domain}", read_only=True)
+        return [GlueRecord.from_host(host) for host in data.get("hosts", [])]
 
     def create_glue_record(
         self, domain: str, glue_host_subdomain: str, ips: list[str]
@@ -1117,20 +1664,11 @@ class PKBClient:
         :raises PKBClientException: if the API call was not successful
         """
 
-        url = urljoin(
-            self.api_endpoint,
+        self._request(
             f"domain/createGlue/{domain}/{glue_host_subdomain}",
+            {"ips": ips},
         )
-        req_json = {**self._get_auth_request_json(), "ips": ips}
-        r = requests.post(url=url, json=req_json)
-
-        if r.status_code == 200:
-            return True
-        response_json = json.loads(r.text)
-        raise PKBClientException(
-            response_json.get("status", "Unknown status"),
-            response_json.get("message", "Unknown message"),
-        )
+        return True
 
     def delete_glue_record(self, domain: str, glue_host_subdomain: str) -> bool:
         """Delete a glue record for a specified domain and host specified by the subdomain of the glue record host.
@@ -1142,20 +1680,8 @@ class PKBClient:
         :raises PKBClientException: if the API call was not successful
         """
 
-        url = urljoin(
-            self.api_endpoint,
-            f"domain/deleteGlue/{domain}/{glue_host_subdomain}",
-        )
-        req_json = self._get_auth_request_json()
-        r = requests.post(url=url, json=req_json)
-
-        if r.status_code == 200:
-            return True
-        response_json = json.loads(r.text)
-        raise PKBClientException(
-            response_json.get("status", "Unknown status"),
-            response_json.get("message", "Unknown message"),
-        )
+        self._request(f"domain/deleteGlue/{domain}/{glue_host_subdomain}")
+        return True
 
     def update_glue_record(
         self, domain: str, glue_host_subdomain: str, ips: list[str]
@@ -1170,30 +1696,34 @@ class PKBClient:
         :raises PKBClientException: if the API call was not successful
         """
 
-        url = urljoin(
-            self.api_endpoint,
+        self._request(
             f"domain/updateGlue/{domain}/{glue_host_subdomain}",
+            {"ips": ips},
+            idempotent=True,
         )
-        req_json = {**self._get_auth_request_json(), "ips": ips}
-        r = requests.post(url=url, json=req_json)
-
-        if r.status_code == 200:
-            return True
-        response_json = json.loads(r.text)
-        raise PKBClientException(
-            response_json.get("status", "Unknown status"),
-            response_json.get("message", "Unknown message"),
-        )
+        return True
 
-    @staticmethod
-    def __handle_error_backup__(dns_records: list[DNSRecord]) -> None:
+    def __handle_error_backup__(
+        self, dns_records: list[DNSRecord], domain: Optional[str] = None
+    ) -> None:
         """
         Handle errors when working with dns records by creating a backup of the given DNS records.
-        Crates a backup file in the current working directory with an incremental suffix.
+        Creates a snapshot in the snapshot store of the client if configured and the domain is known,
+        otherwise a backup file in the current working directory with an incremental suffix.
 
         :param dns_records: the DNS records to backup
+        :param domain: the domain of the DNS records
         """
 
+        if self.snapshot_store is not None and domain is not None:
+            snapshot = self.snapshot_store.create_snapshot(
+                {domain: dns_records}, label="backup before failed import"
+            )
+            logger.warning(
+                f"a backup of your existing dns records was saved as snapshot {snapshot.id}"
+            )
+            return
+
         # merge the single DNS records into one single dict with the record id as key
         dns_records_dict = dict()
         for record in dns_records:
@@ -0,0 +1,239 @@
+import json
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, Sequence
+
+logger = logging.getLogger("pkb_client")
+
+# matches rate limit messages of the API like "1 out of 1 checks within 10 seconds used."
+RATE_LIMIT_MESSAGE_PATTERN = re.compile(
+    r"(\d+) out of (\d+) \w+ within (\d+) seconds? used"
+)
+
+
+@dataclass
+class APIRequest:
+    # The API path relative to the API endpoint, e.g. "dns/retrieve/example.com".
+    endpoint: str
+
+    # The absolute url of the API call.
+    url: str
+
+    # The JSON body of the request, including the authentication if required.
+    json: Optional[Dict[str, Any]] = None
+
+    # Whether the API call only reads data and has no side effects.
+    read_only: bool = False
+
+    # Whether the API call can be repeated without changing the result.
+    idempotent: bool = False
+
+
+@dataclass
+class APIResponse:
+    # The HTTP status code of the response.
+    status_code: int
+
+    # The parsed JSON body of the response, None if the body is not valid JSON.
+    data: Optional[Dict[str, Any]]
+
+    # The HTTP headers of the response.
+    headers: Mapping[str, str] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code == 200 and self.data is not None
+
+    @property
+    def rate_limited(self) -> bool:
+        """
+        Whether the API call was rejected because a rate limit was exceeded.
+        """
+
+        if self.status_code == 429:
+            return True
+        if not self.data or self.data.get("status") == "SUCCESS":
+            return False
+        message = str(self.data.get("message", "")).lower()
+        return "rate limit" in message or bool(
+            RATE_LIMIT_MESSAGE_PATTERN.search(message)
+        )
+
+
+def endpoint_group(endpoint: str) -> str:
+    """
+    Get the API method of an endpoint without the domain and ids in the path,
+    e.g. "dns/retrieve" for "dns/retrieve/example.com/123".
+
+    :param endpoint: the API path relative to the API endpoint
+    :return: the API method of the endpoint
+    """
+
+    return "/".join(endpoint.split("/")[:2])
+
+
+Handler = Callable[[APIRequest], APIResponse]
+
+# A middleware receives the request and the next handler of the pipeline. It can inspect or modify the request,
+# decide whether and how often to call the next handler and inspect or replace the response.
+Middleware = Callable[[APIRequest, Handler], APIResponse]
+
+
+def build_pipeline(middlewares: Sequence[Middleware], handler: Handler) -> Handler:
+    """
+    Chain the middlewares in front of the handler.
+
+    :param middlewares: the middlewares to chain, the first middleware is called first
+    :param handler: the final handler which sends the request
+    :return: a handler which calls the whole pipeline
+    """
+
+    for middleware in reversed(middlewares):
+        handler = _bind(middleware, handler)
+    return handler
+
+
+def _bind(middleware: Middleware, call_next: Handler) -> Handler:
+    def handler(request: APIRequest) -> APIResponse:
+        return middleware(request, call_next)
+
+    return handler
+
+
+AsyncHandler = Callable[[APIRequest], Awaitable[APIResponse]]
+
+# The asyncio variant of a middleware for the AsyncPKBClient, which awaits the next handler.
+AsyncMiddleware = Callable[[APIRequest, AsyncHandler], Awaitable[APIResponse]]
+
+
+def build_async_pipeline(
+    middlewares: Sequence[AsyncMiddleware], handler: AsyncHandler
+) -> AsyncHandler:
+    """
+    Chain the asyncio middlewares in front of the handler.
+
+    :param middlewares: the middlewares to chain, the first middleware is called first
+    :param handler: the final handler which sends the request
+    :return: a handler which calls the whole pipeline
+    """
+
+    for middleware in reversed(middlewares):
+        handler = _bind_async(middleware, handler)
+    return handler
+
+
+def _bind_async(middleware: AsyncMiddleware, call_next: AsyncHandler) -> AsyncHandler:
+    async def handler(request: APIRequest) -> APIResponse:
+        return await middleware(request, call_next)
+
+    return handler
+
+
+@dataclass
+class EndpointTiming:
+    calls: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+
+    @property
+    def avg_time(self) -> float:
+        return self.total_time / self.calls if self.calls else 0.0
+
+
+class TimingMiddleware:
+    """
+    Middleware which measures the duration of the API calls per endpoint and logs it on debug level.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.timings: Dict[str, EndpointTiming] = {}
+
+    def __call__(self, request: APIRequest, call_next: Handler) -> APIResponse:
+        start = time.perf_counter()
+        try:
+            return call_next(request)
+        finally:
+            duration = time.perf_counter() - start
+            key = endpoint_group(request.endpoint)
+            with self._lock:
+                timing = self.timings.setdefault(key, EndpointTiming())
+                timing.calls += 1
+                timing.total_time += duration
+                timing.max_time = max(timing.max_time, duration)
+            logger.debug(f"{request.endpoint} took {duration * 1000:.1f} ms")
+
+
+def _copy_exception(e: BaseException) -> BaseException:
+    # the constructor is not called, because the arguments of custom exceptions can differ from their args
+    error = type(e).__new__(type(e), *e.args)
+    error.args = e.args
+    error.__dict__.update(e.__dict__)
+    return error
+
+
+class _InFlightCall:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.response: Optional[APIResponse] = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlightMiddleware:
+    """
+    Middleware which coalesces concurrent identical read only API calls, so that they share one HTTP call and
+    one parsed response.
+
+    Once a changing API call has been made, read only API calls do not join API calls which are already in flight,
+    so changes made through the client are always visible to subsequent reads.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _InFlightCall] = {}
+        # the number of API calls which were served by an API call already in flight
+        self.coalesced = 0
+
+    @staticmethod
+    def _key(request: APIRequest) -> str:
+        return f"{request.url}\n{json.dumps(request.json, sort_keys=True)}"
+
+    def __call__(self, request: APIRequest, call_next: Handler) -> APIResponse:
+        if not request.read_only:
+            try:
+                return call_next(request)
+            finally:
+                with self._lock:
+                    self._calls.clear()
+
+        key = self._key(request)
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _InFlightCall()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                # every waiter raises its own exception, so the traceback of the shared exception is not
+                # modified by multiple threads at the same time
+                raise _copy_exception(call.error) from call.error
+            return call.response
+
+        try:
+            call.response = call_next(request)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+        return call.response
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional
 
 
 @dataclass
@@ -15,6 +15,27 @@ class DomainInfo:
     auto_renew: bool
     not_local: bool
 
+    @staticmethod
+    def from_dict(d: dict[str, Any]) -> "DomainInfo":
+        """
+        Create a DomainInfo instance from the dictionary representation of the API.
+
+        :param d: Dictionary containing domain data.
+        :return: DomainInfo instance.
+        """
+
+        return DomainInfo(
+            domain=d["domain"],
+            status=d["status"],
+            tld=d["tld"],
+            create_date=datetime.fromisoformat(d["createDate"]),
+            expire_date=datetime.fromisoformat(d["expireDate"]),
+            security_lock=bool(d["securityLock"]),
+            whois_privacy=bool(d["whoisPrivacy"]),
+            auto_renew=bool(d["autoRenew"]),
+            not_local=bool(d["notLocal"]),
+        )
+
 
 @dataclass
 class DomainPrice:
@@ -30,6 +51,32 @@ class DomainAvailability(DomainPrice):
     premium: bool
     additional_prices: list[DomainPrice]
 
+    @staticmethod
+    def from_dict(d: dict[str, Any]) -> "DomainAvailability":
+        """
+        Create a DomainAvailability instance from the dictionary representation of the API.
+
+        :param d: Dictionary containing the domain check response.
+        :return: DomainAvailability instance.
+        """
+
+        return DomainAvailability(
+            available=d["avail"] == "yes",
+            type=d["type"],
+            price=float(d["price"]),
+            first_year_promo=d["firstYearPromo"] == "yes",
+            regular_price=float(d["regularPrice"]),
+            premium=d["premium"] == "yes",
+            additional_prices=[
+                DomainPrice(
+                    type=ap["type"],
+                    price=float(ap["price"]),
+                    regular_price=float(ap["regularPrice"]),
+                )
+                for ap in d.get("additional", {}).values()
+            ],
+        )
+
 
 @dataclass
 class DomainCheckRateLimit:
@@ -38,9 +85,42 @@ class DomainCheckRateLimit:
     used: int
     natural_language: str
 
+    @staticmethod
+    def from_dict(d: dict[str, Any]) -> "DomainCheckRateLimit":
+        """
+        Create a DomainCheckRateLimit instance from the dictionary representation of the API.
+
+        :param d: Dictionary containing the rate limit data.
+        :return: DomainCheckRateLimit instance.
+        """
+
+        return DomainCheckRateLimit(
+            ttl=int(d["TTL"]),
+            limit=int(d["limit"]),
+            used=d["used"],
+            natural_language=d["naturalLanguage"],
+        )
+
 
 @dataclass
 class GlueRecord:
     host: str
     v4: Optional[str]
     v6: Optional[str]
+
+    @staticmethod
+    def from_host(host: list[Any]) -> "GlueRecord":
+        """
+        Create a GlueRecord instance from the host representation of the API.
+
+        :param host: List of the host name and a dictionary with the IPv4 and IPv6 addresses.
+        :return: GlueRecord instance.
+        """
+
+        v4 = host[1].get("v4")
+        v6 = host[1].get("v6")
+        return GlueRecord(
+            host=host[0],
+            v4=v4[0] if v4 else None,
+            v6=v6[0] if v6 else None,
+        )
@@ -0,0 +1,171 @@
+import contextlib
+import json
+import os
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Union,
+)
+
+from pkb_client.client.dns import DNSRecord, DNSRecordType
+
+
+# the umask of the process, read on first use
+_UMASK: Optional[int] = None
+_UMASK_LOCK = threading.Lock()
+
+
+class ExportFormat(str, Enum):
+    json = "json"
+    bind = "bind"
+    ndjson = "ndjson"
+
+    def __str__(self):
+        return self.value
+
+
+@dataclass
+class ExportResult:
+    # The domains whose DNS records were exported.
+    exported: List[str] = field(default_factory=list)
+
+    # The domains which were skipped because they had already been exported.
+    skipped: List[str] = field(default_factory=list)
+
+    # The domains whose export failed with the error.
+    failed: Dict[str, Exception] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+
+def _umask() -> int:
+    global _UMASK
+    if _UMASK is None:
+        with _UMASK_LOCK:
+            if _UMASK is None:
+                # the umask can only be read by setting it
+                _UMASK = os.umask(0o022)
+                os.umask(_UMASK)
+    return _UMASK
+
+
+@contextlib.contextmanager
+def open_file_atomic(
+    filepath: Union[Path, str], mode: str = "w"
+) -> Iterator[Union[TextIO, BinaryIO]]:
+    """
+    Open a file for writing atomically, so that the file either has the old or the complete new content,
+    even if the process is interrupted. The new content is written to a temporary file in the same directory,
+    which replaces the file when the context is left without an error.
+
+    :param filepath: the path of the file
+    :param mode: the mode of the file, "w" for text or "wb" for binary content
+    :return: context manager of the stream to write the new content to
+    """
+
+    filepath = Path(filepath)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=filepath.parent, prefix=f".{filepath.name}.", suffix=".tmp"
+    )
+    try:
+        # the temporary file is only readable by the owner, use the mode of a file created with open instead
+        try:
+            file_mode = os.stat(filepath).st_mode & 0o7777
+        except FileNotFoundError:
+            file_mode = 0o666 & ~_umask()
+        os.chmod(tmp_path, file_mode)
+        with os.fdopen(fd, mode) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def write_file_atomic(filepath: Union[Path, str], content: str) -> None:
+    """
+    Write a file atomically, see :func:`open_file_atomic`.
+
+    :param filepath: the path of the file
+    :param content: the new content of the file
+    """
+
+    with open_file_atomic(filepath) as f:
+        f.write(content)
+
+
+def dns_record_from_export(record: Dict[str, Any]) -> DNSRecord:
+    """
+    Create a DNS record from its representation in a json or ndjson export.
+
+    :param record: the exported DNS record, the id and notes are optional
+    :return: the DNS record
+    """
+
+    return DNSRecord(
+        id=record.get("id", ""),
+        name=record["name"],
+        type=DNSRecordType(record["type"]),
+        content=record["content"],
+        ttl=int(record["ttl"]),
+        prio=record["prio"],
+        notes=record.get("notes", ""),
+    )
+
+
+def write_ndjson(
+    fp: TextIO, dns_records: Iterable[DNSRecord], chunk_size: int = 1000
+) -> None:
+    """
+    Write DNS records as newline delimited json, one :meth:`DNSRecord.to_dict` object per line, to a text stream
+    in chunks of records.
+
+    :param fp: the writable text stream
+    :param dns_records: the DNS records to write, can be a lazy iterable
+    :param chunk_size: the number of DNS records written at once
+    """
+
+    encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    chunk = []
+    for record in dns_records:
+        chunk.append(encoder.encode(record.to_dict()) + "\n")
+        if len(chunk) >= chunk_size:
+            fp.writelines(chunk)
+            chunk = []
+    if chunk:
+        fp.writelines(chunk)
+
+
+def read_ndjson(fp: Iterable[str]) -> Iterator[DNSRecord]:
+    """
+    Read DNS records from newline delimited json line by line, see :func:`write_ndjson`. Empty lines are skipped.
+
+    :param fp: the text stream or lines to read
+    :return: iterator of the DNS records
+    """
+
+    decoder = json.JSONDecoder()
+    for line_number, line in enumerate(fp, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = decoder.decode(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"line {line_number}: invalid json: {e}") from e
+        yield dns_record_from_export(record)
@@ -0,0 +1,134 @@
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+
+from pkb_client.client.dns import DNSRecord
+from pkb_client.client.export import write_file_atomic
+
+
+def record_fingerprint(record: DNSRecord) -> str:
+    """
+    Compute the fingerprint of a single DNS record.
+
+    :param record: the DNS record
+    :return: the hex encoded SHA-256 hash of the canonical json representation of the DNS record
+    """
+
+    data = json.dumps(record.to_dict(), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def zone_fingerprint(dns_records: Iterable[DNSRecord]) -> str:
+    """
+    Compute the fingerprint of the DNS records of a zone. The fingerprint does not depend on the order of the
+    DNS records, but changes if any DNS record is added, removed or changed.
+
+    :param dns_records: the DNS records of the zone
+    :return: the hex encoded SHA-256 hash of the sorted fingerprints of the DNS records
+    """
+
+    digest = hashlib.sha256()
+    for fingerprint in sorted(record_fingerprint(record) for record in dns_records):
+        digest.update(fingerprint.encode("ascii"))
+    return digest.hexdigest()
+
+
+class FingerprintIndex:
+    """
+    Local index of the zone fingerprints of an account from the last run of a job, so the job can skip all domains
+    whose DNS records did not change since then.
+
+    The index is a Merkle-style hash list: the root fingerprint is computed from the fingerprints of all zones,
+    so a single comparison tells whether anything in the account changed. The index is saved as json file.
+    """
+
+    def __init__(self, path: Union[Path, str]) -> None:
+        """
+        Creates a new FingerprintIndex object and loads the index file if it exists.
+
+        :param path: the path of the json index file
+        """
+
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._fingerprints: Dict[str, str] = {}
+        if self.path.exists():
+            with open(self.path, "r") as f:
+                self._fingerprints = json.load(f)["zones"]
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def __contains__(self, domain: str) -> bool:
+        return domain in self._fingerprints
+
+    @property
+    def root(self) -> str:
+        """
+        The fingerprint of all zones of the index.
+        """
+
+        with self._lock:
+            leaves = sorted(self._fingerprints.items())
+        digest = hashlib.sha256()
+        for domain, fingerprint in leaves:
+            digest.update(f"{domain}:{fingerprint}\n".encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, domain: str) -> Optional[str]:
+        """
+        Get the fingerprint of a zone from the last run.
+
+        :param domain: the domain of the zone
+        :return: the fingerprint or None if the zone is not indexed
+        """
+
+        with self._lock:
+            return self._fingerprints.get(domain)
+
+    def is_unchanged(self, domain: str, fingerprint: str) -> bool:
+        """
+        Check whether a zone has the same fingerprint as in the last run.
+
+        :param domain: the domain of the zone
+        :param fingerprint: the current fingerprint of the zone, see :func:`zone_fingerprint`
+        :return: True if the zone is indexed with the same fingerprint
+        """
+
+        return self.get(domain) == fingerprint
+
+    def update(self, domain: str, fingerprint: str) -> None:
+        """
+        Set the fingerprint of a zone. The change is written to the index file by :meth:`save`.
+
+        :param domain: the domain of the zone
+        :param fingerprint: the fingerprint of the zone
+        """
+
+        with self._lock:
+            self._fingerprints[domain] = fingerprint
+
+    def remove(self, domain: str) -> None:
+        """
+        Remove a zone from the index, so it is processed again by the next run.
+
+        :param domain: the domain of the zone
+        """
+
+        with self._lock:
+            self._fingerprints.pop(domain, None)
+
+    def save(self) -> None:
+        """
+        Write the index atomically to the index file.
+        """
+
+        root = self.root
+        with self._lock:
+            content = json.dumps(
+                {"root": root, "zones": self._fingerprints}, indent=4, sort_keys=True
+            )
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_file_atomic(self.path, content)
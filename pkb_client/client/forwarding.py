@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from enum import Enum
+from typing import Any
 
 
 class URLForwardingType(str, Enum):
@@ -15,3 +16,21 @@ class URLForwarding:
     type: URLForwardingType
     include_path: bool
     wildcard: bool
+
+    @staticmethod
+    def from_dict(d: dict[str, Any]) -> "URLForwarding":
+        """
+        Create a URLForwarding instance from the dictionary representation of the API.
+
+        :param d: Dictionary containing URL forwarding data.
+        :return: URLForwarding instance.
+        """
+
+        return URLForwarding(
+            id=d["id"],
+            subdomain=d["subdomain"],
+            location=d["location"],
+            type=URLForwardingType[d["type"]],
+            include_path=d["includePath"] == "yes",
+            wildcard=d["wildcard"] == "yes",
+        )
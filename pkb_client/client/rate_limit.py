@@ -0,0 +1,377 @@
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Tuple, TypeVar, Union
+
+from pkb_client.client.dispatch import (
+    RATE_LIMIT_MESSAGE_PATTERN,
+    APIRequest,
+    APIResponse,
+    Handler,
+    endpoint_group,
+)
+from pkb_client.client.domain import DomainCheckRateLimit
+
+if TYPE_CHECKING:
+    import sqlite3
+
+logger = logging.getLogger("pkb_client")
+
+T = TypeVar("T")
+
+
+@dataclass
+class TokenBucket:
+    # The maximum number of API calls which can be made in a burst.
+    capacity: float
+
+    # The number of seconds in which the whole capacity is refilled.
+    period: float
+
+    # The currently available API calls, negative if callers are queued.
+    tokens: float
+
+    # The time of the last update of the available API calls, measured by the clock of the rate limiter.
+    updated: float
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / self.period
+
+    def refill(self, now: float) -> None:
+        if now > self.updated:
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+        # the clock can go backwards, e.g. the wall clock is adjusted, in this case the refill starts again from now,
+        # otherwise the bucket would not be refilled until the clock reaches the old time again
+        self.updated = now
+
+    def reserve(self, now: float) -> float:
+        """
+        Reserve one API call.
+
+        :param now: the current time
+        :return: the time in seconds the caller has to wait until the reserved API call can be made
+        """
+
+        self.refill(now)
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+
+class RateLimitBackend(ABC):
+    """
+    Storage of the token buckets of a :class:`RateLimiter`.
+    """
+
+    # The default clock of the rate limiters using the backend, the time of the updates of the buckets is stored
+    # with this clock.
+    clock: Callable[[], float] = staticmethod(time.monotonic)
+
+    @abstractmethod
+    def transaction(
+        self,
+        key: str,
+        func: Callable[[Optional[TokenBucket]], Tuple[Optional[TokenBucket], T]],
+    ) -> T:
+        """
+        Atomically read, modify and write the token bucket of an API method.
+
+        :param key: the API method, e.g. "domain/checkDomain"
+        :param func: function which receives the stored bucket (None if no bucket is stored) and returns
+                     the bucket to store (None to keep the stored bucket unchanged) and the result of the transaction
+        :return: the result of the function
+        """
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """
+    Stores the token buckets in memory, shared by all threads of the process.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def transaction(
+        self,
+        key: str,
+        func: Callable[[Optional[TokenBucket]], Tuple[Optional[TokenBucket], T]],
+    ) -> T:
+        with self._lock:
+            bucket, result = func(self._buckets.get(key))
+            if bucket is not None:
+                self._buckets[key] = bucket
+            return result
+
+
+class SQLiteRateLimitBackend(RateLimitBackend):
+    """
+    Stores the token buckets in a SQLite database file, so that all processes on the same host which use the same
+    file share the rate limits. The transactions are serialized by the database lock.
+
+    The buckets are refilled based on the wall clock, because the monotonic clock restarts with every reboot of the
+    host, but the database file is kept.
+    """
+
+    clock: Callable[[], float] = staticmethod(time.time)
+
+    def __init__(self, path: Union[Path, str], timeout: float = 30.0) -> None:
+        """
+        Creates a new SQLiteRateLimitBackend object.
+
+        :param path: the path of the SQLite database file, created if it does not exist
+        :param timeout: the time in seconds to wait for the database lock
+        """
+
+        self.path = Path(path)
+        self.timeout = timeout
+        self._local = threading.local()
+
+        connection = self._connection()
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS buckets ("
+            "key TEXT PRIMARY KEY, capacity REAL, period REAL, tokens REAL, updated REAL)"
+        )
+
+    def _connection(self) -> "sqlite3.Connection":
+        # imported on use, so the in-memory backend does not load sqlite3
+        import sqlite3
+
+        # SQLite connections can not be shared between threads
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    def transaction(
+        self,
+        key: str,
+        func: Callable[[Optional[TokenBucket]], Tuple[Optional[TokenBucket], T]],
+    ) -> T:
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute(
+                "SELECT capacity, period, tokens, updated FROM buckets WHERE key = ?",
+                (key,),
+            ).fetchone()
+            bucket, result = func(TokenBucket(*row) if row is not None else None)
+            if bucket is not None:
+                connection.execute(
+                    "INSERT OR REPLACE INTO buckets (key, capacity, period, tokens, updated) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (
+                        key,
+                        bucket.capacity,
+                        bucket.period,
+                        bucket.tokens,
+                        bucket.updated,
+                    ),
+                )
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+        return result
+
+
+class RateLimiter:
+    """
+    Client side rate limiter with one token bucket per API method.
+
+    The limits are learned from the API itself: from the rate limit information returned by the API
+    (e.g. :class:`DomainCheckRateLimit` of the domain check) and from the messages of rate limit errors.
+    Callers which would exceed a known limit are blocked until the API call can be made.
+
+    The token buckets are stored in a :class:`RateLimitBackend`. With a shared backend like
+    :class:`SQLiteRateLimitBackend` multiple processes using the same API key stay together under the limits.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, Tuple[int, float]]] = None,
+        default_limit: Optional[Tuple[int, float]] = None,
+        backend: Optional[RateLimitBackend] = None,
+        clock: Optional[Callable[[], float]] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        Creates a new RateLimiter object.
+
+        :param limits: known limits per API method (e.g. "domain/checkDomain") as tuple of the number of
+                       API calls and the period in seconds
+        :param default_limit: the limit for API methods without known limit, None for no limit
+        :param backend: the storage of the token buckets, defaults to an in-memory storage for this process
+        :param clock: clock function used to refill the buckets, defaults to the clock of the backend
+        :param sleep: function used to block the callers
+        """
+
+        self.default_limit = default_limit
+        self.backend = backend if backend is not None else MemoryRateLimitBackend()
+        self._clock = clock if clock is not None else self.backend.clock
+        self._sleep = sleep
+        for key, (limit, period) in (limits or {}).items():
+            self.set_limit(key, limit, period)
+
+    def set_limit(
+        self, key: str, limit: int, period: float, used: Optional[int] = None
+    ) -> None:
+        """
+        Set the limit of an API method.
+
+        :param key: the API method, e.g. "domain/checkDomain"
+        :param limit: the number of API calls allowed per period
+        :param period: the period in seconds
+        :param used: the number of API calls already used in the current period if known
+        """
+
+        if limit < 1 or period <= 0:
+            raise ValueError("limit and period must be positive")
+
+        now = self._clock()
+
+        def update(bucket: Optional[TokenBucket]):
+            if bucket is None:
+                bucket = TokenBucket(limit, period, limit, now)
+            else:
+                bucket.refill(now)
+                bucket.capacity = limit
+                bucket.period = period
+                bucket.tokens = min(bucket.tokens, limit)
+            if used is not None:
+                bucket.tokens = min(bucket.tokens, limit - used)
+            return bucket, None
+
+        self.backend.transaction(key, update)
+        logger.debug(f"rate limit of {key}: {limit} calls per {period} seconds")
+
+    def calibrate(self, key: str, rate_limit: DomainCheckRateLimit) -> None:
+        """
+        Set the limit of an API method from the rate limit information returned by the API.
+
+        :param key: the API method, e.g. "domain/checkDomain"
+        :param rate_limit: the rate limit information returned by the API
+        """
+
+        self.set_limit(key, rate_limit.limit, rate_limit.ttl, int(rate_limit.used))
+
+    def get_limit(self, key: str) -> Optional[Tuple[int, float]]:
+        """
+        Get the currently known limit of an API method.
+
+        :param key: the API method, e.g. "domain/checkDomain"
+        :return: the number of API calls and the period in seconds or None if no limit is known
+        """
+
+        def read(bucket: Optional[TokenBucket]):
+            if bucket is None:
+                return None, self.default_limit
+            return None, (int(bucket.capacity), bucket.period)
+
+        return self.backend.transaction(key, read)
+
+    def reserve(self, key: str) -> float:
+        """
+        Reserve one API call without blocking.
+
+        :param key: the API method, e.g. "domain/checkDomain"
+        :return: the time in seconds the caller has to wait until the reserved API call can be made
+        """
+
+        now = self._clock()
+
+        def reserve(bucket: Optional[TokenBucket]):
+            if bucket is None:
+                if self.default_limit is None:
+                    return None, 0.0
+                limit, period = self.default_limit
+                bucket = TokenBucket(limit, period, limit, now)
+            return bucket, bucket.reserve(now)
+
+        return self.backend.transaction(key, reserve)
+
+    def acquire(self, key: str) -> None:
+        """
+        Block until an API call of the API method can be made.
+
+        :param key: the API method, e.g. "domain/checkDomain"
+        """
+
+        wait = self.reserve(key)
+        if wait > 0:
+            logger.debug(f"rate limit of {key} reached, waiting {wait:.2f} seconds")
+            self._sleep(wait)
+
+    def exhaust(self, key: str) -> None:
+        """
+        Mark all API calls of the current period as used, e.g. after the API rejected a call due to the rate limit.
+
+        :param key: the API method, e.g. "domain/checkDomain"
+        """
+
+        now = self._clock()
+
+        def exhaust(bucket: Optional[TokenBucket]):
+            if bucket is not None:
+                bucket.refill(now)
+                bucket.tokens = min(bucket.tokens, 0)
+            return bucket, None
+
+        self.backend.transaction(key, exhaust)
+
+
+class RateLimitMiddleware:
+    """
+    Middleware which blocks API calls until they are allowed by the rate limiter and feeds the
+    rate limit information of the responses back into the rate limiter.
+    """
+
+    def __init__(self, rate_limiter: RateLimiter) -> None:
+        self.rate_limiter = rate_limiter
+
+    def __call__(self, request: APIRequest, call_next: Handler) -> APIResponse:
+        key = endpoint_group(request.endpoint)
+        self.rate_limiter.acquire(key)
+
+        response = call_next(request)
+        self._learn(key, response)
+        return response
+
+    def _learn(self, key: str, response: APIResponse) -> None:
+        """
+        Feed the rate limit information of a response back into the rate limiter.
+
+        :param key: the API method, e.g. "domain/checkDomain"
+        :param response: the response of the API call
+        """
+
+        data = response.data or {}
+        limits = data.get("limits")
+        if isinstance(limits, dict):
+            try:
+                self.rate_limiter.set_limit(
+                    key,
+                    int(limits["limit"]),
+                    float(limits["TTL"]),
+                    int(limits["used"]),
+                )
+            except (KeyError, TypeError, ValueError):
+                logger.debug(f"ignoring invalid rate limit information of {key}")
+
+        if response.rate_limited:
+            match = RATE_LIMIT_MESSAGE_PATTERN.search(str(data.get("message", "")))
+            if match:
+                used, limit, period = (int(g) for g in match.groups())
+                self.rate_limiter.set_limit(key, limit, period, used)
+            self.rate_limiter.exhaust(key)
@@ -0,0 +1,113 @@
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+from pkb_client.client.dns import DNS_RECORDS_WITH_PRIORITY, DNSRecord
+
+
+@dataclass
+class ReconcilePlan:
+    # The desired DNS records which have to be created.
+    creates: List[DNSRecord] = field(default_factory=list)
+
+    # The existing DNS records which have to be changed, paired with their desired state.
+    updates: List[Tuple[DNSRecord, DNSRecord]] = field(default_factory=list)
+
+    # The existing DNS records which have to be deleted.
+    deletes: List[DNSRecord] = field(default_factory=list)
+
+    @property
+    def changes(self) -> int:
+        """
+        The number of API calls required to apply the plan.
+        """
+
+        return len(self.creates) + len(self.updates) + len(self.deletes)
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normalize a fully qualified DNS record name for comparisons.
+
+    :param name: the fully qualified name, with or without trailing dot
+    :return: the lower case name without trailing dot
+    """
+
+    return name.lower().rstrip(".")
+
+
+def subdomain_of(name: str, domain: str) -> str:
+    """
+    Get the subdomain part of a DNS record name as used by the Porkbun API.
+
+    :param name: the fully qualified name of the DNS record, a name without the domain is returned unchanged
+    :param domain: the domain of the DNS record
+    :return: the subdomain, empty for the domain itself
+    """
+
+    name = normalize_name(name)
+    domain = normalize_name(domain)
+    if name == domain:
+        return ""
+    return name.removesuffix(f".{domain}")
+
+
+def _rrset_key(record: DNSRecord) -> Tuple[str, str]:
+    return str(record.type), normalize_name(record.name)
+
+
+def _identity_key(record: DNSRecord) -> Tuple[str, str, Optional[int], str]:
+    # the API returns a prio for all records, but it is only meaningful for some record types
+    prio = record.prio if record.type in DNS_RECORDS_WITH_PRIORITY else None
+    return str(record.type), normalize_name(record.name), prio, record.content
+
+
+def compute_reconcile_plan(
+    desired: Iterable[DNSRecord], existing: Iterable[DNSRecord]
+) -> ReconcilePlan:
+    """
+    Compute the minimal changes to turn the existing DNS records of a domain into the desired DNS records.
+
+    DNS records are identified by the record type, name, prio (if supported by the record type) and content,
+    so multiple records of the same name and type (e.g. multiple A records) are matched one by one. Identical
+    records are kept, records which only differ in the TTL are updated. The remaining desired records are paired
+    with the remaining existing records of the same type and name to update them instead of deleting and creating
+    them. All other records are created or deleted. The ids of the desired records are ignored.
+
+    :param desired: the desired DNS records with fully qualified names
+    :param existing: the existing DNS records of the domain as returned by the API
+    :return: the plan of the required changes
+    """
+
+    plan = ReconcilePlan()
+
+    existing_by_identity: Dict[tuple, Deque[DNSRecord]] = defaultdict(deque)
+    for record in existing:
+        existing_by_identity[_identity_key(record)].append(record)
+
+    unmatched: List[DNSRecord] = []
+    for record in desired:
+        candidates = existing_by_identity.get(_identity_key(record))
+        if candidates:
+            current = candidates.popleft()
+            if current.ttl != record.ttl:
+                plan.updates.append((current, record))
+        else:
+            unmatched.append(record)
+
+    existing_by_rrset: Dict[tuple, Deque[DNSRecord]] = defaultdict(deque)
+    for candidates in existing_by_identity.values():
+        for record in candidates:
+            existing_by_rrset[_rrset_key(record)].append(record)
+
+    for record in unmatched:
+        candidates = existing_by_rrset.get(_rrset_key(record))
+        if candidates:
+            plan.updates.append((candidates.popleft(), record))
+        else:
+            plan.creates.append(record)
+
+    for candidates in existing_by_rrset.values():
+        plan.deletes.extend(candidates)
+
+    return plan
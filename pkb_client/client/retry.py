@@ -0,0 +1,192 @@
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, FrozenSet, Mapping, Optional
+
+from pkb_client.client.dispatch import APIRequest, APIResponse, Handler
+
+logger = logging.getLogger("pkb_client")
+
+
+@dataclass
+class RetryPolicy:
+    # The maximum number of attempts per API call, including the first one.
+    max_attempts: int = 3
+
+    # The base delay in seconds, the delay is doubled with every retry.
+    backoff_factor: float = 0.5
+
+    # The upper bound of the delay in seconds between two attempts.
+    max_backoff: float = 30.0
+
+    # The fraction of the delay which is randomized to spread out retries of concurrent clients.
+    jitter: float = 0.5
+
+    # The HTTP status codes which are considered as transient failures.
+    retry_status_codes: FrozenSet[int] = field(
+        default_factory=lambda: frozenset({429, 500, 502, 503, 504})
+    )
+
+    # Whether the delay requested by the API with a Retry-After header should be used.
+    respect_retry_after: bool = True
+
+    # Whether non-idempotent API calls (e.g. creating DNS records) should also be retried
+    # if it is unknown whether the API has processed the failed attempt.
+    retry_non_idempotent: bool = False
+
+    def __post_init__(self):
+        if self.max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        if not 0 <= self.jitter <= 1:
+            raise ValueError("jitter must be between 0 and 1")
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Get the delay before the next attempt.
+
+        :param attempt: the number of the failed attempt, starting with 1
+        :return: the delay in seconds
+        """
+
+        delay = min(self.max_backoff, self.backoff_factor * 2 ** (attempt - 1))
+        return delay * (1 - self.jitter) + random.uniform(0, delay * self.jitter)
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """
+    Parse the Retry-After header of a response.
+
+    :param headers: the headers of the response
+    :return: the delay in seconds or None if the header is missing or invalid
+    """
+
+    value = headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_date.tzinfo is None:
+        retry_date = retry_date.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_date - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryMiddleware:
+    """
+    Middleware which repeats API calls after transient failures with exponential backoff and jitter.
+
+    Failures where the API has certainly not processed the call (connection could not be established,
+    rate limit exceeded) are retried for all API calls. Other transient failures (server errors, read timeouts,
+    broken connections) are only retried for idempotent API calls, unless the policy allows it for all API calls.
+    """
+
+    def __init__(
+        self,
+        policy: RetryPolicy,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.policy = policy
+        self._sleep = sleep
+
+    def __call__(self, request: APIRequest, call_next: Handler) -> APIResponse:
+        # imported on use, so the retry policy can be used without requests, e.g. by the async client
+        import requests
+
+        attempt = 1
+        while True:
+            try:
+                response = call_next(request)
+            except requests.exceptions.RequestException as e:
+                delay = self._exception_delay(request, e, attempt)
+                if delay is None:
+                    raise
+            else:
+                delay = self._response_delay(request, response, attempt)
+                if delay is None:
+                    return response
+
+            self._sleep(delay)
+            attempt += 1
+
+    def _exception_delay(
+        self, request: APIRequest, e: Exception, attempt: int
+    ) -> Optional[float]:
+        """
+        Decide whether the API call is retried after the transport failed.
+
+        :param request: the failed API call
+        :param e: the exception of the transport
+        :param attempt: the number of the failed attempt, starting with 1
+        :return: the delay in seconds before the next attempt or None if the API call is not retried
+        """
+
+        if attempt >= self.policy.max_attempts or not self._retry_exception(request, e):
+            return None
+        delay = self.policy.backoff(attempt)
+        self._log_retry(request, type(e).__name__, attempt, delay)
+        return delay
+
+    def _response_delay(
+        self, request: APIRequest, response: APIResponse, attempt: int
+    ) -> Optional[float]:
+        """
+        Decide whether the API call is retried after the response of the API.
+
+        :param request: the API call
+        :param response: the response of the API
+        :param attempt: the number of the attempt, starting with 1
+        :return: the delay in seconds before the next attempt or None if the API call is not retried
+        """
+
+        if attempt >= self.policy.max_attempts or not self._retry_response(
+            request, response
+        ):
+            return None
+        delay = None
+        if self.policy.respect_retry_after:
+            delay = parse_retry_after(response.headers)
+        if delay is None:
+            delay = self.policy.backoff(attempt)
+        self._log_retry(request, f"HTTP {response.status_code}", attempt, delay)
+        return delay
+
+    def _log_retry(
+        self, request: APIRequest, reason: str, attempt: int, delay: float
+    ) -> None:
+        logger.debug(
+            f"{request.endpoint} failed ({reason}), retry {attempt}/{self.policy.max_attempts - 1} "
+            f"in {delay:.2f} seconds"
+        )
+
+    def _may_retry(self, request: APIRequest) -> bool:
+        return request.idempotent or self.policy.retry_non_idempotent
+
+    def _retry_exception(self, request: APIRequest, e: Exception) -> bool:
+        import requests
+
+        if isinstance(e, requests.exceptions.ConnectTimeout):
+            # the connection was never established, so the request was not sent
+            return True
+        if isinstance(
+            e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+        ):
+            return self._may_retry(request)
+        return False
+
+    def _retry_response(self, request: APIRequest, response: APIResponse) -> bool:
+        if response.rate_limited:
+            # the API rejected the call, so it was not processed
+            return True
+        if response.ok:
+            return False
+        if response.status_code in self.policy.retry_status_codes:
+            return self._may_retry(request)
+        return False
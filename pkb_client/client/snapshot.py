@@ -0,0 +1,290 @@
+import gzip
+import hashlib
+import io
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Union
+
+from pkb_client.client.dns import DNSRecord
+from pkb_client.client.export import open_file_atomic, read_ndjson, write_ndjson
+
+
+@dataclass
+class Snapshot:
+    # The id of the snapshot, the ids are sortable by the creation time.
+    id: str
+
+    # The creation time of the snapshot.
+    created: datetime
+
+    # The content hashes of the saved DNS records by domain.
+    zones: Dict[str, str] = field(default_factory=dict)
+
+    # The optional description of the snapshot.
+    label: Optional[str] = None
+
+
+def zone_digest(dns_records: Iterable[DNSRecord]) -> str:
+    """
+    Compute the content hash of the DNS records of a zone, which does not depend on the order of the records.
+
+    :param dns_records: the DNS records of the zone
+    :return: the hex encoded SHA-256 hash of the canonical ndjson serialization of the DNS records
+    """
+
+    return hashlib.sha256(_canonical_ndjson(dns_records)).hexdigest()
+
+
+def _canonical_ndjson(dns_records: Iterable[DNSRecord]) -> bytes:
+    records = sorted(
+        dns_records,
+        key=lambda r: (
+            str(r.type),
+            r.name,
+            r.content,
+            r.prio if r.prio is not None else -1,
+            r.ttl,
+            r.notes,
+            r.id,
+        ),
+    )
+    buffer = io.StringIO()
+    write_ndjson(buffer, records)
+    return buffer.getvalue().encode("utf-8")
+
+
+class SnapshotStore:
+    """
+    Store for point-in-time snapshots of the DNS records of multiple domains.
+
+    The DNS records of every domain are saved gzip compressed as ndjson file named by its content hash, so unchanged
+    zones are saved only once across all snapshots. A snapshot is a small json manifest which maps the domains to
+    the content hashes of their DNS records.
+
+    Directory layout::
+
+        <path>/snapshots/<snapshot id>.json
+        <path>/zones/<first two hash characters>/<hash>.ndjson.gz
+    """
+
+    def __init__(
+        self,
+        path: Union[Path, str],
+        compression_level: int = 9,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ) -> None:
+        """
+        Creates a new SnapshotStore object.
+
+        :param path: the directory of the store, created if it does not exist
+        :param compression_level: the gzip compression level of the saved zones
+        :param clock: function which returns the current time used for the snapshot ids
+        """
+
+        self.path = Path(path)
+        self.compression_level = compression_level
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._snapshots_dir = self.path / "snapshots"
+        self._zones_dir = self.path / "zones"
+        self._snapshots_dir.mkdir(parents=True, exist_ok=True)
+        self._zones_dir.mkdir(parents=True, exist_ok=True)
+
+    def zone_path(self, digest: str) -> Path:
+        """
+        Get the path of the saved DNS records with the given content hash.
+
+        :param digest: the content hash of the DNS records
+        :return: the path of the gzip compressed ndjson file
+        """
+
+        return self._zones_dir / digest[:2] / f"{digest}.ndjson.gz"
+
+    def save_zone(self, dns_records: Iterable[DNSRecord]) -> str:
+        """
+        Save the DNS records of a zone, if DNS records with the same content are not already saved.
+
+        :param dns_records: the DNS records of the zone
+        :return: the content hash of the DNS records
+        """
+
+        content = _canonical_ndjson(dns_records)
+        digest = hashlib.sha256(content).hexdigest()
+        zone_path = self.zone_path(digest)
+        if not zone_path.exists():
+            zone_path.parent.mkdir(exist_ok=True)
+            with open_file_atomic(zone_path, "wb") as f:
+                # mtime 0 makes the compressed file only depend on the content
+                f.write(gzip.compress(content, self.compression_level, mtime=0))
+        return digest
+
+    def create_snapshot(
+        self, zones: Dict[str, Iterable[DNSRecord]], label: Optional[str] = None
+    ) -> Snapshot:
+        """
+        Create a snapshot of the DNS records of multiple domains.
+
+        :param zones: the DNS records by domain
+        :param label: an optional description of the snapshot
+        :return: the created snapshot
+        """
+
+        # the lock prevents that the saved DNS records are removed as unused before the snapshot is created
+        with self._lock:
+            digests = {
+                domain: self.save_zone(dns_records)
+                for domain, dns_records in zones.items()
+            }
+
+            created = self._clock()
+            snapshot_id = created.strftime("%Y%m%dT%H%M%S%fZ")
+            suffix = 0
+            while self._manifest_path(snapshot_id).exists():
+                suffix += 1
+                snapshot_id = f"{created.strftime('%Y%m%dT%H%M%S%fZ')}-{suffix}"
+
+            snapshot = Snapshot(snapshot_id, created, digests, label)
+            with open_file_atomic(self._manifest_path(snapshot_id)) as f:
+                json.dump(
+                    {
+                        "id": snapshot.id,
+                        "created": snapshot.created.isoformat(),
+                        "label": snapshot.label,
+                        "zones": snapshot.zones,
+                    },
+                    f,
+                    sort_keys=True,
+                )
+        return snapshot
+
+    def list_snapshot_ids(self) -> List[str]:
+        """
+        Get the ids of all snapshots without reading the snapshots.
+
+        :return: the snapshot ids sorted from the oldest to the newest snapshot
+        """
+
+        return sorted(path.stem for path in self._snapshots_dir.glob("*.json"))
+
+    def list_snapshots(self, domain: Optional[str] = None) -> List[Snapshot]:
+        """
+        Get all snapshots.
+
+        :param domain: only return the snapshots which contain the DNS records of this domain
+        :return: the snapshots sorted from the oldest to the newest snapshot
+        """
+
+        snapshots = [
+            self.get_snapshot(snapshot_id) for snapshot_id in self.list_snapshot_ids()
+        ]
+        if domain is not None:
+            snapshots = [snapshot for snapshot in snapshots if domain in snapshot.zones]
+        return snapshots
+
+    def get_snapshot(self, snapshot_id: Optional[str] = None) -> Snapshot:
+        """
+        Get a snapshot.
+
+        :param snapshot_id: the id of the snapshot, None for the newest snapshot
+        :return: the snapshot
+        """
+
+        if snapshot_id is None:
+            snapshot_ids = self.list_snapshot_ids()
+            if not snapshot_ids:
+                raise KeyError("no snapshots found")
+            snapshot_id = snapshot_ids[-1]
+
+        try:
+            with open(self._manifest_path(snapshot_id), "r") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            raise KeyError(f"snapshot '{snapshot_id}' not found") from None
+        return Snapshot(
+            manifest["id"],
+            datetime.fromisoformat(manifest["created"]),
+            manifest["zones"],
+            manifest.get("label"),
+        )
+
+    def get_zone_path(self, domain: str, snapshot_id: Optional[str] = None) -> Path:
+        """
+        Get the path of the saved DNS records of a domain in a snapshot, which can be restored with
+        :meth:`PKBClient.import_dns_records` and the ndjson format.
+
+        :param domain: the domain
+        :param snapshot_id: the id of the snapshot, None for the newest snapshot which contains the domain
+        :return: the path of the gzip compressed ndjson file
+        """
+
+        if snapshot_id is None:
+            snapshots = self.list_snapshots(domain)
+            if not snapshots:
+                raise KeyError(f"no snapshot of '{domain}' found")
+            snapshot = snapshots[-1]
+        else:
+            snapshot = self.get_snapshot(snapshot_id)
+            if domain not in snapshot.zones:
+                raise KeyError(f"snapshot '{snapshot.id}' does not contain '{domain}'")
+        return self.zone_path(snapshot.zones[domain])
+
+    def load_zone(
+        self, domain: str, snapshot_id: Optional[str] = None
+    ) -> List[DNSRecord]:
+        """
+        Load the saved DNS records of a domain in a snapshot.
+
+        :param domain: the domain
+        :param snapshot_id: the id of the snapshot, None for the newest snapshot which contains the domain
+        :return: the DNS records
+        """
+
+        with gzip.open(self.get_zone_path(domain, snapshot_id), "rt") as f:
+            return list(read_ndjson(f))
+
+    def delete_snapshot(self, snapshot_id: str) -> None:
+        """
+        Delete a snapshot and the saved DNS records which are not used by any other snapshot.
+
+        :param snapshot_id: the id of the snapshot
+        """
+
+        try:
+            os.unlink(self._manifest_path(snapshot_id))
+        except FileNotFoundError:
+            raise KeyError(f"snapshot '{snapshot_id}' not found") from None
+        self._remove_unused_zones()
+
+    def prune(self, keep: int) -> List[str]:
+        """
+        Delete all snapshots except the newest ones and the saved DNS records which are no longer used.
+
+        :param keep: the number of newest snapshots to keep
+        :return: the ids of the deleted snapshots
+        """
+
+        if keep < 0:
+            raise ValueError("keep must not be negative")
+
+        snapshot_ids = self.list_snapshot_ids()
+        deleted = snapshot_ids[: max(len(snapshot_ids) - keep, 0)]
+        for snapshot_id in deleted:
+            os.unlink(self._manifest_path(snapshot_id))
+        self._remove_unused_zones()
+        return deleted
+
+    def _manifest_path(self, snapshot_id: str) -> Path:
+        return self._snapshots_dir / f"{snapshot_id}.json"
+
+    def _remove_unused_zones(self) -> None:
+        with self._lock:
+            used: Set[str] = set()
+            for snapshot in self.list_snapshots():
+                used.update(snapshot.zones.values())
+            for zone_path in self._zones_dir.glob("*/*.ndjson.gz"):
+                if zone_path.name.split(".")[0] not in used:
+                    os.unlink(zone_path)
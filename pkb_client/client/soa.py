@@ -0,0 +1,227 @@
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Sequence
+
+from pkb_client.client.cache import TTLCache
+from pkb_client.client.dns import DNSRecord, DNSRecordType
+
+if TYPE_CHECKING:
+    import dns.resolver
+
+logger = logging.getLogger("pkb_client")
+
+
+@dataclass(frozen=True)
+class SOARecord:
+    # The primary nameserver of the zone.
+    mname: str
+
+    # The mailbox of the person responsible for the zone, with the @ replaced by a dot.
+    rname: str
+
+    # The serial number, refresh, retry and expire time and the negative caching TTL of the zone.
+    serial: int
+    refresh: int
+    retry: int
+    expire: int
+    minimum: int
+
+    def __str__(self):
+        return f"{self.mname} {self.rname} ({self.serial} {self.refresh} {self.retry} {self.expire} {self.minimum})"
+
+
+class SOAProvider(ABC):
+    """
+    Base class of the providers of the SOA record written to BIND exports.
+    """
+
+    @abstractmethod
+    def get_soa(
+        self, domain: str, dns_records: Sequence[DNSRecord] = ()
+    ) -> Optional[SOARecord]:
+        """
+        Get the SOA record of a domain.
+
+        :param domain: the domain
+        :param dns_records: the DNS records of the domain, which can be used to derive the SOA record
+        :return: the SOA record or None if the domain has no SOA record
+        """
+
+    def resolve_many(
+        self, domains: Iterable[str], max_workers: int = 10
+    ) -> Dict[str, SOARecord]:
+        """
+        Get the SOA records of multiple domains concurrently.
+
+        :param domains: the domains
+        :param max_workers: the maximum number of domains resolved at the same time
+        :return: the SOA records by domain, domains whose SOA record could not be retrieved are missing
+        """
+
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        domains = list(domains)
+
+        def get_soa(domain: str) -> Optional[SOARecord]:
+            try:
+                return self.get_soa(domain)
+            except Exception as e:
+                logger.warning(f"SOA lookup of {domain} failed: {e}")
+                return None
+
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, max(len(domains), 1)),
+            thread_name_prefix="pkb_client_soa",
+        ) as executor:
+            soa_records = executor.map(get_soa, domains)
+            return {
+                domain: soa_record
+                for domain, soa_record in zip(domains, soa_records, strict=True)
+                if soa_record is not None
+            }
+
+
+class ResolverSOAProvider(SOAProvider):
+    """
+    Provider which resolves the SOA records with DNS queries. The results are cached across domains.
+    """
+
+    def __init__(
+        self,
+        nameservers: Optional[List[str]] = None,
+        timeout: float = 5.0,
+        max_age: float = 3600,
+        max_size: int = 1024,
+        fallback: Optional[SOAProvider] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Creates a new ResolverSOAProvider object.
+
+        :param nameservers: the IP addresses of the nameservers to query, None to use the nameservers of the system
+        :param timeout: the maximum time in seconds for the resolution of one SOA record
+        :param max_age: the time in seconds the resolved SOA records are cached
+        :param max_size: the maximum number of cached SOA records
+        :param fallback: the provider used if the resolution fails, None to raise the error instead
+        :param clock: monotonic clock function used for the cache expiration
+        """
+
+        self.nameservers = nameservers
+        self.timeout = timeout
+        self.fallback = fallback
+        self._cache: TTLCache[str, SOARecord] = TTLCache(max_age, max_size, clock)
+        self._resolver: Optional["dns.resolver.Resolver"] = None
+        self._resolver_lock = threading.Lock()
+
+    @property
+    def resolver(self) -> "dns.resolver.Resolver":
+        """
+        The resolver used for the DNS queries, created on first use, so dnspython is only imported if needed.
+        """
+
+        with self._resolver_lock:
+            if self._resolver is None:
+                import dns.resolver
+
+                resolver = dns.resolver.Resolver(configure=self.nameservers is None)
+                if self.nameservers is not None:
+                    resolver.nameservers = self.nameservers
+                resolver.lifetime = self.timeout
+                self._resolver = resolver
+            return self._resolver
+
+    def get_soa(
+        self, domain: str, dns_records: Sequence[DNSRecord] = ()
+    ) -> Optional[SOARecord]:
+        domain = domain.lower().rstrip(".")
+        soa_record = self._cache.get(domain)
+        if soa_record is not None:
+            return soa_record
+
+        import dns.exception
+
+        try:
+            answer = self.resolver.resolve(domain, "SOA")
+        except dns.exception.DNSException as e:
+            if self.fallback is None:
+                raise
+            logger.warning(f"SOA lookup of {domain} failed, using fallback: {e}")
+            return self.fallback.get_soa(domain, dns_records)
+
+        rdata = answer[0]
+        soa_record = SOARecord(
+            str(rdata.mname),
+            str(rdata.rname),
+            rdata.serial,
+            rdata.refresh,
+            rdata.retry,
+            rdata.expire,
+            rdata.minimum,
+        )
+        self._cache.set(domain, soa_record)
+        return soa_record
+
+
+class OfflineSOAProvider(SOAProvider):
+    """
+    Provider which synthesises the SOA records without any DNS queries. The primary nameserver is taken from
+    the NS records of the domain if available and the serial number is derived from the current date.
+    """
+
+    def __init__(
+        self,
+        mname: str = "curitiba.ns.porkbun.com.",
+        rname: Optional[str] = None,
+        refresh: int = 10800,
+        retry: int = 3600,
+        expire: int = 604800,
+        minimum: int = 3600,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Creates a new OfflineSOAProvider object.
+
+        :param mname: the primary nameserver used if the domain has no NS records
+        :param rname: the responsible mailbox, None to use hostmaster of the domain
+        :param refresh: the refresh time in seconds
+        :param retry: the retry time in seconds
+        :param expire: the expire time in seconds
+        :param minimum: the negative caching TTL in seconds
+        :param clock: clock function which returns the current unix time used for the serial number
+        """
+
+        self.mname = mname
+        self.rname = rname
+        self.refresh = refresh
+        self.retry = retry
+        self.expire = expire
+        self.minimum = minimum
+        self._clock = clock
+
+    def get_soa(
+        self, domain: str, dns_records: Sequence[DNSRecord] = ()
+    ) -> Optional[SOARecord]:
+        domain = domain.lower().rstrip(".")
+        mname = self.mname
+        for record in dns_records:
+            if record.type == DNSRecordType.NS:
+                mname = record.content.rstrip(".") + "."
+                break
+
+        # serial number in the common YYYYMMDDnn format
+        serial = int(time.strftime("%Y%m%d00", time.gmtime(self._clock())))
+
+        return SOARecord(
+            mname,
+            self.rname or f"hostmaster.{domain}.",
+            serial,
+            self.refresh,
+            self.retry,
+            self.expire,
+            self.minimum,
+        )
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Any
 
 
 @dataclass
@@ -11,3 +12,18 @@ class SSLCertBundle:
 
     # The public key.
     public_key: str
+
+    @staticmethod
+    def from_dict(d: dict[str, Any]) -> "SSLCertBundle":
+        """
+        Create a SSLCertBundle instance from the dictionary representation of the API.
+
+        :param d: Dictionary containing the SSL bundle data.
+        :return: SSLCertBundle instance.
+        """
+
+        return SSLCertBundle(
+            certificate_chain=d["certificatechain"],
+            private_key=d["privatekey"],
+            public_key=d["publickey"],
+        )
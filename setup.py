@@ -30,6 +30,7 @@ setup(
     packages=find_packages(),
     python_requires=">=3.10",
     install_requires=["setuptools>=39.0.1", "requests>=2.20.0", "dnspython~=2.7"],
+    extras_require={"async": ["httpx>=0.23.0"]},
     entry_points={
         "console_scripts": [
             "pkb-client = pkb_client.cli.cli:main",
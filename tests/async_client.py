@@ -0,0 +1,245 @@
+import asyncio
+import inspect
+import json
+import threading
+import unittest
+
+import httpx
+
+from pkb_client.client import (
+    API_ENDPOINT,
+    AsyncPKBClient,
+    PKBClient,
+    PKBClientException,
+)
+from pkb_client.client.async_client import AsyncRateLimitMiddleware
+from pkb_client.client.bulk import DNSMutation
+from pkb_client.client.dispatch import APIRequest, APIResponse
+from pkb_client.client.dns import DNSRecord, DNSRecordType
+from pkb_client.client.rate_limit import RateLimiter
+from pkb_client.client.retry import RetryPolicy
+from tests.helpers import api_dns_record
+
+# the methods of PKBClient which read or write local files
+LOCAL_FILE_METHODS = {
+    "export_dns_records",
+    "export_bind_dns_records",
+    "export_all_dns_records",
+    "import_dns_records",
+    "import_bind_dns_records",
+    "import_bind_directory",
+    "snapshot_dns_records",
+    "restore_dns_records_snapshot",
+}
+
+
+class TestAsyncClient(unittest.IsolatedAsyncioTestCase):
+    def _client(self, handler, **kwargs):
+        return AsyncPKBClient(
+            "key",
+            "secret",
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            **kwargs,
+        )
+
+    def test_api_parity(self):
+        for name, _ in inspect.getmembers(PKBClient, inspect.isfunction):
+            if name.startswith("_") or name == "close" or name in LOCAL_FILE_METHODS:
+                continue
+            with self.subTest(method=name):
+                self.assertTrue(hasattr(AsyncPKBClient, name))
+                method = getattr(AsyncPKBClient, name)
+                self.assertTrue(
+                    inspect.iscoroutinefunction(method)
+                    or inspect.isasyncgenfunction(method)
+                )
+                self.assertEqual(
+                    list(inspect.signature(getattr(PKBClient, name)).parameters),
+                    list(inspect.signature(method).parameters),
+                )
+
+    def test_invalid_max_concurrency(self):
+        with self.assertRaises(ValueError):
+            AsyncPKBClient("key", "secret", max_concurrency=0)
+
+    async def test_ping(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(
+                200, json={"status": "SUCCESS", "yourIp": "127.0.0.1"}
+            )
+
+        async with self._client(handler) as pkb_client:
+            ip_address = await pkb_client.ping()
+
+        self.assertEqual("127.0.0.1", ip_address)
+        self.assertEqual(str(requests[0].url), API_ENDPOINT + "ping")
+        self.assertEqual(
+            {"apikey": "key", "secretapikey": "secret"}, json.loads(requests[0].content)
+        )
+
+    async def test_concurrent_get_dns_records(self):
+        domains = [f"example{i}.com" for i in range(50)]
+        threads = threading.active_count()
+        in_flight = 0
+        max_in_flight = 0
+
+        async def handler(request):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            # the API calls are made on the event loop without worker threads
+            self.assertEqual(threads, threading.active_count())
+            domain = request.url.path.rsplit("/", 1)[1]
+            return httpx.Response(
+                200,
+                json={"status": "SUCCESS", "records": [api_dns_record("1", domain)]},
+            )
+
+        async with self._client(handler, max_concurrency=5) as pkb_client:
+            results = await asyncio.gather(
+                *(pkb_client.get_dns_records(domain) for domain in domains)
+            )
+
+        self.assertEqual(5, max_in_flight)
+        self.assertEqual(
+            [
+                [DNSRecord("1", domain, DNSRecordType.A, "127.0.0.1", 600, None, "")]
+                for domain in domains
+            ],
+            results,
+        )
+
+    async def test_coalesce_reads(self):
+        calls = 0
+
+        async def handler(request):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return httpx.Response(
+                200, json={"status": "SUCCESS", "records": [api_dns_record("1")]}
+            )
+
+        async with self._client(handler) as pkb_client:
+            first, second = await asyncio.gather(
+                pkb_client.get_dns_records("example.com"),
+                pkb_client.get_dns_records("example.com"),
+            )
+
+        self.assertEqual(1, calls)
+        self.assertEqual(first, second)
+
+    async def test_retry(self):
+        calls = 0
+
+        def handler(request):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise httpx.ConnectError("connection refused", request=request)
+            return httpx.Response(200, json={"status": "SUCCESS", "id": "123"})
+
+        async with self._client(
+            handler, retry_policy=RetryPolicy(backoff_factor=0)
+        ) as pkb_client:
+            record_id = await pkb_client.create_dns_record(
+                "example.com", DNSRecordType.A, "127.0.0.1"
+            )
+
+        self.assertEqual("123", record_id)
+        self.assertEqual(2, calls)
+
+    async def test_iter_domains(self):
+        def handler(request):
+            start = json.loads(request.content)["start"]
+            count = {0: 1000, 1000: 5}.get(start, 0)
+            return httpx.Response(
+                200,
+                json={
+                    "status": "SUCCESS",
+                    "domains": [
+                        {
+                            "domain": f"example{i}.com",
+                            "status": "ACTIVE",
+                            "tld": "com",
+                            "createDate": "2020-01-01 00:00:00",
+                            "expireDate": "2030-01-01 00:00:00",
+                            "securityLock": "1",
+                            "whoisPrivacy": "1",
+                            "autoRenew": 0,
+                            "notLocal": 0,
+                        }
+                        for i in range(start, start + count)
+                    ],
+                },
+            )
+
+        async with self._client(handler) as pkb_client:
+            domains = [domain.domain async for domain in pkb_client.iter_domains()]
+
+        self.assertEqual([f"example{i}.com" for i in range(1005)], domains)
+
+    async def test_apply_dns_mutations(self):
+        def handler(request):
+            if request.url.path.endswith("example.org/2"):
+                return httpx.Response(
+                    400, json={"status": "ERROR", "message": "Invalid record id"}
+                )
+            return httpx.Response(200, json={"status": "SUCCESS", "id": "3"})
+
+        async with self._client(handler) as pkb_client:
+            results = await pkb_client.apply_dns_mutations(
+                [
+                    DNSMutation.delete("example.org", "2"),
+                    DNSMutation.create("example.com", DNSRecordType.A, "127.0.0.1"),
+                    DNSMutation.delete("example.org", "1"),
+                ]
+            )
+
+        self.assertIsInstance(results[0].error, PKBClientException)
+        self.assertEqual("3", results[1].result)
+        self.assertTrue(results[2].skipped)
+
+    async def test_error(self):
+        def handler(request):
+            return httpx.Response(
+                400, json={"status": "ERROR", "message": "Invalid record id"}
+            )
+
+        async with self._client(handler) as pkb_client:
+            with self.assertRaises(PKBClientException):
+                await pkb_client.delete_dns_record("example.com", "123")
+
+
+class TestAsyncRateLimitMiddleware(unittest.IsolatedAsyncioTestCase):
+    async def test_wait(self):
+        now = 0.0
+        sleeps = []
+
+        async def sleep(seconds):
+            nonlocal now
+            sleeps.append(seconds)
+            now += seconds
+
+        middleware = AsyncRateLimitMiddleware(
+            RateLimiter(limits={"domain/checkDomain": (1, 10)}, clock=lambda: now),
+            sleep=sleep,
+        )
+
+        async def call_next(request):
+            return APIResponse(200, {"status": "SUCCESS"})
+
+        request = APIRequest("domain/checkDomain/example.com", "", read_only=True)
+        for _ in range(3):
+            await middleware(request, call_next)
+
+        self.assertEqual([10, 10], sleeps)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,17 @@
+import io
 import tempfile
 import unittest
 from importlib import resources
+from pathlib import Path
 
-from pkb_client.client.bind_file import BindFile, BindRecord, RecordClass
+from pkb_client.client.bind_file import (
+    BindFile,
+    BindRecord,
+    RecordClass,
+    parse_bind_directory,
+    parse_bind_files,
+    write_records,
+)
 from pkb_client.client.dns import DNSRecordType
 from tests import data
 
@@ -153,11 +162,11 @@ class TestBindFileParsing(unittest.TestCase):
         file_content = (
             "$ORIGIN test.com.\n"
             "$TTL 1234\n"
-            'test.com. 600 IN A "1.2.3.4"\n'
-            'sub.test.com. 700 IN A "4.3.2.1"\n'
-            'test.com. 600 IN AAAA "2001:db8::1"\n'
+            "test.com. 600 IN A 1.2.3.4\n"
+            "sub.test.com. 700 IN A 4.3.2.1\n"
+            "test.com. 600 IN AAAA 2001:db8::1\n"
             'test.com. 600 IN TXT "pkb-client"\n'
-            'test.com. 600 IN MX 10 "mail.test.com."\n'
+            "test.com. 600 IN MX 10 mail.test.com.\n"
         )
 
         with tempfile.NamedTemporaryFile() as f:
@@ -165,6 +174,266 @@ class TestBindFileParsing(unittest.TestCase):
             with open(f.name) as f2:
                 self.assertEqual(file_content.strip(), f2.read().strip())
 
+    def test_writing_long_txt_record(self):
+        data = "a" * 300 + "ä" * 200 + '"\\'
+        record = BindRecord("test.com.", 600, RecordClass.IN, DNSRecordType.TXT, data)
+
+        # the text is split into character strings of at most 255 bytes
+        self.assertEqual(
+            f'test.com. 600 IN TXT "{"a" * 255}" "{"a" * 45}{"ä" * 105}" '
+            f'"{"ä" * 95}\\"\\\\"',
+            str(record),
+        )
+        self.assertEqual(
+            [record],
+            list(BindFile.iter_records(io.StringIO(f"$ORIGIN test.com.\n{record}\n"))),
+        )
+
+
+class TestBindFileStreaming(unittest.TestCase):
+    def test_iter_records_stream(self):
+        stream = io.StringIO(
+            "$ORIGIN test.com.\n"
+            "$TTL 1234\n"
+            "test.com. IN 600 A 1.2.3.4\n"
+            "sub IN A 1.2.3.5 ; comment\n"
+        )
+
+        reader = BindFile.iter_records(stream)
+        self.assertEqual(
+            BindRecord("test.com.", 600, RecordClass.IN, DNSRecordType.A, "1.2.3.4"),
+            next(reader),
+        )
+        self.assertEqual("test.com.", reader.origin)
+        self.assertEqual(1234, reader.ttl)
+        # the records are parsed while the stream is read
+        self.assertNotEqual(len(stream.getvalue()), stream.tell())
+        self.assertEqual(
+            [
+                BindRecord(
+                    "sub.test.com.",
+                    1234,
+                    RecordClass.IN,
+                    DNSRecordType.A,
+                    "1.2.3.5",
+                    comment="comment",
+                )
+            ],
+            list(reader),
+        )
+        self.assertFalse(stream.closed)
+
+    def test_iter_records_file(self):
+        with resources.open_text(data, "test.bind") as f:
+            file_path = f.name
+
+        with BindFile.iter_records(file_path) as reader:
+            records = list(reader)
+        self.assertEqual(BindFile.from_file(file_path).records, records)
+        self.assertEqual(7, len(records))
+        self.assertTrue(reader._file.closed)
+
+    def test_iter_records_without_origin(self):
+        with self.assertRaises(ValueError):
+            list(BindFile.iter_records(io.StringIO("$TTL 1234\n")))
+
+
+class TestBindFileSyntax(unittest.TestCase):
+    def _parse(self, content):
+        return list(BindFile.iter_records(io.StringIO(content)))
+
+    def test_parentheses(self):
+        records = self._parse(
+            "$ORIGIN test.com.\n"
+            "@ 600 IN SOA ns.test.com. admin.test.com. (\n"
+            "    100 ; serial\n"
+            "    300 100 6000 600 )\n"
+            "@ 600 IN MX ( 10\n"
+            "    mail.test.com. ) ; mail server\n"
+        )
+
+        self.assertEqual(
+            [
+                BindRecord(
+                    "test.com.",
+                    600,
+                    RecordClass.IN,
+                    DNSRecordType.MX,
+                    "mail.test.com.",
+                    prio=10,
+                    comment="mail server",
+                )
+            ],
+            records,
+        )
+
+    def test_attached_quoted_strings(self):
+        records = self._parse(
+            "$ORIGIN test.com.\n"
+            "$TTL 600\n"
+            'https IN HTTPS 1 . alpn="h2,h3" ipv4hint=127.0.0.1\n'
+            'svc IN SVCB ( 1 svc.test.net. alpn="h2"\n'
+            "    port=8443 )\n"
+            'txt IN TXT "v=spf1" " -all"\n'
+        )
+
+        self.assertEqual(
+            [
+                '1 . alpn="h2,h3" ipv4hint=127.0.0.1',
+                '1 svc.test.net. alpn="h2" port=8443',
+                "v=spf1 -all",
+            ],
+            [record.data for record in records],
+        )
+        self.assertEqual(
+            [DNSRecordType.HTTPS, DNSRecordType.SVCB, DNSRecordType.TXT],
+            [record.record_type for record in records],
+        )
+
+        # the written records can be parsed again
+        records = self._parse(
+            "$ORIGIN test.com.\n" + "".join(f"{record}\n" for record in records)
+        )
+        self.assertEqual('1 . alpn="h2,h3" ipv4hint=127.0.0.1', records[0].data)
+
+    def test_relative_names_and_omitted_owner(self):
+        records = self._parse(
+            "$ORIGIN test.com.\n"
+            "$TTL 1h\n"
+            "www IN A 1.2.3.4\n"
+            "    IN 1d AAAA 2001:db8::1\n"
+            "$ORIGIN sub\n"
+            "a A 1.2.3.5\n"
+        )
+
+        self.assertEqual(
+            [
+                ("www.test.com.", 3600, DNSRecordType.A),
+                ("www.test.com.", 86400, DNSRecordType.AAAA),
+                ("a.sub.test.com.", 3600, DNSRecordType.A),
+            ],
+            [(r.name, r.ttl, r.record_type) for r in records],
+        )
+
+    def test_character_strings(self):
+        records = self._parse(
+            "$ORIGIN test.com.\n"
+            "$TTL 600\n"
+            '@ TXT "v=DKIM1; k=rsa; " "p=ABC" ( "DEF" )\n'
+            '@ TXT "say \\"hi\\"\\059 \\\\o/"\n'
+            '@ CAA 0 issue "letsencrypt.org"\n'
+            "escaped\\.dot A 1.2.3.4\n"
+        )
+
+        self.assertEqual("v=DKIM1; k=rsa; p=ABCDEF", records[0].data)
+        self.assertEqual('say "hi"; \\o/', records[1].data)
+        self.assertEqual('0 issue "letsencrypt.org"', records[2].data)
+        self.assertEqual("escaped\\.dot.test.com.", records[3].name)
+
+    def test_include(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with open(Path(temp_dir, "mail.bind"), "w") as f:
+                f.write("@ MX 10 mail\nmail A 1.2.3.5\n")
+            with open(Path(temp_dir, "zone.bind"), "w") as f:
+                f.write(
+                    "$ORIGIN test.com.\n"
+                    "$TTL 600\n"
+                    "$INCLUDE mail.bind mail.test.com.\n"
+                    "www A 1.2.3.4\n"
+                )
+
+            records = BindFile.from_file(Path(temp_dir, "zone.bind")).records
+
+        self.assertEqual(
+            ["mail.test.com.", "mail.mail.test.com.", "www.test.com."],
+            [record.name for record in records],
+        )
+        self.assertEqual("mail.mail.test.com.", records[0].data)
+
+    def test_syntax_errors(self):
+        for content in (
+            '$ORIGIN test.com.\n@ 600 TXT "unterminated\n',
+            "$ORIGIN test.com.\n@ 600 MX ( 10 mail\n",
+            "$ORIGIN test.com.\n@ 600 A 1.2.3.4 )\n",
+            "$ORIGIN test.com.\n@ A 1.2.3.4\n",
+        ):
+            with self.subTest(content=content):
+                with self.assertRaises(ValueError):
+                    self._parse(content)
+
+
+class TestBindFileWriting(unittest.TestCase):
+    def test_write_chunks(self):
+        records = [
+            BindRecord(
+                f"host{i}.test.com.", 600, RecordClass.IN, DNSRecordType.A, "1.2.3.4"
+            )
+            for i in range(2500)
+        ]
+        stream = io.StringIO()
+        writes = []
+        stream.writelines = lambda lines: writes.append(list(lines)) or None
+
+        write_records(stream, iter(records))
+
+        self.assertEqual([1000, 1000, 500], [len(chunk) for chunk in writes])
+        self.assertEqual(f"{records[0]}\n", writes[0][0])
+
+    def test_write_escaped_data(self):
+        record = BindRecord(
+            "test.com.",
+            600,
+            RecordClass.IN,
+            DNSRecordType.TXT,
+            'say "hi" \\o/',
+            comment="greeting",
+        )
+        bind_file = BindFile("test.com.", 600, [record])
+
+        stream = io.StringIO()
+        bind_file.write(stream)
+
+        self.assertEqual(str(bind_file), stream.getvalue())
+        self.assertEqual(
+            [record], list(BindFile.iter_records(io.StringIO(stream.getvalue())))
+        )
+
+
+class TestParseBindFiles(unittest.TestCase):
+    def test_parse_bind_directory(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for i in range(4):
+                with open(Path(temp_dir, f"example{i}.com.bind"), "w") as f:
+                    f.write(f"$ORIGIN example{i}.com.\n$TTL 600\n@ A 1.2.3.{i}\n")
+            with open(Path(temp_dir, "invalid.bind"), "w") as f:
+                f.write("$TTL 600\n@ A 1.2.3.4\n")
+            with open(Path(temp_dir, "ignored.txt"), "w") as f:
+                f.write("not a BIND file")
+
+            results = list(parse_bind_directory(temp_dir, max_workers=2))
+
+        self.assertEqual(
+            [f"example{i}.com.bind" for i in range(4)] + ["invalid.bind"],
+            [result.path.name for result in results],
+        )
+        self.assertEqual(
+            [True, True, True, True, False], [result.ok for result in results]
+        )
+        self.assertEqual("example2.com.", results[2].bind_file.origin)
+        self.assertEqual("1.2.3.2", results[2].bind_file.records[0].data)
+        self.assertIsInstance(results[4].error, ValueError)
+        self.assertTrue(all(result.duration > 0 for result in results))
+
+    def test_parse_bind_files_in_process(self):
+        with resources.open_text(data, "test.bind") as f:
+            file_path = f.name
+
+        (result,) = parse_bind_files([file_path], max_workers=1)
+
+        self.assertEqual(
+            BindFile.from_file(file_path).records, result.bind_file.records
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,97 @@
+import threading
+import unittest
+
+from pkb_client.client import PKBClient, PKBClientException
+from pkb_client.client.bulk import DNSMutation, DNSMutationType
+from pkb_client.client.dispatch import APIResponse
+from pkb_client.client.dns import DNSRecordType
+
+
+class FakeAPI:
+    """
+    Middleware which answers all API calls without sending them and records the endpoints per domain.
+    """
+
+    def __init__(self, failing_endpoints=()):
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.failing_endpoints = set(failing_endpoints)
+
+    def __call__(self, request, call_next):
+        domain = request.endpoint.split("/")[2]
+        with self.lock:
+            self.calls.setdefault(domain, []).append(request.endpoint)
+        if request.endpoint in self.failing_endpoints:
+            return APIResponse(400, {"status": "ERROR", "message": "invalid"})
+        if request.endpoint.startswith("dns/create"):
+            return APIResponse(200, {"status": "SUCCESS", "id": "42"})
+        return APIResponse(200, {"status": "SUCCESS"})
+
+
+class TestBulkMutations(unittest.TestCase):
+    def _mutations(self, domains):
+        mutations = []
+        for domain in domains:
+            mutations += [
+                DNSMutation.create(domain, DNSRecordType.A, "127.0.0.1", name="www"),
+                DNSMutation.update(domain, "1", DNSRecordType.A, "127.0.0.2", ttl=600),
+                DNSMutation.delete(domain, "2"),
+            ]
+        return mutations
+
+    def test_apply_dns_mutations(self):
+        api = FakeAPI()
+        pkb_client = PKBClient("key", "secret", middlewares=[api])
+        domains = [f"example{i}.com" for i in range(20)]
+        progress = []
+
+        results = pkb_client.apply_dns_mutations(
+            self._mutations(domains), max_workers=5, progress=progress.append
+        )
+
+        self.assertEqual(60, len(results))
+        self.assertEqual(60, len(progress))
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual(DNSMutationType.create, results[0].mutation.type)
+        self.assertEqual("42", results[0].result)
+        self.assertTrue(results[1].result)
+        for domain in domains:
+            # the mutations of one domain are applied in the given order
+            self.assertEqual(
+                [
+                    f"dns/create/{domain}",
+                    f"dns/edit/{domain}/1",
+                    f"dns/delete/{domain}/2",
+                ],
+                api.calls[domain],
+            )
+
+    def test_apply_dns_mutations_error(self):
+        api = FakeAPI(failing_endpoints={"dns/edit/example.com/1"})
+        pkb_client = PKBClient("key", "secret", middlewares=[api])
+
+        results = pkb_client.apply_dns_mutations(
+            self._mutations(["example.com", "example.org"])
+        )
+
+        self.assertTrue(results[0].ok)
+        self.assertIsInstance(results[1].error, PKBClientException)
+        # the remaining mutations of the failed domain are skipped
+        self.assertTrue(results[2].skipped)
+        self.assertTrue(all(result.ok for result in results[3:]))
+        self.assertEqual(2, len(api.calls["example.com"]))
+
+    def test_apply_dns_mutations_continue_on_error(self):
+        api = FakeAPI(failing_endpoints={"dns/edit/example.com/1"})
+        pkb_client = PKBClient("key", "secret", middlewares=[api])
+
+        results = pkb_client.apply_dns_mutations(
+            self._mutations(["example.com"]), stop_on_error=False
+        )
+
+        self.assertEqual([True, False, True], [result.ok for result in results])
+        self.assertEqual(3, len(api.calls["example.com"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
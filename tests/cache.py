@@ -0,0 +1,403 @@
+import json
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urljoin
+
+import responses
+from responses.registries import OrderedRegistry
+
+from pkb_client.client import API_ENDPOINT, PKBClient
+from pkb_client.client.cache import DNSRecordCache, PricingCache, TTLCache
+from pkb_client.client.dns import DNSRecordType
+from tests.helpers import FakeClock, api_dns_record, dns_record
+
+
+class TestTTLCache(unittest.TestCase):
+    def test_expiration(self):
+        clock = FakeClock()
+        cache = TTLCache(ttl=10, max_size=10, clock=clock)
+
+        cache.set("a", 1)
+        self.assertEqual(1, cache.get("a"))
+
+        clock.now = 10
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(1, cache.stats.hits)
+        self.assertEqual(1, cache.stats.misses)
+
+    def test_lru_eviction(self):
+        cache = TTLCache(ttl=10, max_size=2)
+
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        self.assertEqual("b", cache.set("c", 3))
+
+        self.assertEqual(1, cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(3, cache.get("c"))
+        self.assertEqual(1, cache.stats.evictions)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            TTLCache(ttl=0, max_size=1)
+        with self.assertRaises(ValueError):
+            TTLCache(ttl=1, max_size=0)
+
+
+class TestDNSRecordCache(unittest.TestCase):
+    def test_copies(self):
+        cache = DNSRecordCache()
+        records = [dns_record("1")]
+
+        cache.set_records("example.com", records)
+        records[0].content = "changed"
+        cached = cache.get_records("example.com")
+        cached[0].content = "changed"
+
+        self.assertEqual([dns_record("1")], cache.get_records("example.com"))
+
+    def test_invalidate(self):
+        cache = DNSRecordCache()
+
+        cache.set_records("example.com", [dns_record("1")])
+        cache.set_records_by_name_type(
+            "example.com", DNSRecordType.A, "", [dns_record("1")]
+        )
+        cache.set_records("example.org", [dns_record("2", "example.org")])
+
+        cache.invalidate("Example.com")
+
+        self.assertIsNone(cache.get_records("example.com"))
+        self.assertIsNone(
+            cache.get_records_by_name_type("example.com", DNSRecordType.A, "")
+        )
+        self.assertEqual(
+            [dns_record("2", "example.org")], cache.get_records("example.org")
+        )
+
+    def test_remove_record(self):
+        cache = DNSRecordCache()
+
+        cache.set_records("example.com", [dns_record("1"), dns_record("2")])
+        cache.set_records_by_name_type(
+            "example.com", DNSRecordType.A, "", [dns_record("1"), dns_record("2")]
+        )
+
+        cache.remove_record("example.com", "1")
+
+        self.assertEqual([dns_record("2")], cache.get_records("example.com"))
+        self.assertIsNone(
+            cache.get_records_by_name_type("example.com", DNSRecordType.A, "")
+        )
+
+    def test_outdated_generation(self):
+        cache = DNSRecordCache()
+
+        generation = cache.generation("example.com")
+        other_generation = cache.generation("example.org")
+        cache.invalidate("Example.com")
+        cache.set_records("example.com", [dns_record("1")], generation)
+        cache.set_records_by_name_type(
+            "example.com", DNSRecordType.A, "", [dns_record("1")], generation
+        )
+        cache.set_records(
+            "example.org", [dns_record("2", "example.org")], other_generation
+        )
+
+        self.assertIsNone(cache.get_records("example.com"))
+        self.assertIsNone(
+            cache.get_records_by_name_type("example.com", DNSRecordType.A, "")
+        )
+        self.assertEqual(
+            [dns_record("2", "example.org")], cache.get_records("example.org")
+        )
+
+        generation = cache.generation("example.org")
+        cache.clear()
+        cache.set_records("example.org", [dns_record("2", "example.org")], generation)
+        self.assertIsNone(cache.get_records("example.org"))
+
+    def test_eviction_cleans_domain_index(self):
+        cache = DNSRecordCache(max_size=1)
+
+        cache.set_records("example.com", [dns_record("1")])
+        cache.set_records("example.org", [dns_record("2", "example.org")])
+
+        self.assertEqual(1, len(cache))
+        self.assertNotIn("example.com", cache._domain_keys)
+
+
+class TestClientDNSCache(unittest.TestCase):
+    @responses.activate(registry=OrderedRegistry, assert_all_requests_are_fired=True)
+    def test_get_dns_records_cached(self):
+        pkb_client = PKBClient("key", "secret", dns_cache=DNSRecordCache())
+
+        responses.post(
+            url=urljoin(API_ENDPOINT, "dns/retrieve/example.com"),
+            json={
+                "status": "SUCCESS",
+                "records": [
+                    api_dns_record("1"),
+                    api_dns_record("2", "www.example.com"),
+                ],
+            },
+        )
+
+        self.assertEqual(2, len(pkb_client.get_dns_records("example.com")))
+        self.assertEqual(2, len(pkb_client.get_dns_records("example.com")))
+        self.assertEqual(
+            [dns_record("2", "www.example.com")],
+            pkb_client.get_dns_records("example.com", "2"),
+        )
+        self.assertEqual(2, pkb_client.dns_cache.stats.hits)
+        self.assertEqual(1, pkb_client.dns_cache.stats.misses)
+
+    @responses.activate(registry=OrderedRegistry, assert_all_requests_are_fired=True)
+    def test_create_dns_record_invalidates(self):
+        pkb_client = PKBClient("key", "secret", dns_cache=DNSRecordCache())
+
+        responses.post(
+            url=urljoin(API_ENDPOINT, "dns/retrieve/example.com"),
+            json={"status": "SUCCESS", "records": [api_dns_record("1")]},
+        )
+        responses.post(
+            url=urljoin(API_ENDPOINT, "dns/create/example.com"),
+            json={"status": "SUCCESS", "id": "2"},
+        )
+        responses.post(
+            url=urljoin(API_ENDPOINT, "dns/retrieve/example.com"),
+            json={
+                "status": "SUCCESS",
+                "records": [
+                    api_dns_record("1"),
+                    api_dns_record("2", content="127.0.0.2"),
+                ],
+            },
+        )
+
+        self.assertEqual(1, len(pkb_client.get_dns_records("example.com")))
+        pkb_client.create_dns_record("example.com", DNSRecordType.A, "127.0.0.2")
+        self.assertEqual(2, len(pkb_client.get_dns_records("example.com")))
+
+    @responses.activate(registry=OrderedRegistry, assert_all_requests_are_fired=True)
+    def test_retrieval_during_change_not_cached(self):
+        pkb_client = PKBClient("key", "secret", dns_cache=DNSRecordCache())
+        retrieval_started = threading.Event()
+        change_done = threading.Event()
+
+        def outdated_records(request):
+            # the retrieval returns the DNS records from before the concurrent change
+            retrieval_started.set()
+            change_done.wait(5)
+            return (
+                200,
+                {},
+                json.dumps({"status": "SUCCESS", "records": [api_dns_record("1")]}),
+            )
+
+        responses.add_callback(
+            responses.POST,
+            url=urljoin(API_ENDPOINT, "dns/retrieve/example.com"),
+            callback=outdated_records,
+        )
+        responses.post(
+            url=urljoin(API_ENDPOINT, "dns/create/example.com"),
+            json={"status": "SUCCESS", "id": "2"},
+        )
+        responses.post(
+            url=urljoin(API_ENDPOINT, "dns/retrieve/example.com"),
+            json={
+                "status": "SUCCESS",
+                "records": [
+                    api_dns_record("1"),
+                    api_dns_record("2", content="127.0.0.2"),
+                ],
+            },
+        )
+
+        reader = threading.Thread(
+            target=pkb_client.get_dns_records, args=("example.com",)
+        )
+        reader.start()
+        self.assertTrue(retrieval_started.wait(5))
+        pkb_client.create_dns_record("example.com", DNSRecordType.A, "127.0.0.2")
+        change_done.set()
+        reader.join()
+
+        self.assertEqual(2, len(pkb_client.get_dns_records("example.com")))
+
+    @responses.activate(registry=OrderedRegistry, assert_all_requests_are_fired=True)
+    def test_delete_dns_record_patches(self):
+        pkb_client = PKBClient("key", "secret", dns_cache=DNSRecordCache())
+
+        responses.post(
+            url=urljoin(API_ENDPOINT, "dns/retrieve/example.com"),
+            json={
+                "status": "SUCCESS",
+                "records": [api_dns_record("1"), api_dns_record("2")],
+            },
+        )
+        responses.post(
+            url=urljoin(API_ENDPOINT, "dns/delete/example.com/1"),
+            json={"status": "SUCCESS"},
+        )
+
+        pkb_client.get_dns_records("example.com")
+        pkb_client.delete_dns_record("example.com", "1")
+
+        self.assertEqual([dns_record("2")], pkb_client.get_dns_records("example.com"))
+
+    @responses.activate(registry=OrderedRegistry, assert_all_requests_are_fired=True)
+    def test_get_all_dns_records_cached(self):
+        pkb_client = PKBClient("key", "secret", dns_cache=DNSRecordCache())
+
+        responses.post(
+            url=urljoin(API_ENDPOINT, "dns/retrieveByNameType/example.com/A/www"),
+            json={
+                "status": "SUCCESS",
+                "records": [api_dns_record("1", "www.example.com")],
+            },
+        )
+        responses.post(
+            url=urljoin(API_ENDPOINT, "dns/editByNameType/example.com/A/www"),
+            json={"status": "SUCCESS"},
+        )
+        responses.post(
+            url=urljoin(API_ENDPOINT, "dns/retrieveByNameType/example.com/A/www"),
+            json={
+                "status": "SUCCESS",
+                "records": [api_dns_record("1", "www.example.com", "127.0.0.2")],
+            },
+        )
+
+        pkb_client.get_all_dns_records("example.com", DNSRecordType.A, "www")
+        pkb_client.get_all_dns_records("example.com", DNSRecordType.A, "www")
+        pkb_client.update_all_dns_records(
+            "example.com", DNSRecordType.A, "www", "127.0.0.2"
+        )
+
+        self.assertEqual(
+            [dns_record("1", "www.example.com", "127.0.0.2")],
+            pkb_client.get_all_dns_records("example.com", DNSRecordType.A, "www"),
+        )
+
+
+class TestPricingCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name) / "pricing.sqlite"
+        self.clock = FakeClock()
+        self.fetches = 0
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _fetch(self):
+        self.fetches += 1
+        return {
+            "com": {"registration": "42.42", "renewal": "4.2", "coupons": []},
+            "net": {"registration": str(self.fetches), "renewal": "1.0"},
+        }
+
+    def test_get_pricing_cached(self):
+        cache = PricingCache(self.path, max_age=60, clock=self.clock)
+
+        pricing = cache.get_pricing(self._fetch)
+        self.assertEqual("42.42", pricing["com"]["registration"])
+        self.assertEqual(
+            "42.42", cache.get_tld_pricing(".COM", self._fetch)["registration"]
+        )
+        self.assertIsNone(cache.get_tld_pricing("invalid", self._fetch))
+        self.assertEqual(1, self.fetches)
+
+        # the pricing of all TLDs is read-only and the pricing of one TLD is a copy
+        with self.assertRaises(TypeError):
+            pricing["com"]["registration"] = "0"
+        self.assertEqual((), pricing["com"]["coupons"])
+        cache.get_tld_pricing("com", self._fetch)["coupons"].append("coupon")
+        self.assertEqual([], cache.get_tld_pricing("com", self._fetch)["coupons"])
+
+    def test_concurrent_download(self):
+        cache = PricingCache(self.path, max_age=60, clock=self.clock)
+        download_started = threading.Event()
+        release_download = threading.Event()
+
+        def slow_fetch():
+            download_started.set()
+            release_download.wait(5)
+            return self._fetch()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(cache.get_pricing, slow_fetch)]
+            self.assertTrue(download_started.wait(5))
+            futures += [
+                executor.submit(cache.get_pricing, slow_fetch) for _ in range(3)
+            ]
+            release_download.set()
+            for future in futures:
+                self.assertEqual("1", future.result()["net"]["registration"])
+
+        self.assertEqual(1, self.fetches)
+
+    def test_persistent(self):
+        PricingCache(self.path, max_age=60, clock=self.clock).get_pricing(self._fetch)
+
+        cache = PricingCache(self.path, max_age=60, clock=self.clock)
+        self.assertEqual("1", cache.get_tld_pricing("net", self._fetch)["registration"])
+        self.assertEqual(1, self.fetches)
+
+    def test_refresh(self):
+        cache = PricingCache(
+            self.path, max_age=60, background_refresh=False, clock=self.clock
+        )
+        cache.get_pricing(self._fetch)
+
+        self.clock.now = 61
+        self.assertEqual("2", cache.get_tld_pricing("net", self._fetch)["registration"])
+        self.assertEqual(2, self.fetches)
+
+    def test_background_refresh(self):
+        cache = PricingCache(self.path, max_age=60, clock=self.clock)
+        cache.get_pricing(self._fetch)
+
+        self.clock.now = 61
+        # the stale pricing is returned while the pricing is refreshed
+        self.assertEqual("1", cache.get_tld_pricing("net", self._fetch)["registration"])
+        cache.wait_for_refresh()
+        self.assertEqual(2, self.fetches)
+        self.assertEqual("2", cache.get_tld_pricing("net", self._fetch)["registration"])
+        self.assertEqual(2, self.fetches)
+
+
+class TestClientPricingCache(unittest.TestCase):
+    @responses.activate
+    def test_get_tld_pricing_cached(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pricing_cache = PricingCache(Path(tmp_dir) / "pricing.sqlite")
+            pkb_client = PKBClient(pricing_cache=pricing_cache)
+            responses.post(
+                url=urljoin(API_ENDPOINT, "pricing/get"),
+                json={
+                    "status": "SUCCESS",
+                    "pricing": {
+                        "com": {
+                            "registration": "42.42",
+                            "renewal": "4.2",
+                            "transfer": "42.2",
+                            "coupons": [],
+                        },
+                    },
+                },
+            )
+
+            self.assertEqual("4.2", pkb_client.get_tld_pricing("com")["renewal"])
+            self.assertIn("com", pkb_client.get_domain_pricing())
+            self.assertEqual(1, len(responses.calls))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,197 @@
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from urllib.parse import urljoin
+
+import responses
+
+from pkb_client.cli.cli import run_batch
+from pkb_client.client import API_ENDPOINT, PKBClient
+from pkb_client.client.cache import PricingCache
+from pkb_client.client.dns import DNSRecord, DNSRecordType
+from pkb_client.client.snapshot import SnapshotStore
+
+
+class TestBatch(unittest.TestCase):
+    def _run_batch(self, commands, **kwargs):
+        output = io.StringIO()
+        ok = run_batch(
+            PKBClient("key", "secret"),
+            io.StringIO("\n".join(commands) + "\n"),
+            output=output,
+            **kwargs,
+        )
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+        return ok, results
+
+    @responses.activate
+    def test_commands(self):
+        responses.post(
+            url=urljoin(API_ENDPOINT, "ping"),
+            json={"status": "SUCCESS", "yourIp": "127.0.0.1"},
+        )
+        responses.post(
+            url=urljoin(API_ENDPOINT, "dns/delete/example.com/123456"),
+            json={"status": "SUCCESS"},
+        )
+
+        ok, results = self._run_batch(
+            [
+                '["ping"]',
+                "",
+                '{"id": "delete", "args": ["delete-dns-records", "example.com", "123456"]}',
+            ]
+        )
+
+        self.assertTrue(ok)
+        self.assertEqual(
+            [
+                {"id": 1, "ok": True, "result": "127.0.0.1"},
+                {"id": "delete", "ok": True, "result": True},
+            ],
+            results,
+        )
+
+    @responses.activate
+    def test_failed_commands(self):
+        responses.post(
+            url=urljoin(API_ENDPOINT, "ping"),
+            json={"status": "ERROR", "message": "Invalid credentials"},
+            status=401,
+        )
+        responses.post(
+            url=urljoin(API_ENDPOINT, "dns/retrieve/example.com"),
+            json={"status": "SUCCESS", "records": []},
+        )
+
+        ok, results = self._run_batch(
+            [
+                '["ping"]',
+                "not json",
+                '{"args": "ping"}',
+                '["unknown-command"]',
+                '["--key", "other", "ping"]',
+                '["batch"]',
+                '["get-dns-records", "--help"]',
+                '["get-dns-records", "example.com"]',
+            ]
+        )
+
+        self.assertFalse(ok)
+        results = {result["id"]: result for result in results}
+        self.assertEqual(list(range(1, 9)), sorted(results))
+        for line_number in range(1, 8):
+            self.assertFalse(results[line_number]["ok"])
+            self.assertIn("error", results[line_number])
+        self.assertIn("global option key", results[5]["error"])
+        self.assertIn("can not be nested", results[6]["error"])
+        self.assertEqual({"id": 8, "ok": True, "result": []}, results[8])
+
+    @responses.activate
+    def test_concurrent_commands(self):
+        for i in range(20):
+            responses.post(
+                url=urljoin(API_ENDPOINT, f"dns/retrieve/example{i}.com"),
+                json={
+                    "status": "SUCCESS",
+                    "records": [
+                        {
+                            "id": str(i),
+                            "name": f"example{i}.com",
+                            "type": "A",
+                            "content": "127.0.0.1",
+                            "ttl": "600",
+                            "prio": None,
+                            "notes": "",
+                        }
+                    ],
+                },
+            )
+
+        ok, results = self._run_batch(
+            [
+                json.dumps({"id": i, "args": ["get-dns-records", f"example{i}.com"]})
+                for i in range(20)
+            ],
+            max_workers=4,
+        )
+
+        self.assertTrue(ok)
+        self.assertEqual(list(range(20)), sorted(result["id"] for result in results))
+        for result in results:
+            self.assertEqual(f"example{result['id']}.com", result["result"][0]["name"])
+
+    def test_snapshot_store_commands(self):
+        ok, results = self._run_batch(['["list-snapshots"]'])
+        self.assertFalse(ok)
+        self.assertIn("--snapshot-store", results[0]["error"])
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            snapshot_store = SnapshotStore(tmp_dir)
+            snapshot = snapshot_store.create_snapshot(
+                {
+                    "example.com": [
+                        DNSRecord(
+                            "1",
+                            "example.com",
+                            DNSRecordType.A,
+                            "127.0.0.1",
+                            600,
+                            None,
+                            "",
+                        )
+                    ]
+                }
+            )
+
+            ok, results = self._run_batch(
+                ['["list-snapshots", "--domain", "example.com"]'],
+                snapshot_store=snapshot_store,
+            )
+
+        self.assertTrue(ok)
+        self.assertEqual(snapshot.id, results[0]["result"][0]["id"])
+
+    @responses.activate
+    def test_pricing_cache(self):
+        responses.post(
+            url=urljoin(API_ENDPOINT, "pricing/get"),
+            json={
+                "status": "SUCCESS",
+                "pricing": {
+                    "com": {"registration": "42.42", "renewal": "4.2", "coupons": []}
+                },
+            },
+        )
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pkb_client = PKBClient(
+                "key",
+                "secret",
+                pricing_cache=PricingCache(Path(tmp_dir) / "pricing.sqlite"),
+            )
+            output = io.StringIO()
+            ok = run_batch(
+                pkb_client,
+                io.StringIO('["get-domain-pricing"]\n["get-tld-pricing", "com"]\n'),
+                output=output,
+            )
+
+        self.assertTrue(ok)
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(
+            {"registration": "42.42", "renewal": "4.2", "coupons": []},
+            results[0]["result"]["com"],
+        )
+        self.assertEqual("4.2", results[1]["result"]["renewal"])
+        self.assertEqual(1, len(responses.calls))
+
+    def test_invalid_workers(self):
+        with self.assertRaises(ValueError):
+            self._run_batch([], max_workers=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,17 @@
 import json
+import subprocess
+import sys
 import tempfile
+import threading
+import time
 import unittest
 from pathlib import Path
+from typing import List
+from unittest.mock import patch
 from urllib.parse import urljoin
 
+import dns.zone
+import requests
 import responses
 from responses import matchers
 from responses.registries import OrderedRegistry
@@ -15,6 +23,13 @@ from pkb_client.client import (
     PKBClientException,
     SSLCertBundle,
 )
+from pkb_client.client.bind_file import BindFile, BindRecord, RecordClass
+from pkb_client.client.dispatch import (
+    APIRequest,
+    APIResponse,
+    SingleFlightMiddleware,
+    TimingMiddleware,
+)
 from pkb_client.client.dns import DNSRecord, DNSRecordType
 from pkb_client.client.dnssec import DNSSECRecord
 from pkb_client.client.domain import (
@@ -22,7 +37,9 @@ from pkb_client.client.domain import (
     DomainAvailability,
     DomainPrice,
 )
+from pkb_client.client.export import ExportFormat
 from pkb_client.client.forwarding import URLForwarding, URLForwardingType
+from pkb_client.client.soa import OfflineSOAProvider
 
 
 class TestClientAuth(unittest.TestCase):
@@ -714,6 +731,154 @@ class TestClientAuth(unittest.TestCase):
 
         self.assertEqual(expected_exported_dns_file, exported_dns_file)
 
+    @responses.activate
+    def test_export_dns_records_ndjson(self):
+        pkb_client = PKBClient("key", "secret")
+
+        responses.post(
+            url=urljoin(API_ENDPOINT, "dns/retrieve/example.com"),
+            json={
+                "status": "SUCCESS",
+                "records": [
+                    {
+                        "id": "123456",
+                        "name": "example.com",
+                        "type": "MX",
+                        "content": "mail.example.com",
+                        "ttl": "600",
+                        "prio": "10",
+                        "notes": "",
+                    },
+                    {
+                        "id": "1234567",
+                        "name": "sub.example.com",
+                        "type": "TXT",
+                        "content": "multi\nline",
+                        "ttl": "1200",
+                        "prio": None,
+                        "notes": "This is a comment",
+                    },
+                ],
+            },
+        )
+
+        with tempfile.NamedTemporaryFile() as f:
+            pkb_client.export_dns_records("example.com", f.name, ExportFormat.ndjson)
+
+            with open(f.name, "r") as f:
+                lines = f.read().splitlines()
+
+        self.assertEqual(
+            [
+                {
+                    "id": "123456",
+                    "name": "example.com",
+                    "type": "MX",
+                    "content": "mail.example.com",
+                    "ttl": 600,
+                    "prio": 10,
+                    "notes": "",
+                },
+                {
+                    "id": "1234567",
+                    "name": "sub.example.com",
+                    "type": "TXT",
+                    "content": "multi\nline",
+                    "ttl": 1200,
+                    "prio": None,
+                    "notes": "This is a comment",
+                },
+            ],
+            [json.loads(line) for line in lines],
+        )
+
+    @responses.activate
+    def test_export_dns_records_interrupted(self):
+        pkb_client = PKBClient("key", "secret")
+
+        responses.post(
+            url=urljoin(API_ENDPOINT, "dns/retrieve/example.com"),
+            json={"status": "SUCCESS", "records": []},
+        )
+
+        def interrupted_write(fp, dns_records):
+            fp.write('{"id": "1"')
+            raise KeyboardInterrupt
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filepath = Path(temp_dir, "example.com.ndjson")
+            filepath.write_text("previous export\n")
+            with patch(
+                "pkb_client.client.client.write_ndjson", side_effect=interrupted_write
+            ):
+                with self.assertRaises(KeyboardInterrupt):
+                    pkb_client.export_dns_records(
+                        "example.com", filepath, ExportFormat.ndjson
+                    )
+
+            # the previous export is unchanged and no temporary file is left
+            self.assertEqual("previous export\n", filepath.read_text())
+            self.assertEqual([filepath], list(Path(temp_dir).iterdir()))
+
+    def test_export_dns_records_bind_format(self):
+        pkb_client = PKBClient("key", "secret")
+
+        with self.assertRaises(ValueError):
+            pkb_client.export_dns_records("example.com", "records.bind", "bind")
+
+    @responses.activate(registry=OrderedRegistry, assert_all_requests_are_fired=True)
+    def test_import_dns_records_ndjson(self):
+        pkb_client = PKBClient("key", "secret")
+
+        responses.post(
+            url=urljoin(API_ENDPOINT, "dns/retrieve/example.com"),
+            json={
+                "status": "SUCCESS",
+                "records": [
+                    {
+                        "id": "123456",
+                        "name": "example.com",
+                        "type": "A",
+                        "content": "127.0.0.1",
+                        "ttl": "600",
+                        "prio": "0",
+                        "notes": "",
+                    }
+                ],
+            },
+        )
+        responses.post(
+            url=urljoin(API_ENDPOINT, "dns/create/example.com"),
+            json={"status": "SUCCESS", "id": "1234567"},
+            match=[
+                matchers.json_params_matcher(
+                    {
+                        "apikey": "key",
+                        "secretapikey": "secret",
+                        "name": "sub",
+                        "type": "A",
+                        "content": "127.0.0.2",
+                        "ttl": 1200,
+                        "prio": None,
+                    }
+                )
+            ],
+        )
+
+        with tempfile.NamedTemporaryFile("w") as f:
+            f.write(
+                '{"id":"123456","name":"example.com","type":"A","content":"127.0.0.1","ttl":600,"prio":null,"notes":""}\n'
+                "\n"
+                '{"name":"sub.example.com","type":"A","content":"127.0.0.2","ttl":1200,"prio":null}\n'
+            )
+            f.flush()
+
+            self.assertTrue(
+                pkb_client.import_dns_records(
+                    "example.com", f.name, DNSRestoreMode.keep, file_format="ndjson"
+                )
+            )
+
     @responses.activate(registry=OrderedRegistry, assert_all_requests_are_fired=True)
     def test_import_dns_records_clear(self):
         pkb_client = PKBClient("key", "secret")
@@ -750,29 +915,10 @@ class TestClientAuth(unittest.TestCase):
                 )
             ],
         )
-        # then all records should be deleted
+        # then the changed records should be updated instead of deleted and recreated
         responses.post(
-            url=urljoin(API_ENDPOINT, "dns/delete/example.com/123456"),
-            json={"status": "SUCCESS"},
-            match=[
-                matchers.json_params_matcher(
-                    {"apikey": "key", "secretapikey": "secret"}
-                )
-            ],
-        )
-        responses.post(
-            url=urljoin(API_ENDPOINT, "dns/delete/example.com/1234567"),
+            url=urljoin(API_ENDPOINT, "dns/edit/example.com/123456"),
             json={"status": "SUCCESS"},
-            match=[
-                matchers.json_params_matcher(
-                    {"apikey": "key", "secretapikey": "secret"}
-                )
-            ],
-        )
-        # then all records should be imported / created
-        responses.post(
-            url=urljoin(API_ENDPOINT, "dns/create/example.com"),
-            json={"status": "SUCCESS", "id": "123456"},
             match=[
                 matchers.json_params_matcher(
                     {
@@ -788,8 +934,8 @@ class TestClientAuth(unittest.TestCase):
             ],
         )
         responses.post(
-            url=urljoin(API_ENDPOINT, "dns/create/example.com"),
-            json={"status": "SUCCESS", "id": "1234567"},
+            url=urljoin(API_ENDPOINT, "dns/edit/example.com/1234567"),
+            json={"status": "SUCCESS"},
             match=[
                 matchers.json_params_matcher(
                     {
@@ -830,8 +976,10 @@ class TestClientAuth(unittest.TestCase):
                     f,
                 )
 
-            pkb_client.import_dns_records(
-                "example.com", str(filename), DNSRestoreMode.clear
+            self.assertTrue(
+                pkb_client.import_dns_records(
+                    "example.com", str(filename), DNSRestoreMode.clear
+                )
             )
 
     @responses.activate(registry=OrderedRegistry, assert_all_requests_are_fired=True)
@@ -1040,29 +1188,10 @@ class TestClientAuth(unittest.TestCase):
                 )
             ],
         )
-        # then all records should be deleted
+        # then the changed records should be updated instead of deleted and recreated
         responses.post(
-            url=urljoin(API_ENDPOINT, "dns/delete/example.com/123456"),
-            json={"status": "SUCCESS"},
-            match=[
-                matchers.json_params_matcher(
-                    {"apikey": "key", "secretapikey": "secret"}
-                )
-            ],
-        )
-        responses.post(
-            url=urljoin(API_ENDPOINT, "dns/delete/example.com/1234567"),
+            url=urljoin(API_ENDPOINT, "dns/edit/example.com/123456"),
             json={"status": "SUCCESS"},
-            match=[
-                matchers.json_params_matcher(
-                    {"apikey": "key", "secretapikey": "secret"}
-                )
-            ],
-        )
-        # then all records should be imported / created
-        responses.post(
-            url=urljoin(API_ENDPOINT, "dns/create/example.com"),
-            json={"status": "SUCCESS", "id": "123456"},
             match=[
                 matchers.json_params_matcher(
                     {
@@ -1078,8 +1207,8 @@ class TestClientAuth(unittest.TestCase):
             ],
         )
         responses.post(
-            url=urljoin(API_ENDPOINT, "dns/create/example.com"),
-            json={"status": "SUCCESS", "id": "1234567"},
+            url=urljoin(API_ENDPOINT, "dns/edit/example.com/1234567"),
+            json={"status": "SUCCESS"},
             match=[
                 matchers.json_params_matcher(
                     {
@@ -1122,7 +1251,9 @@ class TestClientAuth(unittest.TestCase):
                     )
                 )
 
-            pkb_client.import_bind_dns_records(filename, DNSRestoreMode.clear)
+            self.assertTrue(
+                pkb_client.import_bind_dns_records(filename, DNSRestoreMode.clear)
+            )
 
     @responses.activate
     def test_get_dnssec_records(self):
@@ -1666,5 +1797,632 @@ class TestClientAuth(unittest.TestCase):
         )
 
 
+class TestClientSession(unittest.TestCase):
+    @responses.activate
+    def test_session_reused_across_calls(self):
+        pkb_client = PKBClient("key", "secret")
+
+        responses.post(
+            url=urljoin(API_ENDPOINT, "ping"),
+            json={"status": "SUCCESS", "yourIp": "127.0.0.1"},
+        )
+
+        with patch.object(
+            pkb_client._session, "post", wraps=pkb_client._session.post
+        ) as post:
+            pkb_client.ping()
+            pkb_client.ping()
+
+        self.assertEqual(2, post.call_count)
+        self.assertEqual(2, len(responses.calls))
+
+    def test_pool_settings(self):
+        pkb_client = PKBClient("key", "secret", pool_connections=2, pool_maxsize=20)
+
+        adapter = pkb_client._session.get_adapter(API_ENDPOINT)
+        self.assertEqual(20, adapter._pool_maxsize)
+        self.assertEqual(2, adapter._pool_connections)
+        self.assertEqual("keep-alive", pkb_client._session.headers["Connection"])
+
+    def test_disabled_keep_alive(self):
+        pkb_client = PKBClient("key", "secret", keep_alive=False)
+
+        self.assertEqual("close", pkb_client._session.headers["Connection"])
+
+    def test_context_manager_closes_session(self):
+        pkb_client = PKBClient("key", "secret")
+
+        with patch.object(pkb_client._session, "close") as close:
+            with pkb_client as c:
+                self.assertIs(pkb_client, c)
+                close.assert_not_called()
+
+        close.assert_called_once()
+
+
+class TestClientMiddleware(unittest.TestCase):
+    @responses.activate
+    def test_middleware_order(self):
+        calls = []
+
+        def middleware(name):
+            def handler(request, call_next):
+                calls.append(f"{name}:{request.endpoint}")
+                response = call_next(request)
+                calls.append(f"{name}:{response.status_code}")
+                return response
+
+            return handler
+
+        pkb_client = PKBClient(
+            "key", "secret", middlewares=[middleware("outer"), middleware("inner")]
+        )
+
+        responses.post(
+            url=urljoin(API_ENDPOINT, "ping"),
+            json={"status": "SUCCESS", "yourIp": "127.0.0.1"},
+        )
+
+        self.assertEqual("127.0.0.1", pkb_client.ping())
+        self.assertEqual(["outer:ping", "inner:ping", "inner:200", "outer:200"], calls)
+
+    def test_middleware_short_circuit(self):
+        def middleware(request, call_next):
+            self.assertTrue(request.read_only)
+            self.assertTrue(request.idempotent)
+            self.assertEqual({"apikey": "key", "secretapikey": "secret"}, request.json)
+            return APIResponse(200, {"status": "SUCCESS", "ns": ["ns1.example.com"]})
+
+        pkb_client = PKBClient("key", "secret", middlewares=[middleware])
+
+        self.assertEqual(["ns1.example.com"], pkb_client.get_dns_servers("example.com"))
+
+    @responses.activate
+    def test_request_flags(self):
+        sent_requests = []
+
+        def middleware(request, call_next):
+            sent_requests.append(request)
+            return call_next(request)
+
+        pkb_client = PKBClient("key", "secret", middlewares=[middleware])
+
+        responses.post(
+            url=urljoin(API_ENDPOINT, "dns/create/example.com"),
+            json={"status": "SUCCESS", "id": "123"},
+        )
+        responses.post(
+            url=urljoin(API_ENDPOINT, "dns/edit/example.com/123"),
+            json={"status": "SUCCESS"},
+        )
+
+        pkb_client.create_dns_record("example.com", DNSRecordType.A, "127.0.0.1")
+        pkb_client.update_dns_record("example.com", "123", DNSRecordType.A, "127.0.0.2")
+
+        self.assertFalse(sent_requests[0].read_only)
+        self.assertFalse(sent_requests[0].idempotent)
+        self.assertFalse(sent_requests[1].read_only)
+        self.assertTrue(sent_requests[1].idempotent)
+
+    @responses.activate
+    def test_invalid_json_response(self):
+        pkb_client = PKBClient("key", "secret")
+
+        responses.post(
+            url=urljoin(API_ENDPOINT, "ping"),
+            body="<html>Bad Gateway</html>",
+            status=502,
+        )
+
+        with self.assertRaises(PKBClientException) as context:
+            pkb_client.ping()
+
+        self.assertEqual(502, context.exception.status_code)
+
+    @responses.activate
+    def test_timing_middleware(self):
+        timing = TimingMiddleware()
+        pkb_client = PKBClient("key", "secret", middlewares=[timing])
+
+        responses.post(
+            url=urljoin(API_ENDPOINT, "dns/retrieve/example.com"),
+            json={"status": "SUCCESS", "records": []},
+        )
+        responses.post(
+            url=urljoin(API_ENDPOINT, "dns/retrieve/example.org"),
+            json={"status": "SUCCESS", "records": []},
+        )
+
+        pkb_client.get_dns_records("example.com")
+        pkb_client.get_dns_records("example.org")
+
+        self.assertEqual(2, timing.timings["dns/retrieve"].calls)
+        self.assertGreaterEqual(
+            timing.timings["dns/retrieve"].max_time,
+            timing.timings["dns/retrieve"].avg_time,
+        )
+
+
+class TestSingleFlightMiddleware(unittest.TestCase):
+    def _request(self, endpoint="dns/retrieve/example.com", read_only=True):
+        return APIRequest(
+            endpoint=endpoint,
+            url=urljoin(API_ENDPOINT, endpoint),
+            json={"apikey": "key", "secretapikey": "secret"},
+            read_only=read_only,
+            idempotent=read_only,
+        )
+
+    def _run_concurrently(self, middleware, requests, call_next, coalesced):
+        results = [None] * len(requests)
+
+        def run(i):
+            try:
+                results[i] = middleware(requests[i], call_next)
+            except Exception as e:
+                results[i] = e
+
+        threads = [
+            threading.Thread(target=run, args=(i,)) for i in range(len(requests))
+        ]
+        for thread in threads:
+            thread.start()
+        # wait until the followers joined the API call in flight
+        for _ in range(500):
+            if middleware.coalesced >= coalesced:
+                break
+            time.sleep(0.01)
+        self.release.set()
+        for thread in threads:
+            thread.join(5)
+        return results
+
+    def setUp(self):
+        self.release = threading.Event()
+        self.sent = []
+
+    def _call_next(self, request):
+        self.sent.append(request)
+        self.release.wait(5)
+        return APIResponse(200, {"status": "SUCCESS", "records": []})
+
+    def test_coalesce_identical_reads(self):
+        middleware = SingleFlightMiddleware()
+
+        results = self._run_concurrently(
+            middleware, [self._request() for _ in range(5)], self._call_next, 4
+        )
+
+        self.assertEqual(1, len(self.sent))
+        self.assertEqual(4, middleware.coalesced)
+        self.assertTrue(all(result is results[0] for result in results))
+
+        # finished API calls are not reused
+        middleware(self._request(), self._call_next)
+        self.assertEqual(2, len(self.sent))
+
+    def test_different_reads_not_coalesced(self):
+        middleware = SingleFlightMiddleware()
+        self.release.set()
+
+        middleware(self._request("dns/retrieve/example.com"), self._call_next)
+        middleware(self._request("dns/retrieve/example.org"), self._call_next)
+        middleware(self._request("dns/create/example.com", False), self._call_next)
+
+        self.assertEqual(3, len(self.sent))
+        self.assertEqual(0, middleware.coalesced)
+
+    def test_error_shared(self):
+        middleware = SingleFlightMiddleware()
+
+        def call_next(request):
+            self.sent.append(request)
+            self.release.wait(5)
+            raise requests.exceptions.ConnectionError("failed")
+
+        results = self._run_concurrently(
+            middleware, [self._request() for _ in range(3)], call_next, 2
+        )
+
+        self.assertEqual(1, len(self.sent))
+        for result in results:
+            self.assertIsInstance(result, requests.exceptions.ConnectionError)
+            self.assertEqual(("failed",), result.args)
+        # the waiters raise their own exceptions, which are chained to the exception of the API call
+        self.assertEqual(3, len({id(result) for result in results}))
+        errors = [result for result in results if result.__cause__ is not None]
+        self.assertEqual(2, len(errors))
+        for error in errors:
+            self.assertIn(error.__cause__, results)
+            self.assertIsNone(error.__cause__.__cause__)
+
+    def test_custom_error_shared(self):
+        middleware = SingleFlightMiddleware()
+
+        def call_next(request):
+            self.release.wait(5)
+            raise PKBClientException("ERROR", "failed", status_code=400)
+
+        results = self._run_concurrently(
+            middleware, [self._request() for _ in range(3)], call_next, 2
+        )
+
+        for result in results:
+            self.assertIsInstance(result, PKBClientException)
+            self.assertEqual("ERROR: failed", str(result))
+            self.assertEqual(400, result.status_code)
+
+    def test_write_detaches_reads_in_flight(self):
+        middleware = SingleFlightMiddleware()
+        leader = threading.Thread(
+            target=middleware, args=(self._request(), self._call_next)
+        )
+        leader.start()
+        for _ in range(500):
+            if self.sent:
+                break
+            time.sleep(0.01)
+
+        middleware(
+            self._request("dns/create/example.com", False),
+            lambda request: APIResponse(200, {"status": "SUCCESS", "id": "1"}),
+        )
+        # the read after the change does not join the read started before the change
+        follower = threading.Thread(
+            target=middleware, args=(self._request(), self._call_next)
+        )
+        follower.start()
+        self.release.set()
+        leader.join(5)
+        follower.join(5)
+
+        self.assertEqual(2, len(self.sent))
+        self.assertEqual(0, middleware.coalesced)
+
+
+def _domain_page(start, count):
+    return {
+        "status": "SUCCESS",
+        "domains": [
+            {
+                "domain": f"example{i}.com",
+                "status": "ACTIVE",
+                "tld": "com",
+                "createDate": "2020-01-01 00:00:00",
+                "expireDate": "2030-01-01 00:00:00",
+                "securityLock": "1",
+                "whoisPrivacy": "1",
+                "autoRenew": 0,
+                "notLocal": 0,
+            }
+            for i in range(start, start + count)
+        ],
+    }
+
+
+class TestClientIterDomains(unittest.TestCase):
+    def _add_pages(self, page_sizes):
+        start = 0
+        for page_size in page_sizes + [0]:
+            responses.post(
+                url=urljoin(API_ENDPOINT, "domain/listAll"),
+                json=_domain_page(start, page_size),
+                match=[
+                    matchers.json_params_matcher(
+                        {"apikey": "key", "secretapikey": "secret", "start": start}
+                    )
+                ],
+            )
+            start += page_size
+
+    @responses.activate
+    def test_iter_domains(self):
+        self._add_pages([1000, 1000, 3])
+        pkb_client = PKBClient("key", "secret")
+
+        for prefetch in (True, False):
+            with self.subTest(prefetch=prefetch):
+                domains = [
+                    domain.domain
+                    for domain in pkb_client.iter_domains(prefetch=prefetch)
+                ]
+                self.assertEqual([f"example{i}.com" for i in range(2003)], domains)
+
+    @responses.activate
+    def test_iter_domains_stop_early(self):
+        self._add_pages([1000, 1000])
+        pkb_client = PKBClient("key", "secret")
+
+        domains = pkb_client.iter_domains()
+        self.assertEqual("example0.com", next(domains).domain)
+        # wait for the prefetched chunk
+        for _ in range(500):
+            if len(responses.calls) == 2:
+                break
+            time.sleep(0.01)
+        domains.close()
+
+        # only the current and the prefetched chunk were retrieved
+        self.assertEqual(2, len(responses.calls))
+
+
+class TestClientExportAll(unittest.TestCase):
+    def _add_responses(self, failing_domain=None):
+        responses.post(
+            url=urljoin(API_ENDPOINT, "domain/listAll"),
+            json=_domain_page(0, 3),
+            match=[
+                matchers.json_params_matcher(
+                    {"apikey": "key", "secretapikey": "secret", "start": 0}
+                )
+            ],
+        )
+        responses.post(
+            url=urljoin(API_ENDPOINT, "domain/listAll"),
+            json=_domain_page(3, 0),
+            match=[
+                matchers.json_params_matcher(
+                    {"apikey": "key", "secretapikey": "secret", "start": 3}
+                )
+            ],
+        )
+        for i in range(3):
+            domain = f"example{i}.com"
+            if domain == failing_domain:
+                responses.post(
+                    url=urljoin(API_ENDPOINT, f"dns/retrieve/{domain}"),
+                    status=400,
+                    json={"status": "ERROR", "message": "invalid domain"},
+                )
+                continue
+            responses.post(
+                url=urljoin(API_ENDPOINT, f"dns/retrieve/{domain}"),
+                json={
+                    "status": "SUCCESS",
+                    "records": [
+                        {
+                            "id": str(i),
+                            "name": domain,
+                            "type": "A",
+                            "content": "127.0.0.1",
+                            "ttl": "600",
+                            "prio": "0",
+                            "notes": "",
+                        }
+                    ],
+                },
+            )
+
+    @responses.activate
+    def test_export_all_dns_records(self):
+        self._add_responses(failing_domain="example1.com")
+        pkb_client = PKBClient("key", "secret")
+        progress = []
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            result = pkb_client.export_all_dns_records(
+                temp_dir,
+                max_workers=3,
+                progress=lambda done, total: progress.append((done, total)),
+            )
+
+            self.assertEqual(["example0.com", "example2.com"], sorted(result.exported))
+            self.assertEqual(["example1.com"], list(result.failed))
+            self.assertFalse(result.ok)
+            self.assertEqual([(1, 3), (2, 3), (3, 3)], progress)
+            with open(Path(temp_dir, "example2.com.json")) as f:
+                self.assertEqual("127.0.0.1", json.load(f)["2"]["content"])
+            # no temporary files are left behind
+            self.assertEqual(
+                ["example0.com.json", "example2.com.json"],
+                sorted(path.name for path in Path(temp_dir).iterdir()),
+            )
+
+    @responses.activate
+    def test_export_all_dns_records_resume(self):
+        self._add_responses()
+        pkb_client = PKBClient("key", "secret")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            Path(temp_dir, "example0.com.json").write_text("{}")
+
+            result = pkb_client.export_all_dns_records(temp_dir, resume=True)
+
+            self.assertEqual(["example0.com"], result.skipped)
+            self.assertEqual(["example1.com", "example2.com"], sorted(result.exported))
+            self.assertEqual("{}", Path(temp_dir, "example0.com.json").read_text())
+
+
+class TestClientExportBind(unittest.TestCase):
+    @responses.activate
+    def test_export_bind_dns_records(self):
+        responses.post(
+            url=urljoin(API_ENDPOINT, "dns/retrieve/example.com"),
+            json={
+                "status": "SUCCESS",
+                "records": [
+                    {
+                        "id": "1",
+                        "name": "sub.example.com",
+                        "type": "TXT",
+                        "content": 'say "hi"',
+                        "ttl": "600",
+                        "prio": "0",
+                        "notes": "greeting",
+                    },
+                    {
+                        "id": "2",
+                        "name": "example.com",
+                        "type": "MX",
+                        "content": "mail.example.com",
+                        "ttl": "3600",
+                        "prio": "10",
+                        "notes": "",
+                    },
+                ],
+            },
+        )
+        pkb_client = PKBClient(
+            "key", "secret", soa_provider=OfflineSOAProvider(clock=lambda: 0)
+        )
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filepath = Path(temp_dir, "example.com.bind")
+            self.assertTrue(pkb_client.export_bind_dns_records("example.com", filepath))
+            with open(filepath) as f:
+                content = f.read()
+            bind_file = BindFile.from_file(filepath)
+
+        self.assertIn(
+            "@ IN SOA curitiba.ns.porkbun.com. hostmaster.example.com. "
+            "(1970010100 10800 3600 604800 3600)\n",
+            content,
+        )
+
+        self.assertEqual("example.com.", bind_file.origin)
+        self.assertEqual(
+            [
+                BindRecord(
+                    "sub.example.com.",
+                    600,
+                    RecordClass.IN,
+                    DNSRecordType.TXT,
+                    'say "hi"',
+                    comment="greeting",
+                ),
+                BindRecord(
+                    "example.com.",
+                    3600,
+                    RecordClass.IN,
+                    DNSRecordType.MX,
+                    "mail.example.com.",
+                    prio=10,
+                ),
+            ],
+            bind_file.records,
+        )
+
+    @responses.activate
+    def test_export_bind_dns_records_dnspython(self):
+        records = [
+            ("example.com", "NS", "curitiba.ns.porkbun.com", "0", ""),
+            ("example.com", "A", "1.2.3.4", "0", "web server"),
+            ("example.com", "AAAA", "2001:db8::1", "0", ""),
+            ("www.example.com", "CNAME", "example.com", "0", ""),
+            ("example.com", "MX", "mail.example.com", "10", ""),
+            ("_sip._tcp.example.com", "SRV", "5 5060 sip.example.com", "10", ""),
+            ("example.com", "TXT", 'v=spf1 -all "quoted"', "0", ""),
+            ("long.example.com", "TXT", "a" * 300, "0", ""),
+            ("example.com", "CAA", '0 issue "letsencrypt.org"', "0", ""),
+            ("example.com", "HTTPS", '1 . alpn="h2,h3"', "0", ""),
+        ]
+        responses.post(
+            url=urljoin(API_ENDPOINT, "dns/retrieve/example.com"),
+            json={
+                "status": "SUCCESS",
+                "records": [
+                    {
+                        "id": str(i),
+                        "name": name,
+                        "type": record_type,
+                        "content": content,
+                        "ttl": "600",
+                        "prio": prio,
+                        "notes": notes,
+                    }
+                    for i, (name, record_type, content, prio, notes) in enumerate(
+                        records
+                    )
+                ],
+            },
+        )
+        pkb_client = PKBClient(
+            "key", "secret", soa_provider=OfflineSOAProvider(clock=lambda: 0)
+        )
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filepath = Path(temp_dir, "example.com.bind")
+            self.assertTrue(pkb_client.export_bind_dns_records("example.com", filepath))
+            with open(filepath) as f:
+                zone = dns.zone.from_text(f.read(), relativize=False)
+
+        def rdata(name, record_type):
+            return [r.to_text() for r in zone.find_rdataset(f"{name}.", record_type)]
+
+        self.assertEqual(["curitiba.ns.porkbun.com."], rdata("example.com", "NS"))
+        self.assertEqual(["1.2.3.4"], rdata("example.com", "A"))
+        self.assertEqual(["2001:db8::1"], rdata("example.com", "AAAA"))
+        self.assertEqual(["example.com."], rdata("www.example.com", "CNAME"))
+        self.assertEqual(["10 mail.example.com."], rdata("example.com", "MX"))
+        self.assertEqual(
+            ["10 5 5060 sip.example.com."], rdata("_sip._tcp.example.com", "SRV")
+        )
+        self.assertEqual(['"v=spf1 -all \\"quoted\\""'], rdata("example.com", "TXT"))
+        self.assertEqual(
+            [f'"{"a" * 255}" "{"a" * 45}"'], rdata("long.example.com", "TXT")
+        )
+        self.assertEqual(['0 issue "letsencrypt.org"'], rdata("example.com", "CAA"))
+        self.assertEqual(['1 . alpn="h2,h3"'], rdata("example.com", "HTTPS"))
+
+
+class TestLazyImport(unittest.TestCase):
+    def _loaded_modules(self, code: str) -> List[str]:
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                code + "\nimport sys\nprint(' '.join(sys.modules))",
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        return result.stdout.split()
+
+    def test_import_package(self):
+        modules = self._loaded_modules("import pkb_client.client")
+
+        self.assertNotIn("requests", modules)
+        self.assertNotIn("dns.resolver", modules)
+        self.assertNotIn("pkb_client.client.client", modules)
+
+    def test_import_client(self):
+        modules = self._loaded_modules("from pkb_client.client import PKBClient")
+
+        self.assertIn("pkb_client.client.client", modules)
+        self.assertNotIn("dns.resolver", modules)
+        self.assertNotIn("concurrent.futures.process", modules)
+        # the optional subsystems are imported by the methods which use them
+        self.assertNotIn("sqlite3", modules)
+        self.assertNotIn("gzip", modules)
+        self.assertNotIn("pkb_client.client.bind_file", modules)
+
+    def test_cli_help(self):
+        modules = self._loaded_modules(
+            "import sys\n"
+            "sys.argv = ['pkb-client', '--help']\n"
+            "from pkb_client.cli.cli import main\n"
+            "try:\n"
+            "    main()\n"
+            "except SystemExit:\n"
+            "    pass"
+        )
+
+        self.assertIn("pkb_client.cli.cli", modules)
+        self.assertNotIn("requests", modules)
+        self.assertNotIn("pkb_client.client.client", modules)
+
+    def test_unknown_attribute(self):
+        import pkb_client.client
+
+        with self.assertRaises(AttributeError):
+            _ = pkb_client.client.Unknown
+
+    def test_dir(self):
+        import pkb_client.client
+
+        self.assertIn("PKBClient", dir(pkb_client.client))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,60 @@
+import os
+import stat
+import tempfile
+import unittest
+from pathlib import Path
+
+from pkb_client.client import export
+from pkb_client.client.export import open_file_atomic, write_file_atomic
+
+
+@unittest.skipIf(os.name != "posix", "file modes are only supported on POSIX")
+class TestOpenFileAtomic(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name) / "records.json"
+        self.umask = os.umask(0o027)
+        # the umask of the process is cached on first use
+        export._UMASK = None
+
+    def tearDown(self):
+        os.umask(self.umask)
+        export._UMASK = None
+        self.tmp_dir.cleanup()
+
+    def _mode(self):
+        return stat.S_IMODE(os.stat(self.path).st_mode)
+
+    def test_new_file_mode(self):
+        reference = Path(self.tmp_dir.name) / "reference"
+        with open(reference, "w"):
+            pass
+
+        write_file_atomic(self.path, "content")
+
+        self.assertEqual(stat.S_IMODE(os.stat(reference).st_mode), self._mode())
+        self.assertEqual("content", self.path.read_text())
+
+    def test_existing_file_mode(self):
+        self.path.write_text("old")
+        os.chmod(self.path, 0o640)
+
+        write_file_atomic(self.path, "new")
+
+        self.assertEqual(0o640, self._mode())
+        self.assertEqual("new", self.path.read_text())
+
+    def test_interrupted(self):
+        self.path.write_text("old")
+
+        with self.assertRaises(RuntimeError):
+            with open_file_atomic(self.path) as f:
+                f.write("new")
+                raise RuntimeError("interrupted")
+
+        self.assertEqual("old", self.path.read_text())
+        self.assertEqual(["records.json"], os.listdir(self.tmp_dir.name))
+
+
+if __name__ == "__main__":
+    unittest.main()
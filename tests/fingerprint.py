@@ -0,0 +1,198 @@
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from pkb_client.client import PKBClient
+from pkb_client.client.dispatch import APIResponse
+from pkb_client.client.fingerprint import FingerprintIndex, zone_fingerprint
+from pkb_client.client.snapshot import SnapshotStore
+from tests.helpers import dns_record
+
+
+class TestZoneFingerprint(unittest.TestCase):
+    def test_order_independent(self):
+        records = [
+            dns_record("1", "example.com", "127.0.0.1"),
+            dns_record("2", "www.example.com", "127.0.0.2"),
+        ]
+
+        self.assertEqual(
+            zone_fingerprint(records), zone_fingerprint(list(reversed(records)))
+        )
+
+    def test_changes(self):
+        records = [dns_record("1", "example.com", "127.0.0.1")]
+        fingerprint = zone_fingerprint(records)
+
+        self.assertNotEqual(fingerprint, zone_fingerprint([]))
+        self.assertNotEqual(fingerprint, zone_fingerprint(records * 2))
+        self.assertNotEqual(
+            fingerprint,
+            zone_fingerprint([dns_record("1", "example.com", "127.0.0.2")]),
+        )
+
+
+class TestFingerprintIndex(unittest.TestCase):
+    def test_persistence(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir, "sub", "fingerprints.json")
+            index = FingerprintIndex(path)
+            empty_root = index.root
+            index.update("example.com", "a")
+            index.update("example.org", "b")
+            root = index.root
+            index.save()
+
+            loaded = FingerprintIndex(path)
+
+        self.assertNotEqual(empty_root, root)
+        self.assertEqual(root, loaded.root)
+        self.assertEqual(2, len(loaded))
+        self.assertTrue(loaded.is_unchanged("example.com", "a"))
+        self.assertFalse(loaded.is_unchanged("example.com", "b"))
+        self.assertFalse(loaded.is_unchanged("example.net", "a"))
+
+        loaded.remove("example.com")
+        self.assertNotIn("example.com", loaded)
+        self.assertNotEqual(root, loaded.root)
+
+
+class TestClientFingerprints(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.records = {
+            "example.com": [dns_record("1", "example.com", "127.0.0.1")],
+            "example.org": [dns_record("2", "example.org", "127.0.0.2")],
+        }
+        self.sent = []
+        lock = threading.Lock()
+
+        def middleware(request, call_next):
+            with lock:
+                self.sent.append(request.endpoint)
+            if request.endpoint == "domain/listAll":
+                domains = [
+                    {
+                        "domain": domain,
+                        "status": "ACTIVE",
+                        "tld": domain.split(".")[-1],
+                        "createDate": "2020-01-01 00:00:00",
+                        "expireDate": "2030-01-01 00:00:00",
+                        "securityLock": "1",
+                        "whoisPrivacy": "1",
+                        "autoRenew": 0,
+                        "notLocal": 0,
+                    }
+                    for domain in self.records
+                ]
+                if request.json["start"]:
+                    domains = []
+                return APIResponse(200, {"status": "SUCCESS", "domains": domains})
+            domain = request.endpoint.split("/")[2]
+            return APIResponse(
+                200,
+                {
+                    "status": "SUCCESS",
+                    "records": [r.to_dict() for r in self.records[domain]],
+                },
+            )
+
+        self.pkb_client = PKBClient(
+            "key",
+            "secret",
+            middlewares=[middleware],
+            snapshot_store=SnapshotStore(Path(self.temp_dir.name, "snapshots")),
+        )
+        self.index_path = Path(self.temp_dir.name, "fingerprints.json")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_export_all_dns_records(self):
+        directory = Path(self.temp_dir.name, "export")
+
+        first = self.pkb_client.export_all_dns_records(
+            directory, fingerprint_index=FingerprintIndex(self.index_path)
+        )
+        self.records["example.org"] = [dns_record("2", "example.org", "127.0.0.9")]
+        second = self.pkb_client.export_all_dns_records(
+            directory, fingerprint_index=FingerprintIndex(self.index_path)
+        )
+        # a missing file is exported again even if the DNS records did not change
+        Path(directory, "example.com.json").unlink()
+        third = self.pkb_client.export_all_dns_records(
+            directory, fingerprint_index=FingerprintIndex(self.index_path)
+        )
+
+        self.assertEqual(["example.com", "example.org"], sorted(first.exported))
+        self.assertEqual(["example.org"], second.exported)
+        self.assertEqual(["example.com"], second.skipped)
+        self.assertEqual(["example.com"], third.exported)
+        self.assertEqual(["example.org"], third.skipped)
+        with open(Path(directory, "example.org.json")) as f:
+            self.assertIn("127.0.0.9", f.read())
+
+    def test_snapshot_dns_records(self):
+        first = self.pkb_client.snapshot_dns_records(
+            fingerprint_index=FingerprintIndex(self.index_path)
+        )
+        second = self.pkb_client.snapshot_dns_records(
+            fingerprint_index=FingerprintIndex(self.index_path)
+        )
+        self.records["example.org"] = []
+        third = self.pkb_client.snapshot_dns_records(
+            fingerprint_index=FingerprintIndex(self.index_path)
+        )
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first.id, third.id)
+        self.assertEqual(
+            [first.id, third.id],
+            self.pkb_client.snapshot_store.list_snapshot_ids(),
+        )
+
+    def test_snapshot_dns_records_other_domains(self):
+        first = self.pkb_client.snapshot_dns_records(
+            fingerprint_index=FingerprintIndex(self.index_path)
+        )
+        # the zone of the removed domain is unchanged, but the newest snapshot still contains it
+        second = self.pkb_client.snapshot_dns_records(
+            ["example.com"], fingerprint_index=FingerprintIndex(self.index_path)
+        )
+        third = self.pkb_client.snapshot_dns_records(
+            ["example.com"], fingerprint_index=FingerprintIndex(self.index_path)
+        )
+
+        self.assertEqual(["example.com", "example.org"], sorted(first.zones))
+        self.assertNotEqual(first.id, second.id)
+        self.assertEqual(["example.com"], list(second.zones))
+        self.assertEqual(second, third)
+        self.assertEqual(
+            [first.id, second.id],
+            self.pkb_client.snapshot_store.list_snapshot_ids(),
+        )
+
+    def test_snapshot_dns_records_shared_index(self):
+        first = self.pkb_client.snapshot_dns_records(
+            fingerprint_index=FingerprintIndex(self.index_path)
+        )
+        # an export with the same index records the changed zone, which is not part of the newest snapshot
+        self.records["example.org"] = [dns_record("2", "example.org", "127.0.0.9")]
+        self.pkb_client.export_all_dns_records(
+            Path(self.temp_dir.name, "export"),
+            fingerprint_index=FingerprintIndex(self.index_path),
+        )
+        second = self.pkb_client.snapshot_dns_records(
+            fingerprint_index=FingerprintIndex(self.index_path)
+        )
+
+        self.assertNotEqual(first.id, second.id)
+        self.assertEqual(
+            self.records["example.org"],
+            self.pkb_client.snapshot_store.load_zone("example.org", second.id),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
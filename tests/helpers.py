@@ -0,0 +1,42 @@
+from pkb_client.client.dns import DNSRecord, DNSRecordType
+
+
+class FakeClock:
+    """
+    Clock which only advances when the time is set or the sleep function is called.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def dns_record(
+    record_id,
+    name="example.com",
+    content="127.0.0.1",
+    record_type=DNSRecordType.A,
+    ttl=600,
+    prio=None,
+):
+    return DNSRecord(record_id, name, record_type, content, ttl, prio, "")
+
+
+def api_dns_record(record_id, name="example.com", content="127.0.0.1"):
+    # the DNS record as returned by the API, which sends all values as strings
+    return {
+        "id": record_id,
+        "name": name,
+        "type": "A",
+        "content": content,
+        "ttl": "600",
+        "prio": "0",
+        "notes": "",
+    }
@@ -0,0 +1,272 @@
+import sqlite3
+import tempfile
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from urllib.parse import urljoin
+
+import responses
+
+from pkb_client.client import API_ENDPOINT, PKBClient, PKBClientException
+from pkb_client.client.dispatch import APIRequest, APIResponse
+from pkb_client.client.domain import DomainCheckRateLimit
+from pkb_client.client.rate_limit import (
+    RateLimiter,
+    RateLimitMiddleware,
+    SQLiteRateLimitBackend,
+)
+from tests.helpers import FakeClock
+
+
+class TestRateLimiter(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def _rate_limiter(self, **kwargs):
+        return RateLimiter(clock=self.clock, sleep=self.clock.sleep, **kwargs)
+
+    def test_unknown_limit(self):
+        rate_limiter = self._rate_limiter()
+
+        for _ in range(100):
+            rate_limiter.acquire("dns/retrieve")
+
+        self.assertEqual([], self.clock.sleeps)
+        self.assertIsNone(rate_limiter.get_limit("dns/retrieve"))
+
+    def test_default_limit(self):
+        rate_limiter = self._rate_limiter(default_limit=(2, 1))
+
+        for _ in range(4):
+            rate_limiter.acquire("dns/retrieve")
+
+        self.assertEqual([0.5, 0.5], self.clock.sleeps)
+
+    def test_burst_and_refill(self):
+        rate_limiter = self._rate_limiter(limits={"domain/checkDomain": (2, 10)})
+
+        rate_limiter.acquire("domain/checkDomain")
+        rate_limiter.acquire("domain/checkDomain")
+        self.assertEqual([], self.clock.sleeps)
+
+        rate_limiter.acquire("domain/checkDomain")
+        self.assertEqual([5], self.clock.sleeps)
+
+        self.clock.now += 10
+        rate_limiter.acquire("domain/checkDomain")
+        rate_limiter.acquire("domain/checkDomain")
+        self.assertEqual([5], self.clock.sleeps)
+
+    def test_queued_callers(self):
+        rate_limiter = self._rate_limiter(limits={"domain/checkDomain": (1, 10)})
+
+        self.assertEqual(0, rate_limiter.reserve("domain/checkDomain"))
+        self.assertEqual(10, rate_limiter.reserve("domain/checkDomain"))
+        self.assertEqual(20, rate_limiter.reserve("domain/checkDomain"))
+
+    def test_clock_going_backwards(self):
+        rate_limiter = self._rate_limiter(limits={"domain/checkDomain": (1, 10)})
+        self.clock.now = 1000
+        self.assertEqual(0, rate_limiter.reserve("domain/checkDomain"))
+
+        # e.g. the monotonic clock restarted after a reboot, the refill starts again from the new time
+        self.clock.now = 5
+        waits = []
+        for _ in range(3):
+            waits.append(rate_limiter.reserve("domain/checkDomain"))
+            self.clock.now += 100
+
+        self.assertEqual([10, 0, 0], waits)
+
+    def test_calibrate(self):
+        rate_limiter = self._rate_limiter()
+
+        rate_limiter.calibrate(
+            "domain/checkDomain",
+            DomainCheckRateLimit(
+                ttl=10,
+                limit=1,
+                used=1,
+                natural_language="1 out of 1 checks within 10 seconds used.",
+            ),
+        )
+
+        self.assertEqual((1, 10), rate_limiter.get_limit("domain/checkDomain"))
+        rate_limiter.acquire("domain/checkDomain")
+        self.assertEqual([10], self.clock.sleeps)
+
+    def test_invalid_limit(self):
+        with self.assertRaises(ValueError):
+            self._rate_limiter(limits={"domain/checkDomain": (0, 10)})
+
+
+def _reserve_shared(path, count):
+    rate_limiter = RateLimiter(backend=SQLiteRateLimitBackend(path))
+    return [rate_limiter.reserve("domain/checkDomain") for _ in range(count)]
+
+
+class TestSQLiteRateLimitBackend(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name) / "rate_limit.sqlite"
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_shared_state(self):
+        clock = FakeClock()
+        rate_limiter_1 = RateLimiter(
+            backend=SQLiteRateLimitBackend(self.path), clock=clock, sleep=clock.sleep
+        )
+        rate_limiter_2 = RateLimiter(
+            backend=SQLiteRateLimitBackend(self.path), clock=clock, sleep=clock.sleep
+        )
+
+        rate_limiter_1.set_limit("domain/checkDomain", 1, 10)
+
+        self.assertEqual((1, 10), rate_limiter_2.get_limit("domain/checkDomain"))
+        self.assertEqual(0, rate_limiter_1.reserve("domain/checkDomain"))
+        self.assertEqual(10, rate_limiter_2.reserve("domain/checkDomain"))
+        self.assertEqual(20, rate_limiter_1.reserve("domain/checkDomain"))
+
+    def test_wall_clock(self):
+        # the monotonic clock restarts with every reboot, but the database file is kept
+        rate_limiter = RateLimiter(backend=SQLiteRateLimitBackend(self.path))
+        rate_limiter.set_limit("domain/checkDomain", 1, 10)
+
+        with sqlite3.connect(self.path) as connection:
+            (updated,) = connection.execute("SELECT updated FROM buckets").fetchone()
+        self.assertAlmostEqual(time.time(), updated, delta=60)
+
+    def test_multiple_processes(self):
+        RateLimiter(backend=SQLiteRateLimitBackend(self.path)).set_limit(
+            "domain/checkDomain", 2, 1000
+        )
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            waits = [
+                wait
+                for result in executor.map(_reserve_shared, [self.path] * 2, [3] * 2)
+                for wait in result
+            ]
+
+        # two calls are allowed immediately, the other calls are queued one after another
+        self.assertEqual(2, sum(1 for wait in waits if wait == 0))
+        queued = sorted(wait for wait in waits if wait > 0)
+        self.assertEqual(4, len(queued))
+        for previous, current in zip(queued[:-1], queued[1:], strict=True):
+            self.assertAlmostEqual(500, current - previous, delta=1)
+
+
+class TestRateLimitMiddleware(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.rate_limiter = RateLimiter(clock=self.clock, sleep=self.clock.sleep)
+        self.middleware = RateLimitMiddleware(self.rate_limiter)
+
+    def test_calibrate_from_limits(self):
+        request = APIRequest("domain/checkDomain/example.com", "", read_only=True)
+        response = APIResponse(
+            200,
+            {
+                "status": "SUCCESS",
+                "response": {},
+                "limits": {
+                    "TTL": "10",
+                    "limit": "1",
+                    "used": 1,
+                    "naturalLanguage": "1 out of 1 checks within 10 seconds used.",
+                },
+            },
+        )
+
+        self.middleware(request, lambda r: response)
+        self.assertEqual([], self.clock.sleeps)
+        self.assertEqual((1, 10), self.rate_limiter.get_limit("domain/checkDomain"))
+
+        self.middleware(request, lambda r: response)
+        self.assertEqual([10], self.clock.sleeps)
+
+    def test_calibrate_from_error(self):
+        request = APIRequest("domain/checkDomain/example.com", "", read_only=True)
+        response = APIResponse(
+            503,
+            {
+                "status": "ERROR",
+                "message": "2 out of 2 checks within 30 seconds used.",
+            },
+        )
+
+        self.middleware(request, lambda r: response)
+
+        self.assertEqual((2, 30), self.rate_limiter.get_limit("domain/checkDomain"))
+        self.middleware(request, lambda r: response)
+        self.assertEqual([15], self.clock.sleeps)
+
+
+class TestClientRateLimit(unittest.TestCase):
+    @responses.activate
+    def test_get_domain_availability(self):
+        clock = FakeClock()
+        pkb_client = PKBClient(
+            "key",
+            "secret",
+            rate_limiter=RateLimiter(clock=clock, sleep=clock.sleep),
+        )
+
+        responses.post(
+            url=urljoin(API_ENDPOINT, "domain/checkDomain/example.com"),
+            json={
+                "status": "SUCCESS",
+                "response": {
+                    "avail": "yes",
+                    "type": "registration",
+                    "price": "8.56",
+                    "firstYearPromo": "no",
+                    "regularPrice": "8.56",
+                    "premium": "no",
+                },
+                "limits": {
+                    "TTL": "10",
+                    "limit": "1",
+                    "used": 1,
+                    "naturalLanguage": "1 out of 1 checks within 10 seconds used.",
+                },
+            },
+        )
+
+        pkb_client.get_domain_availability("example.com")
+        pkb_client.get_domain_availability("example.com")
+
+        self.assertEqual([10], clock.sleeps)
+        self.assertEqual(2, len(responses.calls))
+
+    @responses.activate
+    def test_rate_limited_error(self):
+        clock = FakeClock()
+        pkb_client = PKBClient(
+            "key",
+            "secret",
+            rate_limiter=RateLimiter(clock=clock, sleep=clock.sleep),
+        )
+
+        responses.post(
+            url=urljoin(API_ENDPOINT, "domain/checkDomain/example.com"),
+            json={
+                "status": "ERROR",
+                "message": "1 out of 1 checks within 10 seconds used.",
+            },
+            status=503,
+        )
+
+        with self.assertRaises(PKBClientException):
+            pkb_client.get_domain_availability("example.com")
+
+        self.assertEqual(
+            (1, 10), pkb_client.rate_limiter.get_limit("domain/checkDomain")
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,469 @@
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from urllib.parse import urljoin
+
+import responses
+from responses import matchers
+from responses.registries import OrderedRegistry
+
+from pkb_client.client import API_ENDPOINT, PKBClient, PKBClientException
+from pkb_client.client.dispatch import APIResponse
+from pkb_client.client.dns import DNSRecordType, DNSRestoreMode
+from pkb_client.client.reconcile import compute_reconcile_plan, subdomain_of
+from pkb_client.client.snapshot import SnapshotStore
+from pkb_client.client.soa import OfflineSOAProvider
+from tests.helpers import dns_record
+
+
+class TestReconcilePlan(unittest.TestCase):
+    def test_unchanged(self):
+        existing = [
+            dns_record("1", "example.com", "127.0.0.1", DNSRecordType.A),
+            dns_record("2", "example.com", "127.0.0.2", DNSRecordType.A),
+            dns_record(
+                "3", "example.com", "mail.example.com", DNSRecordType.MX, prio=10
+            ),
+        ]
+        desired = [
+            dns_record("", "EXAMPLE.COM.", "127.0.0.2", DNSRecordType.A),
+            dns_record(
+                "", "example.com", "mail.example.com", DNSRecordType.MX, prio=10
+            ),
+            dns_record("", "example.com", "127.0.0.1", DNSRecordType.A),
+        ]
+
+        plan = compute_reconcile_plan(desired, existing)
+
+        self.assertEqual(0, plan.changes)
+
+    def test_minimal_changes(self):
+        existing = [
+            dns_record("1", "example.com", "127.0.0.1", DNSRecordType.A),
+            dns_record("2", "example.com", "127.0.0.2", DNSRecordType.A),
+            dns_record("3", "www.example.com", "example.com", DNSRecordType.CNAME),
+            dns_record("4", "old.example.com", "127.0.0.4", DNSRecordType.A),
+            dns_record("5", "example.com", "v=spf1 -all", DNSRecordType.TXT),
+        ]
+        desired = [
+            dns_record("", "example.com", "127.0.0.1", DNSRecordType.A),
+            dns_record("", "example.com", "127.0.0.3", DNSRecordType.A),
+            dns_record("", "www.example.com", "example.com", DNSRecordType.CNAME, 3600),
+            dns_record("", "new.example.com", "127.0.0.5", DNSRecordType.A),
+            dns_record("", "example.com", "v=spf1 -all", DNSRecordType.TXT),
+        ]
+
+        plan = compute_reconcile_plan(desired, existing)
+
+        self.assertEqual(4, plan.changes)
+        self.assertEqual([desired[3]], plan.creates)
+        self.assertEqual(
+            [(existing[2], desired[2]), (existing[1], desired[1])], plan.updates
+        )
+        self.assertEqual([existing[3]], plan.deletes)
+
+    def test_prio_identity(self):
+        existing = [
+            dns_record(
+                "1", "example.com", "mail.example.com", DNSRecordType.MX, prio=10
+            ),
+            # the API returns a prio for records which do not support it
+            dns_record("2", "example.com", "127.0.0.1", DNSRecordType.A, prio=0),
+        ]
+        desired = [
+            dns_record(
+                "", "example.com", "mail.example.com", DNSRecordType.MX, prio=20
+            ),
+            dns_record("", "example.com", "127.0.0.1", DNSRecordType.A),
+        ]
+
+        plan = compute_reconcile_plan(desired, existing)
+
+        self.assertEqual([(existing[0], desired[0])], plan.updates)
+        self.assertEqual([], plan.creates)
+        self.assertEqual([], plan.deletes)
+
+    def test_subdomain_of(self):
+        self.assertEqual("", subdomain_of("example.com.", "example.com"))
+        self.assertEqual("sub", subdomain_of("sub.example.com", "example.com"))
+        self.assertEqual("a.b", subdomain_of("A.B.example.co.uk", "example.co.uk"))
+        self.assertEqual("sub", subdomain_of("sub", "example.com"))
+
+
+class TestClientReconcile(unittest.TestCase):
+    def _retrieve(self):
+        responses.post(
+            url=urljoin(API_ENDPOINT, "dns/retrieve/example.com"),
+            json={
+                "status": "SUCCESS",
+                "records": [
+                    {
+                        "id": "1",
+                        "name": "example.com",
+                        "type": "A",
+                        "content": "127.0.0.1",
+                        "ttl": "600",
+                        "prio": "0",
+                        "notes": "",
+                    },
+                    {
+                        "id": "2",
+                        "name": "old.example.com",
+                        "type": "A",
+                        "content": "127.0.0.2",
+                        "ttl": "600",
+                        "prio": "0",
+                        "notes": "",
+                    },
+                ],
+            },
+        )
+
+    @responses.activate(registry=OrderedRegistry, assert_all_requests_are_fired=True)
+    def test_reconcile_dns_records(self):
+        pkb_client = PKBClient("key", "secret")
+        self._retrieve()
+        responses.post(
+            url=urljoin(API_ENDPOINT, "dns/delete/example.com/2"),
+            json={"status": "SUCCESS"},
+        )
+        responses.post(
+            url=urljoin(API_ENDPOINT, "dns/create/example.com"),
+            json={"status": "SUCCESS", "id": "3"},
+            match=[
+                matchers.json_params_matcher(
+                    {
+                        "apikey": "key",
+                        "secretapikey": "secret",
+                        "name": "new",
+                        "type": "AAAA",
+                        "content": "::1",
+                        "ttl": 600,
+                        "prio": None,
+                    }
+                )
+            ],
+        )
+
+        plan = pkb_client.reconcile_dns_records(
+            "example.com",
+            [
+                dns_record("", "example.com", "127.0.0.1", DNSRecordType.A),
+                dns_record("", "new.example.com", "::1", DNSRecordType.AAAA),
+            ],
+        )
+
+        self.assertEqual(2, plan.changes)
+
+    @responses.activate(assert_all_requests_are_fired=True)
+    def test_reconcile_dns_records_dry_run(self):
+        pkb_client = PKBClient("key", "secret")
+        self._retrieve()
+
+        plan = pkb_client.reconcile_dns_records(
+            "example.com",
+            [dns_record("", "example.com", "127.0.0.1", DNSRecordType.A, ttl=3600)],
+            dry_run=True,
+        )
+
+        self.assertEqual(1, len(plan.updates))
+        self.assertEqual(1, len(plan.deletes))
+        self.assertEqual(1, len(responses.calls))
+
+
+class TestParallelReconcile(unittest.TestCase):
+    def _client(self, existing, failing_endpoint=None):
+        sent = []
+        lock = threading.Lock()
+
+        def middleware(request, call_next):
+            with lock:
+                sent.append(request.endpoint)
+            if request.endpoint.startswith("dns/retrieve"):
+                return APIResponse(
+                    200,
+                    {
+                        "status": "SUCCESS",
+                        "records": [record.to_dict() for record in existing],
+                    },
+                )
+            if request.endpoint == failing_endpoint:
+                return APIResponse(400, {"status": "ERROR", "message": "invalid"})
+            return APIResponse(200, {"status": "SUCCESS", "id": "1"})
+
+        return PKBClient("key", "secret", middlewares=[middleware]), sent
+
+    def test_parallel_phases(self):
+        existing = [
+            dns_record(str(i), f"old{i}.example.com", "127.0.0.1", DNSRecordType.A)
+            for i in range(20)
+        ]
+        desired = [
+            dns_record("", f"new{i}.example.com", "127.0.0.1", DNSRecordType.A)
+            for i in range(20)
+        ]
+        pkb_client, sent = self._client(existing)
+        progress = []
+
+        plan = pkb_client.reconcile_dns_records(
+            "example.com",
+            desired,
+            max_workers=8,
+            progress=lambda done, total: progress.append((done, total)),
+        )
+
+        self.assertEqual(40, plan.changes)
+        self.assertEqual([(i, 40) for i in range(1, 41)], progress)
+        # all deletes are finished before the first create
+        self.assertTrue(all(e.startswith("dns/delete") for e in sent[1:21]))
+        self.assertTrue(all(e.startswith("dns/create") for e in sent[21:]))
+
+    def test_parallel_failure(self):
+        existing = [
+            dns_record(str(i), f"old{i}.example.com", "127.0.0.1", DNSRecordType.A)
+            for i in range(5)
+        ]
+        desired = [dns_record("", "new.example.com", "127.0.0.1", DNSRecordType.A)]
+        pkb_client, sent = self._client(existing, "dns/delete/example.com/3")
+
+        with self.assertRaises(PKBClientException):
+            pkb_client.reconcile_dns_records("example.com", desired, max_workers=4)
+
+        # the next phase is not started after a failure
+        self.assertNotIn("dns/create/example.com", sent)
+
+    def test_invalid_max_workers(self):
+        pkb_client, sent = self._client([])
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            pkb_client.snapshot_store = SnapshotStore(temp_dir)
+            imports = {
+                "reconcile_dns_records": lambda: pkb_client.reconcile_dns_records(
+                    "example.com", [], max_workers=0
+                ),
+                "import_dns_records": lambda: pkb_client.import_dns_records(
+                    "example.com", "records.json", DNSRestoreMode.clear, max_workers=0
+                ),
+                "import_bind_dns_records": lambda: pkb_client.import_bind_dns_records(
+                    "example.com.bind", DNSRestoreMode.clear, max_workers=0
+                ),
+                "import_bind_directory": lambda: pkb_client.import_bind_directory(
+                    temp_dir, DNSRestoreMode.clear, max_workers=0
+                ),
+                "restore_dns_records_snapshot": lambda: (
+                    pkb_client.restore_dns_records_snapshot(
+                        "example.com", DNSRestoreMode.clear, max_workers=0
+                    )
+                ),
+            }
+            for name, call in imports.items():
+                with self.subTest(method=name), self.assertRaises(ValueError):
+                    call()
+
+            # the arguments are validated before the DNS records are retrieved and a backup is written
+            self.assertEqual([], sent)
+            self.assertEqual([], pkb_client.snapshot_store.list_snapshot_ids())
+
+
+class TestBindImportModes(unittest.TestCase):
+    BIND = (
+        "$ORIGIN example.com.\n"
+        "$TTL 1234\n"
+        "@ IN SOA dns.example.com. dns2.example.com. (100 300 100 6000 600)\n"
+        "example.com. IN 600 A 127.0.0.1\n"
+        "sub 600 IN A 127.0.0.3\n"
+        "new.example.com. 600 IN A 127.0.0.4\n"
+        "example.com IN 86400 NS ns1.example.com."
+    )
+
+    def _import(self, restore_mode):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filename = Path(temp_dir, "records.bind")
+            with open(filename, "w") as f:
+                f.write(self.BIND)
+            pkb_client = PKBClient("key", "secret")
+            return pkb_client.import_bind_dns_records(filename, restore_mode)
+
+    def _retrieve(self):
+        responses.post(
+            url=urljoin(API_ENDPOINT, "dns/retrieve/example.com"),
+            json={
+                "status": "SUCCESS",
+                "records": [
+                    {
+                        "id": "1",
+                        "name": "example.com",
+                        "type": "A",
+                        "content": "127.0.0.1",
+                        "ttl": "600",
+                        "prio": "0",
+                        "notes": "",
+                    },
+                    {
+                        "id": "2",
+                        "name": "sub.example.com",
+                        "type": "A",
+                        "content": "127.0.0.2",
+                        "ttl": "600",
+                        "prio": "0",
+                        "notes": "",
+                    },
+                ],
+            },
+        )
+
+    @responses.activate(registry=OrderedRegistry, assert_all_requests_are_fired=True)
+    def test_import_bind_dns_records_replace(self):
+        self._retrieve()
+        responses.post(
+            url=urljoin(API_ENDPOINT, "dns/edit/example.com/2"),
+            json={"status": "SUCCESS"},
+            match=[
+                matchers.json_params_matcher(
+                    {
+                        "apikey": "key",
+                        "secretapikey": "secret",
+                        "name": "sub",
+                        "type": "A",
+                        "content": "127.0.0.3",
+                        "ttl": 600,
+                        "prio": None,
+                    }
+                )
+            ],
+        )
+        responses.post(
+            url=urljoin(API_ENDPOINT, "domain/updateNs/example.com"),
+            json={"status": "SUCCESS"},
+        )
+
+        self.assertTrue(self._import(DNSRestoreMode.replace))
+
+    @responses.activate(registry=OrderedRegistry, assert_all_requests_are_fired=True)
+    def test_import_bind_dns_records_keep(self):
+        self._retrieve()
+        responses.post(
+            url=urljoin(API_ENDPOINT, "dns/create/example.com"),
+            json={"status": "SUCCESS", "id": "3"},
+            match=[
+                matchers.json_params_matcher(
+                    {
+                        "apikey": "key",
+                        "secretapikey": "secret",
+                        "name": "new",
+                        "type": "A",
+                        "content": "127.0.0.4",
+                        "ttl": 600,
+                        "prio": None,
+                    }
+                )
+            ],
+        )
+
+        self.assertTrue(self._import(DNSRestoreMode.keep))
+
+
+class TestBindReimport(unittest.TestCase):
+    RECORDS = [
+        ("1", "example.com", "A", "127.0.0.1", "0"),
+        ("2", "example.com", "MX", "mail.example.com", "10"),
+        ("3", "www.example.com", "CNAME", "example.com", "0"),
+        ("4", "example.com", "TXT", "v=spf1 -all", "0"),
+        ("5", "alias.example.com", "ALIAS", "example.net", "0"),
+        ("6", "_sip._tcp.example.com", "SRV", "5 5060 sip.example.com", "10"),
+    ]
+
+    def _retrieve(self):
+        responses.post(
+            url=urljoin(API_ENDPOINT, "dns/retrieve/example.com"),
+            json={
+                "status": "SUCCESS",
+                "records": [
+                    {
+                        "id": record_id,
+                        "name": name,
+                        "type": record_type,
+                        "content": content,
+                        "ttl": "600",
+                        "prio": prio,
+                        "notes": "",
+                    }
+                    for record_id, name, record_type, content, prio in self.RECORDS
+                ],
+            },
+        )
+
+    @responses.activate(registry=OrderedRegistry, assert_all_requests_are_fired=True)
+    def test_reimport_unchanged_export(self):
+        self._retrieve()
+        self._retrieve()
+        pkb_client = PKBClient("key", "secret", soa_provider=OfflineSOAProvider())
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filename = Path(temp_dir, "example.com.bind")
+            pkb_client.export_bind_dns_records("example.com", filename)
+            self.assertTrue(
+                pkb_client.import_bind_dns_records(filename, DNSRestoreMode.clear)
+            )
+
+        # only the DNS records were retrieved for the export and the import, nothing was changed
+        self.assertEqual(2, len(responses.calls))
+
+
+class TestBindDirectoryImport(unittest.TestCase):
+    def test_import_bind_directory(self):
+        sent = []
+        lock = threading.Lock()
+
+        def middleware(request, call_next):
+            with lock:
+                sent.append(request.endpoint)
+            if request.endpoint.startswith("dns/retrieve"):
+                return APIResponse(200, {"status": "SUCCESS", "records": []})
+            if request.endpoint == "dns/create/example1.com":
+                return APIResponse(400, {"status": "ERROR", "message": "invalid"})
+            return APIResponse(200, {"status": "SUCCESS", "id": "1"})
+
+        pkb_client = PKBClient("key", "secret", middlewares=[middleware])
+        progress = []
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for i in range(3):
+                with open(Path(temp_dir, f"example{i}.com.bind"), "w") as f:
+                    f.write(f"$ORIGIN example{i}.com.\n$TTL 600\nwww A 127.0.0.1\n")
+            with open(Path(temp_dir, "invalid.bind"), "w") as f:
+                f.write("$ORIGIN example.com.\nwww A 127.0.0.1\n")
+
+            with patch.object(PKBClient, "__handle_error_backup__") as backup:
+                results = pkb_client.import_bind_directory(
+                    temp_dir,
+                    DNSRestoreMode.clear,
+                    parse_workers=2,
+                    progress=lambda done, total: progress.append((done, total)),
+                )
+
+        self.assertEqual(
+            ["example0.com", "example1.com", "example2.com", None],
+            [result.domain for result in results],
+        )
+        self.assertEqual([True, False, True, False], [result.ok for result in results])
+        self.assertIsInstance(results[1].error, PKBClientException)
+        self.assertIsInstance(results[3].error, ValueError)
+        self.assertTrue(all(result.parse_duration > 0 for result in results))
+        self.assertEqual(0, results[3].import_duration)
+        self.assertEqual([(i, 4) for i in range(1, 5)], progress)
+        self.assertEqual(1, backup.call_count)
+        self.assertEqual(
+            [
+                f"dns/{action}/example{i}.com"
+                for i in range(3)
+                for action in ("retrieve", "create")
+            ],
+            sent,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
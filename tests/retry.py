@@ -0,0 +1,176 @@
+import unittest
+from urllib.parse import urljoin
+
+import requests
+import responses
+from responses.registries import OrderedRegistry
+
+from pkb_client.client import API_ENDPOINT, PKBClient, PKBClientException
+from pkb_client.client.dispatch import APIRequest, APIResponse
+from pkb_client.client.dns import DNSRecordType
+from pkb_client.client.retry import RetryMiddleware, RetryPolicy, parse_retry_after
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_backoff(self):
+        policy = RetryPolicy(backoff_factor=1, max_backoff=5, jitter=0)
+
+        self.assertEqual(1, policy.backoff(1))
+        self.assertEqual(2, policy.backoff(2))
+        self.assertEqual(4, policy.backoff(3))
+        self.assertEqual(5, policy.backoff(4))
+
+    def test_backoff_jitter(self):
+        policy = RetryPolicy(backoff_factor=1, jitter=0.5)
+
+        for _ in range(100):
+            self.assertTrue(2 <= policy.backoff(3) <= 4)
+
+    def test_invalid_policy(self):
+        with self.assertRaises(ValueError):
+            RetryPolicy(max_attempts=0)
+        with self.assertRaises(ValueError):
+            RetryPolicy(jitter=2)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(3, parse_retry_after({"Retry-After": "3"}))
+        self.assertEqual(
+            0, parse_retry_after({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+        )
+        self.assertIsNone(parse_retry_after({"Retry-After": "soon"}))
+        self.assertIsNone(parse_retry_after({}))
+
+
+class TestRetryMiddleware(unittest.TestCase):
+    def setUp(self):
+        self.delays = []
+        self.middleware = RetryMiddleware(
+            RetryPolicy(max_attempts=3, backoff_factor=1, jitter=0),
+            sleep=self.delays.append,
+        )
+
+    def _call(self, request, results):
+        calls = []
+
+        def call_next(r):
+            calls.append(r)
+            result = results[len(calls) - 1]
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        return self.middleware(request, call_next), calls
+
+    def test_retry_idempotent_server_error(self):
+        request = APIRequest(
+            "dns/retrieve/example.com", "", read_only=True, idempotent=True
+        )
+        response, calls = self._call(
+            request,
+            [
+                APIResponse(502, None),
+                APIResponse(503, {"status": "ERROR"}),
+                APIResponse(200, {"status": "SUCCESS"}),
+            ],
+        )
+
+        self.assertTrue(response.ok)
+        self.assertEqual(3, len(calls))
+        self.assertEqual([1, 2], self.delays)
+
+    def test_no_retry_non_idempotent_server_error(self):
+        request = APIRequest("dns/create/example.com", "")
+        response, calls = self._call(request, [APIResponse(502, None)])
+
+        self.assertEqual(502, response.status_code)
+        self.assertEqual(1, len(calls))
+        self.assertEqual([], self.delays)
+
+    def test_retry_non_idempotent_rate_limited(self):
+        request = APIRequest("dns/create/example.com", "")
+        response, calls = self._call(
+            request,
+            [
+                APIResponse(429, {"status": "ERROR"}, {"Retry-After": "7"}),
+                APIResponse(200, {"status": "SUCCESS", "id": "1"}),
+            ],
+        )
+
+        self.assertTrue(response.ok)
+        self.assertEqual([7], self.delays)
+
+    def test_retry_non_idempotent_connect_timeout(self):
+        request = APIRequest("dns/create/example.com", "")
+        response, calls = self._call(
+            request,
+            [
+                requests.exceptions.ConnectTimeout(),
+                APIResponse(200, {"status": "SUCCESS", "id": "1"}),
+            ],
+        )
+
+        self.assertTrue(response.ok)
+        self.assertEqual(2, len(calls))
+
+    def test_no_retry_non_idempotent_read_timeout(self):
+        request = APIRequest("dns/create/example.com", "")
+
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            self._call(request, [requests.exceptions.ReadTimeout()])
+
+    def test_no_retry_client_error(self):
+        request = APIRequest(
+            "dns/retrieve/example.com", "", read_only=True, idempotent=True
+        )
+        response, calls = self._call(
+            request,
+            [APIResponse(400, {"status": "ERROR", "message": "Invalid domain"})],
+        )
+
+        self.assertEqual(400, response.status_code)
+        self.assertEqual(1, len(calls))
+
+    def test_max_attempts(self):
+        request = APIRequest(
+            "dns/retrieve/example.com", "", read_only=True, idempotent=True
+        )
+        response, calls = self._call(request, [APIResponse(500, None)] * 3)
+
+        self.assertEqual(500, response.status_code)
+        self.assertEqual(3, len(calls))
+        self.assertEqual([1, 2], self.delays)
+
+
+class TestClientRetry(unittest.TestCase):
+    @responses.activate(registry=OrderedRegistry, assert_all_requests_are_fired=True)
+    def test_get_dns_records_retry(self):
+        pkb_client = PKBClient(
+            "key", "secret", retry_policy=RetryPolicy(backoff_factor=0)
+        )
+
+        url = urljoin(API_ENDPOINT, "dns/retrieve/example.com")
+        responses.post(url=url, body="Bad Gateway", status=502)
+        responses.post(url=url, json={"status": "SUCCESS", "records": []})
+
+        self.assertEqual([], pkb_client.get_dns_records("example.com"))
+
+    @responses.activate(registry=OrderedRegistry, assert_all_requests_are_fired=True)
+    def test_create_dns_record_no_retry(self):
+        pkb_client = PKBClient(
+            "key", "secret", retry_policy=RetryPolicy(backoff_factor=0)
+        )
+
+        responses.post(
+            url=urljoin(API_ENDPOINT, "dns/create/example.com"),
+            json={"status": "ERROR", "message": "Internal error"},
+            status=500,
+        )
+
+        with self.assertRaises(PKBClientException) as context:
+            pkb_client.create_dns_record("example.com", DNSRecordType.A, "127.0.0.1")
+
+        self.assertEqual(500, context.exception.status_code)
+
+
+if __name__ == "__main__":
+    unittest.main()
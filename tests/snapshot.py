@@ -0,0 +1,175 @@
+import gzip
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from pkb_client.client import PKBClient
+from pkb_client.client.dispatch import APIResponse
+from pkb_client.client.dns import DNSRestoreMode
+from pkb_client.client.snapshot import SnapshotStore, zone_digest
+from tests.helpers import dns_record
+
+
+class TestSnapshotStore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        self.store = SnapshotStore(self.temp_dir.name, clock=self._clock)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _clock(self):
+        self.now += timedelta(days=1)
+        return self.now
+
+    def _zone_files(self):
+        return sorted(Path(self.temp_dir.name, "zones").glob("*/*.ndjson.gz"))
+
+    def test_deduplication(self):
+        example_com = [
+            dns_record("1", "example.com", "127.0.0.1"),
+            dns_record("2", "www.example.com", "127.0.0.2"),
+        ]
+        example_org = [dns_record("3", "example.org", "127.0.0.3")]
+
+        first = self.store.create_snapshot(
+            {"example.com": example_com, "example.org": example_org}, label="first"
+        )
+        # the order of the DNS records does not change the content
+        second = self.store.create_snapshot(
+            {"example.com": list(reversed(example_com)), "example.org": []}
+        )
+
+        self.assertEqual(first.zones["example.com"], second.zones["example.com"])
+        self.assertEqual(zone_digest(example_com), first.zones["example.com"])
+        self.assertEqual(3, len(self._zone_files()))
+        with gzip.open(self.store.zone_path(first.zones["example.org"]), "rt") as f:
+            self.assertIn('"content":"127.0.0.3"', f.read())
+
+    def test_list_and_load(self):
+        old = [dns_record("1", "example.com", "127.0.0.1")]
+        new = [dns_record("1", "example.com", "127.0.0.2")]
+        first = self.store.create_snapshot({"example.com": old}, label="first")
+        second = self.store.create_snapshot({"example.com": new})
+        third = self.store.create_snapshot({"example.org": []})
+
+        self.assertEqual(
+            [first.id, second.id, third.id], self.store.list_snapshot_ids()
+        )
+        self.assertEqual([first, second, third], self.store.list_snapshots())
+        self.assertEqual(
+            [first, second], self.store.list_snapshots(domain="example.com")
+        )
+        self.assertEqual(third, self.store.get_snapshot())
+        self.assertEqual(new, self.store.load_zone("example.com"))
+        self.assertEqual(old, self.store.load_zone("example.com", first.id))
+        with self.assertRaises(KeyError):
+            self.store.load_zone("example.com", third.id)
+        with self.assertRaises(KeyError):
+            self.store.get_snapshot("unknown")
+
+    def test_prune(self):
+        snapshots = [
+            self.store.create_snapshot(
+                {"example.com": [dns_record("1", "example.com", f"127.0.0.{i}")]}
+            )
+            for i in range(3)
+        ]
+
+        deleted = self.store.prune(keep=1)
+
+        self.assertEqual([snapshot.id for snapshot in snapshots[:2]], deleted)
+        self.assertEqual([snapshots[2].id], self.store.list_snapshot_ids())
+        self.assertEqual(
+            [self.store.zone_path(snapshots[2].zones["example.com"])],
+            self._zone_files(),
+        )
+
+
+class TestClientSnapshots(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store = SnapshotStore(self.temp_dir.name)
+        self.records = {
+            "example.com": [dns_record("1", "example.com", "127.0.0.1")],
+            "example.org": [dns_record("2", "example.org", "127.0.0.2")],
+        }
+        self.sent = []
+        lock = threading.Lock()
+
+        def middleware(request, call_next):
+            with lock:
+                self.sent.append(request.endpoint)
+            if request.endpoint.startswith("dns/retrieve/"):
+                domain = request.endpoint.split("/")[2]
+                return APIResponse(
+                    200,
+                    {
+                        "status": "SUCCESS",
+                        "records": [r.to_dict() for r in self.records[domain]],
+                    },
+                )
+            if request.endpoint.startswith("dns/edit/example.org"):
+                return APIResponse(400, {"status": "ERROR", "message": "invalid"})
+            return APIResponse(200, {"status": "SUCCESS", "id": "3"})
+
+        self.pkb_client = PKBClient(
+            "key",
+            "secret",
+            middlewares=[middleware],
+            snapshot_store=self.store,
+            coalesce_reads=False,
+        )
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_snapshot_and_restore(self):
+        snapshot = self.pkb_client.snapshot_dns_records(
+            ["example.com", "example.org"], label="nightly"
+        )
+
+        self.assertEqual(["example.com", "example.org"], list(snapshot.zones))
+        self.assertEqual(
+            self.records["example.com"], self.store.load_zone("example.com")
+        )
+
+        self.records["example.com"] = [dns_record("1", "example.com", "127.0.0.9")]
+        self.sent.clear()
+        self.assertTrue(
+            self.pkb_client.restore_dns_records_snapshot(
+                "example.com", DNSRestoreMode.clear, snapshot.id
+            )
+        )
+        self.assertEqual(
+            ["dns/retrieve/example.com", "dns/edit/example.com/1"], self.sent
+        )
+
+    def test_error_backup(self):
+        self.pkb_client.snapshot_dns_records(["example.org"])
+        self.records["example.org"] = [dns_record("2", "example.org", "127.0.0.9")]
+
+        self.assertFalse(
+            self.pkb_client.restore_dns_records_snapshot(
+                "example.org", DNSRestoreMode.clear
+            )
+        )
+
+        backup = self.store.get_snapshot()
+        self.assertEqual("backup before failed import", backup.label)
+        self.assertEqual(
+            self.records["example.org"], self.store.load_zone("example.org", backup.id)
+        )
+
+    def test_without_snapshot_store(self):
+        pkb_client = PKBClient("key", "secret")
+
+        with self.assertRaises(ValueError):
+            pkb_client.snapshot_dns_records(["example.com"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import dns.exception
+
+from pkb_client.client.dns import DNSRecord, DNSRecordType
+from pkb_client.client.soa import (
+    OfflineSOAProvider,
+    ResolverSOAProvider,
+    SOAProvider,
+    SOARecord,
+)
+from tests.helpers import FakeClock
+
+
+def _soa_answer(serial=1):
+    return [
+        SimpleNamespace(
+            mname="ns1.example.com.",
+            rname="admin.example.com.",
+            serial=serial,
+            refresh=300,
+            retry=100,
+            expire=6000,
+            minimum=600,
+        )
+    ]
+
+
+class TestSOAProvider(unittest.TestCase):
+    def test_abstract(self):
+        class IncompleteSOAProvider(SOAProvider):
+            pass
+
+        with self.assertRaises(TypeError):
+            IncompleteSOAProvider()
+
+
+class TestResolverSOAProvider(unittest.TestCase):
+    def test_configuration(self):
+        provider = ResolverSOAProvider(nameservers=["192.0.2.1"], timeout=1.5)
+
+        self.assertEqual(["192.0.2.1"], provider.resolver.nameservers)
+        self.assertEqual(1.5, provider.resolver.lifetime)
+
+    def test_get_soa_cached(self):
+        clock = FakeClock()
+        provider = ResolverSOAProvider(
+            nameservers=["192.0.2.1"], max_age=60, clock=clock
+        )
+
+        with patch.object(
+            provider.resolver, "resolve", return_value=_soa_answer()
+        ) as resolve:
+            soa_record = provider.get_soa("Example.com.")
+            self.assertEqual(soa_record, provider.get_soa("example.com"))
+            self.assertEqual(1, resolve.call_count)
+
+            clock.now = 61
+            provider.get_soa("example.com")
+            self.assertEqual(2, resolve.call_count)
+
+        self.assertEqual(
+            SOARecord("ns1.example.com.", "admin.example.com.", 1, 300, 100, 6000, 600),
+            soa_record,
+        )
+        self.assertEqual(
+            "ns1.example.com. admin.example.com. (1 300 100 6000 600)",
+            str(soa_record),
+        )
+
+    def test_get_soa_fallback(self):
+        provider = ResolverSOAProvider(nameservers=["192.0.2.1"])
+        with patch.object(
+            provider.resolver, "resolve", side_effect=dns.exception.Timeout
+        ):
+            with self.assertRaises(dns.exception.Timeout):
+                provider.get_soa("example.com")
+
+            provider.fallback = OfflineSOAProvider(clock=lambda: 0)
+            self.assertEqual(1970010100, provider.get_soa("example.com").serial)
+
+    def test_resolve_many(self):
+        provider = ResolverSOAProvider(nameservers=["192.0.2.1"])
+
+        def resolve(domain, rdtype):
+            if domain == "invalid.com":
+                raise dns.resolver.NXDOMAIN()
+            return _soa_answer(serial=len(domain))
+
+        with patch.object(provider.resolver, "resolve", side_effect=resolve):
+            soa_records = provider.resolve_many(
+                ["example.com", "invalid.com", "example.org"], max_workers=3
+            )
+
+        self.assertEqual(["example.com", "example.org"], list(soa_records))
+        self.assertEqual(11, soa_records["example.com"].serial)
+
+
+class TestOfflineSOAProvider(unittest.TestCase):
+    def test_get_soa(self):
+        provider = OfflineSOAProvider(clock=lambda: 1700000000)
+
+        self.assertEqual(
+            SOARecord(
+                "curitiba.ns.porkbun.com.",
+                "hostmaster.example.com.",
+                2023111400,
+                10800,
+                3600,
+                604800,
+                3600,
+            ),
+            provider.get_soa("example.com."),
+        )
+
+    def test_get_soa_from_dns_records(self):
+        provider = OfflineSOAProvider(rname="admin.example.com.")
+        dns_records = [
+            DNSRecord("1", "example.com", DNSRecordType.A, "127.0.0.1", 600, 0, ""),
+            DNSRecord(
+                "2", "example.com", DNSRecordType.NS, "ns1.example.net", 600, 0, ""
+            ),
+        ]
+
+        soa_record = provider.get_soa("example.com", dns_records)
+
+        self.assertEqual("ns1.example.net.", soa_record.mname)
+        self.assertEqual("admin.example.com.", soa_record.rname)
+
+
+if __name__ == "__main__":
+    unittest.main()